@@ -0,0 +1,121 @@
+""" Compare the quoting and query string encoding primitives of
+``pyramid.encode`` and ``pyramid.traversal`` with the Python standard
+library and with their implementations in Pyramid 1.6.
+
+Usage: python benchmarks/bench_encode.py
+"""
+import sys
+import timeit
+
+from pyramid.compat import (
+    text_,
+    text_type,
+    binary_type,
+    is_nonstr_iter,
+    url_encode,
+    url_quote as stdlib_url_quote,
+    url_quote_plus as stdlib_quote_plus,
+    )
+from pyramid.encode import (
+    quote_plus,
+    url_quote,
+    urlencode,
+    )
+from pyramid.traversal import quote_path_segment
+
+# the Pyramid 1.6 implementations, for comparison
+
+def legacy_url_quote(val, safe=''):
+    cls = val.__class__
+    if cls is text_type:
+        val = val.encode('utf-8')
+    elif cls is not binary_type:
+        val = str(val).encode('utf-8')
+    return stdlib_url_quote(val, safe=safe)
+
+def legacy_quote_plus(val, safe=''):
+    cls = val.__class__
+    if cls is text_type:
+        val = val.encode('utf-8')
+    elif cls is not binary_type:
+        val = str(val).encode('utf-8')
+    return stdlib_quote_plus(val, safe=safe)
+
+def legacy_urlencode(query, doseq=True):
+    try:
+        query = query.items()
+    except AttributeError:
+        pass
+    result = ''
+    prefix = ''
+    for (k, v) in query:
+        k = legacy_quote_plus(k)
+        if is_nonstr_iter(v):
+            for x in v:
+                x = legacy_quote_plus(x)
+                result += '%s%s=%s' % (prefix, k, x)
+                prefix = '&'
+        elif v is None:
+            result += '%s%s=' % (prefix, k)
+        else:
+            v = legacy_quote_plus(v)
+            result += '%s%s=%s' % (prefix, k, v)
+        prefix = '&'
+    return result
+
+_legacy_segment_cache = {}
+
+def legacy_quote_path_segment(segment, safe=''):
+    try:
+        return _legacy_segment_cache[(segment, safe)]
+    except KeyError:
+        if segment.__class__ not in (text_type, binary_type):
+            segment = str(segment)
+        result = legacy_url_quote(segment, safe)
+        _legacy_segment_cache[(segment, safe)] = result
+        return result
+
+SAFE = 'item-1234.html'
+UNSAFE = text_(b'La Pe\xc3\xb1a & friends', 'utf-8')
+QUERY = {'page': 3, 'sort': 'name', 'q': 'pyramid web', 'tag': ['a', 'b']}
+
+def main(argv=sys.argv):
+    cases = [
+        ('url_quote, safe ascii', [
+            ('stdlib', lambda: stdlib_url_quote(SAFE, safe='')),
+            ('1.6', lambda: legacy_url_quote(SAFE)),
+            ('current', lambda: url_quote(SAFE)),
+            ]),
+        ('url_quote, needs quoting', [
+            ('stdlib', lambda: stdlib_url_quote(UNSAFE.encode('utf-8'))),
+            ('1.6', lambda: legacy_url_quote(UNSAFE)),
+            ('current', lambda: url_quote(UNSAFE)),
+            ]),
+        ('quote_plus, safe ascii', [
+            ('stdlib', lambda: stdlib_quote_plus(SAFE, safe='')),
+            ('1.6', lambda: legacy_quote_plus(SAFE)),
+            ('current', lambda: quote_plus(SAFE)),
+            ]),
+        ('quote_path_segment, safe ascii', [
+            ('1.6', lambda: legacy_quote_path_segment(SAFE)),
+            ('current', lambda: quote_path_segment(SAFE)),
+            ]),
+        ('quote_path_segment, needs quoting', [
+            ('1.6', lambda: legacy_quote_path_segment(UNSAFE)),
+            ('current', lambda: quote_path_segment(UNSAFE)),
+            ]),
+        ('urlencode, small dict', [
+            ('stdlib', lambda: url_encode(QUERY, True)),
+            ('1.6', lambda: legacy_urlencode(QUERY)),
+            ('current', lambda: urlencode(QUERY)),
+            ]),
+        ]
+    number = 100000
+    for name, impls in cases:
+        print(name)
+        for impl, func in impls:
+            elapsed = min(timeit.repeat(func, number=number, repeat=3))
+            print('    %-10s %8.3f us/call' % (impl, elapsed / number * 1e6))
+
+if __name__ == '__main__':
+    sys.exit(main() or 0)
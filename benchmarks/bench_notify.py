@@ -0,0 +1,87 @@
+""" Measure ``Registry.notify`` for the events sent on every request.
+
+Usage: python benchmarks/bench_notify.py
+
+A ``NewRequest`` event is sent through a registry with a few subscribers,
+some of which listen to other events, some of which use predicates.  The
+time per notification with the cached dispatch table is compared with a
+lookup through the adapter registry on every call.
+"""
+import sys
+import timeit
+
+from zope.interface import Interface
+
+from pyramid.config import Configurator
+from pyramid.events import (
+    ContextFound,
+    NewRequest,
+    NewResponse,
+    )
+from pyramid.interfaces import (
+    IContextFound,
+    INewRequest,
+    INewResponse,
+    )
+from pyramid.registry import Registry
+from pyramid.request import Request
+
+class UncachedRegistry(Registry):
+    # the previous implementation, for comparison
+    def notify(self, *events):
+        if self.has_listeners:
+            [ _ for _ in self.subscribers(events, None) ]
+
+class AlwaysPredicate(object):
+    def __init__(self, val, config):
+        self.val = val
+
+    def text(self):
+        return 'always = %s' % self.val
+
+    phash = text
+
+    def __call__(self, event):
+        return True
+
+def subscriber(event):
+    pass
+
+def make_registry(cls):
+    registry = cls('bench')
+    config = Configurator(registry=registry)
+    config.setup_registry()
+    config.add_subscriber_predicate('always', AlwaysPredicate)
+    config.add_subscriber(subscriber, INewRequest)
+    config.add_subscriber(subscriber, INewRequest, always=True)
+    config.add_subscriber(subscriber, IContextFound)
+    config.add_subscriber(subscriber, INewResponse)
+    config.add_subscriber(subscriber, Interface)
+    config.commit()
+    return registry
+
+def bench(registry, event, number):
+    notify = registry.notify
+    notify(event) # fill the cache outside of the timing
+    return timeit.timeit(lambda: notify(event), number=number) / number * 1e6
+
+def main(argv=sys.argv):
+    number = 100000
+    request = Request.blank('/')
+    events = [
+        ('NewRequest', NewRequest(request)),
+        ('ContextFound', ContextFound(request)),
+        ('NewResponse', NewResponse(request, None)),
+        ]
+    cached = make_registry(Registry)
+    uncached = make_registry(UncachedRegistry)
+    print('%-14s %12s %12s' % ('event', 'cached us', 'uncached us'))
+    for name, event in events:
+        print('%-14s %12.3f %12.3f' % (
+            name,
+            bench(cached, event, number),
+            bench(uncached, event, number),
+            ))
+
+if __name__ == '__main__':
+    sys.exit(main() or 0)
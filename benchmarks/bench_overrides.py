@@ -0,0 +1,64 @@
+""" Measure asset override lookups as the number of overrides grows.
+
+Usage: python benchmarks/bench_overrides.py
+
+For each override count, ``PackageOverrides.filtered_sources`` is timed for
+a resource matched by the oldest override (the worst case for a linear
+scan) and for a resource no override matches.  With the path-segment index
+the time per lookup stays flat; the linear scan is shown for comparison.
+"""
+import sys
+import timeit
+import types
+
+from pyramid.config.assets import PackageOverrides
+
+class LinearPackageOverrides(PackageOverrides):
+    # the pre-index implementation, for comparison
+    def filtered_sources(self, resource_name):
+        for override in self.overrides:
+            o = override(resource_name)
+            if o is not None:
+                yield o
+
+class DummySource(object):
+    pass
+
+def make_overrides(cls, count):
+    package = types.ModuleType('benchpackage')
+    po = cls(package)
+    source = DummySource()
+    for i in range(count):
+        if i % 2:
+            po.insert('theme%d/templates/page%d.pt' % (i, i), source)
+        else:
+            po.insert('theme%d/static/' % i, source)
+    return po
+
+def bench(po, resource_name, number):
+    def lookup():
+        for o in po.filtered_sources(resource_name):
+            pass
+    lookup() # build the index outside of the timing
+    return timeit.timeit(lookup, number=number) / number * 1e6
+
+def main(argv=sys.argv):
+    number = 20000
+    print('%8s %18s %18s %18s %18s' % (
+        'count', 'indexed hit us', 'indexed miss us',
+        'linear hit us', 'linear miss us'))
+    for count in (1, 10, 100, 1000):
+        hit = 'theme0/static/css/main.css'
+        miss = 'templates/index.pt'
+        indexed = make_overrides(PackageOverrides, count)
+        linear = make_overrides(LinearPackageOverrides, count)
+        print('%8d %18.2f %18.2f %18.2f %18.2f' % (
+            count,
+            bench(indexed, hit, number),
+            bench(indexed, miss, number),
+            bench(linear, hit, number // 10),
+            bench(linear, miss, number // 10),
+            ))
+
+if __name__ == '__main__':
+    sys.exit(main() or 0)
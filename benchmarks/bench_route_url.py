@@ -0,0 +1,50 @@
+""" Measure how many URLs per second ``request.route_url``,
+``request.route_path`` and ``request.route_url_factory`` generate.
+
+Usage: python benchmarks/bench_route_url.py
+"""
+import sys
+import timeit
+
+from pyramid.config import Configurator
+from pyramid.request import Request
+from pyramid.threadlocal import manager
+
+def make_request():
+    config = Configurator()
+    config.add_route('home', '/')
+    config.add_route('article', '/articles/{year}/{month}/{slug}')
+    config.add_route('files', '/files/*subpath')
+    config.commit()
+    request = Request.blank('/', base_url='http://example.com/app')
+    request.registry = config.registry
+    manager.push({'registry': config.registry, 'request': request})
+    return request
+
+def main(argv=sys.argv):
+    request = make_request()
+    article_url = request.route_url_factory('article')
+    cases = [
+        ('route_url, no replacements',
+         lambda: request.route_url('home')),
+        ('route_url, safe values',
+         lambda: request.route_url('article', year=2015, month='04',
+                                   slug='a-short-title')),
+        ('route_url, values needing quoting',
+         lambda: request.route_url('article', year=2015, month='04',
+                                   slug='a title & more')),
+        ('route_path, safe values',
+         lambda: request.route_path('article', year=2015, month='04',
+                                    slug='a-short-title')),
+        ('route_url, stararg',
+         lambda: request.route_url('files', subpath=('css', 'main.css'))),
+        ('route_url_factory, safe values',
+         lambda: article_url(year=2015, month='04', slug='a-short-title')),
+        ]
+    number = 50000
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=number, repeat=3))
+        print('%-36s %10d URLs/s' % (name, number / elapsed))
+
+if __name__ == '__main__':
+    sys.exit(main() or 0)
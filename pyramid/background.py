@@ -0,0 +1,181 @@
+import atexit
+import threading
+import weakref
+
+from zope.interface import implementer
+
+from pyramid.compat import (
+    perf_counter,
+    queue,
+    )
+from pyramid.interfaces import (
+    IBackgroundExecutor,
+    IDebugLogger,
+    )
+
+_STOP = object()
+
+@implementer(IBackgroundExecutor)
+class BackgroundExecutor(object):
+    """ A bounded pool of ``max_workers`` daemon threads which run the tasks
+    passed to :meth:`submit`, in the order they were submitted.
+
+    At most ``max_queue`` tasks wait for a worker.  When the queue is full,
+    :meth:`submit` waits up to ``timeout`` seconds for room, and then runs
+    the task in the calling thread: work is never dropped, but the callers
+    are slowed down to the pace of the workers rather than letting the
+    queue grow without bounds.  Callers wait for room concurrently, so none
+    of them waits much longer than ``timeout``.  Tasks submitted after :meth:`shutdown` also
+    run in the calling thread, so every submitted task is run exactly once.
+
+    Exceptions raised by tasks are logged using ``logger`` (usually the
+    application's :term:`debug logger`) and otherwise ignored.
+
+    The worker threads are started by the first call to :meth:`submit`.
+    Executors which have started are shut down when the Python process
+    exits, waiting for the tasks already submitted to finish.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, max_workers=4, max_queue=1000, timeout=1.0,
+                 logger=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.logger = logger
+        self.max_queue = max_queue
+        # the queue itself is unbounded; ``pending`` counts the tasks which
+        # no worker has taken yet, and is kept under ``max_queue`` by
+        # ``submit`` so that the stop markers can always be queued
+        self.queue = queue.Queue()
+        self.pending = 0
+        self.workers = []
+        self.closed = False
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+
+    def submit(self, fn, *args, **kw):
+        """ Arrange for ``fn(*args, **kw)`` to be called by a worker."""
+        if not self.workers:
+            self._start()
+        # the lock keeps ``shutdown`` from queueing the stop markers between
+        # the check and the put, which would strand the task behind them;
+        # it is released while waiting for room
+        with self.lock:
+            deadline = None
+            while not self.closed and self.pending >= self.max_queue:
+                if deadline is None:
+                    deadline = perf_counter() + self.timeout
+                remaining = deadline - perf_counter()
+                if remaining <= 0:
+                    break
+                self.not_full.wait(remaining)
+            if not self.closed and self.pending < self.max_queue:
+                self.pending += 1
+                self.queue.put_nowait((fn, args, kw))
+                return
+        self._run(fn, args, kw)
+
+    def shutdown(self, wait=True):
+        """ Stop accepting tasks, and let the workers finish the tasks which
+        were already submitted.  If ``wait`` is true, block until they have
+        finished."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            workers = list(self.workers)
+            # the callers waiting for room run their tasks themselves
+            self.not_full.notify_all()
+        for worker in workers:
+            # queued after every task already submitted
+            self.queue.put(_STOP)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _start(self):
+        with self.lock:
+            if self.workers or self.closed:
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._work,
+                    name='pyramid-background-%d' % i,
+                    )
+                worker.daemon = True
+                worker.start()
+                self.workers.append(worker)
+            _started[self] = True
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            with self.lock:
+                self.pending -= 1
+                self.not_full.notify()
+            fn, args, kw = item
+            self._run(fn, args, kw)
+
+    def _run(self, fn, args, kw):
+        _run_task(fn, args, kw, self.logger)
+
+def _run_task(fn, args, kw, logger):
+    try:
+        fn(*args, **kw)
+    except Exception:
+        if logger is not None:
+            logger.exception('Exception in background task %r' % (fn,))
+
+# executors whose workers were started, drained when the process exits
+_started = weakref.WeakKeyDictionary()
+
+def _shutdown_started():
+    for executor in list(_started.keys()):
+        executor.shutdown(wait=True)
+
+atexit.register(_shutdown_started)
+
+_lock = threading.Lock()
+
+def get_background_executor(registry):
+    """ Return the :class:`pyramid.interfaces.IBackgroundExecutor` utility
+    of ``registry``.  If none has been registered, a
+    :class:`BackgroundExecutor` is created and registered, using the
+    ``pyramid.background_workers`` (default ``4``) and
+    ``pyramid.background_queue_size`` (default ``1000``) settings and the
+    :term:`debug logger` of the registry.
+
+    This is called at configuration time, by
+    :meth:`pyramid.config.Configurator.add_subscriber` for background
+    subscribers and by :meth:`pyramid.config.Configurator.make_wsgi_app`,
+    so that no utility is registered while requests are being handled.
+
+    .. versionadded:: 1.7
+    """
+    executor = registry.queryUtility(IBackgroundExecutor)
+    if executor is None:
+        with _lock:
+            executor = registry.queryUtility(IBackgroundExecutor)
+            if executor is None:
+                settings = getattr(registry, 'settings', None) or {}
+                executor = BackgroundExecutor(
+                    max_workers=int(
+                        settings.get('pyramid.background_workers', 4)),
+                    max_queue=int(
+                        settings.get('pyramid.background_queue_size', 1000)),
+                    logger=registry.queryUtility(IDebugLogger),
+                    )
+                registry.registerUtility(executor, IBackgroundExecutor)
+    return executor
+
+def _submit(registry, fn, *args):
+    # submit ``fn(*args)`` to the executor of ``registry``; a registry which
+    # was never made into an application has none, and the task is run at
+    # once, with its errors logged like those of a background task
+    executor = registry.queryUtility(IBackgroundExecutor)
+    if executor is None:
+        _run_task(fn, args, {}, registry.queryUtility(IDebugLogger))
+    else:
+        executor.submit(fn, *args)
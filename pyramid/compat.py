@@ -204,6 +204,21 @@ try:
 except ImportError:
     from Cookie import SimpleCookie
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from time import perf_counter
+except ImportError: # pragma: no cover (Python < 3.3)
+    from time import time as perf_counter
+
+try:
+    from threading import get_ident
+except ImportError: # pragma: no cover (Python 2)
+    from thread import get_ident
+
 if PY3:
     from html import escape
 else:
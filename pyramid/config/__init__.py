@@ -23,6 +23,8 @@ from pyramid.asset import resolve_asset_spec
 
 from pyramid.authorization import ACLAuthorizationPolicy
 
+from pyramid.background import get_background_executor
+
 from pyramid.compat import (
     text_,
     reraise,
@@ -456,8 +458,8 @@ class Configurator(
     def _fix_registry(self):
         """ Fix up a ZCA component registry that is not a
         pyramid.registry.Registry by adding analogues of ``has_listeners``,
-        ``notify``, ``queryAdapterOrSelf``, and ``registerSelfAdapter``
-        through monkey-patching."""
+        ``has_listeners_for``, ``notify``, ``queryAdapterOrSelf``, and
+        ``registerSelfAdapter`` through monkey-patching."""
 
         _registry = self.registry
 
@@ -469,6 +471,11 @@ class Configurator(
         if not hasattr(_registry, 'has_listeners'):
             _registry.has_listeners = True
 
+        if not hasattr(_registry, 'has_listeners_for'):
+            def has_listeners_for(event_type):
+                return True
+            _registry.has_listeners_for = has_listeners_for
+
         if not hasattr(_registry, 'queryAdapterOrSelf'):
             def queryAdapterOrSelf(object, interface, default=None):
                 if not interface.providedBy(object):
@@ -979,8 +986,18 @@ class Configurator(
         adds this configuration's registry to
         :attr:`pyramid.config.global_registries`, and returns a
         :app:`Pyramid` WSGI application representing the committed
-        configuration state."""
+        configuration state.
+
+        .. versionchanged:: 1.7
+           The :class:`pyramid.interfaces.IBackgroundExecutor` of the
+           registry is created (see
+           :func:`pyramid.background.get_background_executor`) if it
+           doesn't exist yet.
+        """
         self.commit()
+        # background tasks are submitted to the executor while requests are
+        # handled, so it must exist beforehand
+        get_background_executor(self.registry)
         app = Router(self.registry)
 
         # Allow tools like "pshell development.ini" to find the 'last'
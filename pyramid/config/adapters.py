@@ -10,6 +10,11 @@ from pyramid.interfaces import (
     IResourceURL,
     )
 
+from pyramid.background import (
+    _submit as _submit_background,
+    get_background_executor,
+    )
+
 from pyramid.config.util import (
     action_method,
     takes_one_arg,
@@ -18,7 +23,8 @@ from pyramid.config.util import (
 
 class AdaptersConfiguratorMixin(object):
     @action_method
-    def add_subscriber(self, subscriber, iface=None, **predicates):
+    def add_subscriber(self, subscriber, iface=None, background=False,
+                       **predicates):
         """Add an event :term:`subscriber` for the event stream
         implied by the supplied ``iface`` interface.
 
@@ -40,8 +46,23 @@ class AdaptersConfiguratorMixin(object):
         :meth:`pyramid.config.Configurator.add_subscriber_predicate` before it
         can be used.  See :ref:`subscriber_predicates` for more information.
 
+        If ``background`` is ``True``, the subscriber is not called by the
+        code sending the event: once the predicates (if any) have matched,
+        it is submitted to the
+        :class:`pyramid.interfaces.IBackgroundExecutor` of the registry,
+        which calls it from another thread.  This is meant for subscribers
+        doing slow work which the response doesn't depend on, for instance
+        logging :class:`pyramid.events.NewResponse` events to a remote
+        service.  Such a subscriber must not modify the event, and errors it
+        raises are logged rather than propagated.  Because ``background`` is
+        an argument of this method, a subscriber predicate named
+        ``background`` cannot be used with it.
+
         .. versionadded:: 1.4
            The ``**predicates`` argument.
+
+        .. versionchanged:: 1.7
+           The ``background`` argument.
         """
         dotted = self.maybe_dotted
         subscriber, iface = dotted(subscriber), dotted(iface)
@@ -51,6 +72,9 @@ class AdaptersConfiguratorMixin(object):
             iface = (iface,)
 
         def register():
+            if background:
+                # create the executor now rather than while handling events
+                get_background_executor(self.registry)
             predlist = self.get_predlist('subscriber')
             order, preds, phash = predlist.make(self, **predicates)
 
@@ -58,6 +82,7 @@ class AdaptersConfiguratorMixin(object):
             derived_subscriber = self._derive_subscriber(
                 subscriber,
                 derived_predicates,
+                background,
                 )
 
             intr.update(
@@ -80,6 +105,7 @@ class AdaptersConfiguratorMixin(object):
         
         intr['subscriber'] = subscriber
         intr['interfaces'] = iface
+        intr['background'] = background
         
         self.action(None, register, introspectables=(intr,))
         return subscriber
@@ -95,7 +121,7 @@ class AdaptersConfiguratorMixin(object):
 
         return derived_predicate
 
-    def _derive_subscriber(self, subscriber, predicates):
+    def _derive_subscriber(self, subscriber, predicates, background=False):
         derived_subscriber = subscriber
 
         if eventonly(subscriber):
@@ -104,6 +130,10 @@ class AdaptersConfiguratorMixin(object):
             if hasattr(subscriber, '__name__'):
                 update_wrapper(derived_subscriber, subscriber)
 
+        if background:
+            derived_subscriber = self._derive_background_subscriber(
+                derived_subscriber)
+
         if not predicates:
             return derived_subscriber
 
@@ -134,6 +164,14 @@ class AdaptersConfiguratorMixin(object):
 
         return subscriber_wrapper
         
+    def _derive_background_subscriber(self, subscriber):
+        registry = self.registry
+        def background_subscriber(*arg):
+            _submit_background(registry, subscriber, *arg)
+        if hasattr(subscriber, '__name__'):
+            update_wrapper(background_subscriber, subscriber)
+        return background_subscriber
+
     @action_method
     def add_subscriber_predicate(self, name, factory, weighs_more_than=None,
                                  weighs_less_than=None):
@@ -103,19 +103,37 @@ class PackageOverrides(object):
         # we call register_loader_type for every instantiation of this
         # class; that's OK, it's idempotent to do it more than once.
         pkg_resources.register_loader_type(self.__class__, OverrideProvider)
+        # incremented whenever the overrides change, so that callers which
+        # cache asset resolutions (e.g. static views) can tell they are stale
+        self.generation = 0
         self.overrides = []
         self.overridden_package_name = package.__name__
 
+    @property
+    def overrides(self):
+        return self._overrides
+
+    @overrides.setter
+    def overrides(self, overrides):
+        self._overrides = overrides
+        self._index = None
+        self.generation += 1
+
     def insert(self, path, source):
         if not path or path.endswith('/'):
             override = DirectoryOverride(path, source)
         else:
             override = FileOverride(path, source)
-        self.overrides.insert(0, override)
+        self._overrides.insert(0, override)
+        self._index = None
+        self.generation += 1
         return override
 
     def filtered_sources(self, resource_name):
-        for override in self.overrides:
+        index = self._index
+        if index is None:
+            index = self._index = OverrideIndex(self._overrides)
+        for override in index.matching(resource_name):
             o = override(resource_name)
             if o is not None:
                 yield o
@@ -182,6 +200,72 @@ class PackageOverrides(object):
         return self.real_loader.get_source(fullname)
 
 
+class OverrideIndex(object):
+    """ A path-segment trie over a list of overrides.  ``matching`` returns
+    the overrides which may match a resource name, in the same order as the
+    list, without calling every override in the list.
+
+    Directory overrides are stored at the node reached by their path
+    segments and match any resource name below that node; file overrides
+    match only the resource name which ends at their node.  Overrides of
+    any other type cannot be indexed and are always returned."""
+    def __init__(self, overrides):
+        self.root = _OverrideNode()
+        self.unindexed = []
+        for precedence, override in enumerate(overrides):
+            path = getattr(override, 'path', None)
+            if (
+                override.__class__ is DirectoryOverride and
+                (not path or path.endswith('/'))
+            ):
+                segments = path[:-1].split('/') if path else []
+                self._node(segments).directories.append(
+                    (precedence, override))
+            elif (
+                override.__class__ is FileOverride and
+                path and not path.endswith('/')
+            ):
+                self._node(path.split('/')).files.append(
+                    (precedence, override))
+            else:
+                self.unindexed.append((precedence, override))
+
+    def _node(self, segments):
+        node = self.root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _OverrideNode()
+            node = child
+        return node
+
+    def matching(self, resource_name):
+        segments = resource_name.split('/')
+        count = len(segments)
+        node = self.root
+        found = self.unindexed + node.directories
+        for depth, segment in enumerate(segments, 1):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if depth < count:
+                found.extend(node.directories)
+            else:
+                found.extend(node.files)
+        found.sort(key=_precedence)
+        return [override for precedence, override in found]
+
+def _precedence(item):
+    return item[0]
+
+class _OverrideNode(object):
+    __slots__ = ('children', 'directories', 'files')
+
+    def __init__(self):
+        self.children = {}
+        self.directories = []
+        self.files = []
+
 class DirectoryOverride:
     def __init__(self, path, source):
         self.path = path
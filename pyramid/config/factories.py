@@ -6,10 +6,14 @@ from pyramid.interfaces import (
     IRequestFactory,
     IResponseFactory,
     IRequestExtensions,
+    IRequestPropertyCache,
+    IRequestProfiler,
     IRootFactory,
     ISessionFactory,
     )
 
+from pyramid.exceptions import ConfigurationError
+from pyramid.request import RequestPropertyCache
 from pyramid.traversal import DefaultRootFactory
 
 from pyramid.util import (
@@ -102,6 +106,28 @@ class FactoriesConfiguratorMixin(object):
         intr['factory'] = factory
         self.action(IRequestFactory, register, introspectables=(intr,))
 
+    @action_method
+    def set_request_profiler(self, profiler):
+        """ The object passed as ``profiler`` should be an object (or a
+        :term:`dotted Python name` which refers to an object) implementing
+        :class:`pyramid.interfaces.IRequestProfiler`, such as an instance
+        of :class:`pyramid.profiling.RequestProfiler`.  It will be told how
+        long each phase of the handling of every request (route matching,
+        root factory, traversal, view lookup, view call and rendering)
+        takes.  No timing happens unless a profiler is set.
+
+        .. versionadded:: 1.7
+        """
+        profiler = self.maybe_dotted(profiler)
+
+        def register():
+            self.registry.registerUtility(profiler, IRequestProfiler)
+        intr = self.introspectable('request profiler', None,
+                                   self.object_description(profiler),
+                                   'request profiler')
+        intr['profiler'] = profiler
+        self.action(IRequestProfiler, register, introspectables=(intr,))
+
     @action_method
     def set_response_factory(self, factory):
         """ The object passed as ``factory`` should be an object (or a
@@ -132,7 +158,10 @@ class FactoriesConfiguratorMixin(object):
                            callable=None,
                            name=None,
                            property=False,
-                           reify=False):
+                           reify=False,
+                           cache=None,
+                           cache_ttl=None,
+                           cache_size=1000):
         """ Add a property or method to the request object.
 
         When adding a method to the request, ``callable`` may be any
@@ -167,11 +196,50 @@ class FactoriesConfiguratorMixin(object):
         factory via
         :meth:`pyramid.config.Configurator.set_request_factory`.
 
+        If ``cache`` is not ``None``, the value of the property is also
+        cached across requests.  ``cache`` must be a callable (or a
+        :term:`dotted Python name` which refers to one) accepting a request
+        and returning a hashable key: requests for which it returns the
+        same key share the cached value instead of each calling
+        ``callable``.  At most ``cache_size`` values are cached, the least
+        recently used being discarded first, and if ``cache_ttl`` is not
+        ``None`` each value is discarded that many seconds after it was
+        computed.  Passing ``cache`` implies ``reify=True``.  The cached
+        values may be discarded using
+        :meth:`pyramid.registry.Registry.invalidate_request_property`, and
+        the ``cache`` value of the introspectable of the property is the
+        :class:`pyramid.request.RequestPropertyCache` holding them, whose
+        ``stats`` method reports hits and misses.
+
+        A cached value is shared by every request (and thread) for which
+        ``cache`` returns the same key, so it must not be mutated, and the
+        key must include everything the value depends on (e.g. the tenant or
+        the user).  Nothing is discarded when the data the value was
+        computed from changes: the application must call
+        :meth:`~pyramid.registry.Registry.invalidate_request_property` or
+        rely on ``cache_ttl``.  Two requests missing the same key at once
+        may both call ``callable``, the last value computed being kept.
+
         .. versionadded:: 1.4
+
+        .. versionchanged:: 1.7
+           Added the ``cache``, ``cache_ttl`` and ``cache_size`` arguments.
         """
         if callable is not None:
             callable = self.maybe_dotted(callable)
 
+        property_cache = None
+        if cache is not None:
+            if not hasattr(callable, '__call__'): # None or a descriptor
+                raise ConfigurationError(
+                    'the "cache" argument requires a callable')
+            if name is None:
+                name = callable.__name__
+            property_cache = RequestPropertyCache(
+                self.maybe_dotted(cache), cache_size, cache_ttl)
+            callable = property_cache.wrap(callable)
+            reify = True
+
         property = property or reify
         if property:
             name, callable = InstancePropertyHelper.make_property(
@@ -190,6 +258,12 @@ class FactoriesConfiguratorMixin(object):
 
             plist = exts.descriptors if property else exts.methods
             plist[name] = callable
+            if property_cache is not None:
+                self.registry.registerUtility(
+                    property_cache, IRequestPropertyCache, name=name)
+            # request classes extended before this registration are stale
+            exts.version += 1
+            exts.classes.clear()
 
         if callable is None:
             self.action(('request extensions', name), None)
@@ -200,6 +274,7 @@ class FactoriesConfiguratorMixin(object):
             intr['callable'] = callable
             intr['property'] = True
             intr['reify'] = reify
+            intr['cache'] = property_cache
             self.action(('request extensions', name), register,
                         introspectables=(intr,))
         else:
@@ -209,6 +284,7 @@ class FactoriesConfiguratorMixin(object):
             intr['callable'] = callable
             intr['property'] = False
             intr['reify'] = False
+            intr['cache'] = None
             self.action(('request extensions', name), register,
                         introspectables=(intr,))
 
@@ -237,3 +313,8 @@ class _RequestExtensions(object):
     def __init__(self):
         self.descriptors = {}
         self.methods = {}
+        # incremented by every change to the methods and descriptors
+        self.version = 0
+        # extended request classes, keyed by the class they extend and the
+        # version they were made for
+        self.classes = {}
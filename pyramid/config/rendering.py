@@ -1,4 +1,5 @@
 from pyramid.interfaces import (
+    IFragmentCache,
     IRendererFactory,
     PHASE1_CONFIG,
     )
@@ -15,6 +16,10 @@ class RenderingConfiguratorMixin(object):
     def add_default_renderers(self):
         for name, renderer in DEFAULT_RENDERERS:
             self.add_renderer(name, renderer)
+        # the fragment cache used by render_cached, registered here rather
+        # than when first used so that the registry isn't mutated while
+        # requests are being handled
+        self.set_fragment_cache(renderers.FragmentCache())
     
     @action_method
     def add_renderer(self, name, factory):
@@ -49,3 +54,29 @@ class RenderingConfiguratorMixin(object):
         self.action((IRendererFactory, name), register, order=PHASE1_CONFIG,
                     introspectables=(intr,))
 
+
+    @action_method
+    def set_fragment_cache(self, cache):
+        """
+        Configure the :term:`fragment cache` used by
+        :func:`pyramid.renderers.render_cached` and
+        :meth:`pyramid.request.Request.render_cached`.  The ``cache``
+        argument must be an object (or a :term:`dotted Python name` which
+        refers to an object) implementing
+        :class:`pyramid.interfaces.IFragmentCache`, such as an instance of
+        :class:`pyramid.renderers.FragmentCache`.
+
+        If this method is never called, a
+        :class:`pyramid.renderers.FragmentCache` with default arguments,
+        registered when the configurator sets up the registry, is used.
+
+        .. versionadded:: 1.7
+        """
+        cache = self.maybe_dotted(cache)
+        def register():
+            self.registry.registerUtility(cache, IFragmentCache)
+        intr = self.introspectable('fragment cache', None,
+                                   self.object_description(cache),
+                                   'fragment cache')
+        intr['cache'] = cache
+        self.action(IFragmentCache, register, introspectables=(intr,))
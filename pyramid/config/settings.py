@@ -87,6 +87,12 @@ class Settings(dict):
                                            config_debug_routematch)
         eff_debug_routematch = asbool(eget('PYRAMID_DEBUG_ROUTEMATCH',
                                          config_debug_routematch))
+        config_debug_memory = self.get('debug_memory', '')
+        config_debug_memory = self.get('pyramid.debug_memory',
+                                       config_debug_memory)
+        # not implied by debug_all: tracking memory slows requests down a lot
+        eff_debug_memory = asbool(eget('PYRAMID_DEBUG_MEMORY',
+                                       config_debug_memory))
         config_debug_templates = self.get('debug_templates', '')
         config_debug_templates = self.get('pyramid.debug_templates',
                                           config_debug_templates)
@@ -127,6 +133,7 @@ class Settings(dict):
             'debug_authorization': eff_debug_all or eff_debug_auth,
             'debug_notfound': eff_debug_all or eff_debug_notfound,
             'debug_routematch': eff_debug_all or eff_debug_routematch,
+            'debug_memory': eff_debug_memory,
             'debug_templates': eff_debug_all or eff_debug_templates,
             'reload_templates': eff_reload_all or eff_reload_templates,
             'reload_resources':eff_reload_all or eff_reload_assets,
@@ -138,6 +145,7 @@ class Settings(dict):
             'pyramid.debug_authorization': eff_debug_all or eff_debug_auth,
             'pyramid.debug_notfound': eff_debug_all or eff_debug_notfound,
             'pyramid.debug_routematch': eff_debug_all or eff_debug_routematch,
+            'pyramid.debug_memory': eff_debug_memory,
             'pyramid.debug_templates': eff_debug_all or eff_debug_templates,
             'pyramid.reload_templates': eff_reload_all or eff_reload_templates,
             'pyramid.reload_resources':eff_reload_all or eff_reload_assets,
@@ -9,8 +9,12 @@ from pyramid.compat import (
 
 from pyramid.exceptions import ConfigurationError
 
+from pyramid.settings import asbool
+
 from pyramid.tweens import (
     excview_tween_factory,
+    timed_tween,
+    TweenStats,
     MAIN,
     INGRESS,
     EXCVIEW,
@@ -189,6 +193,7 @@ class Tweens(object):
             first=INGRESS,
             last=MAIN)
         self.explicit = []
+        self.stats = None
 
     def add_explicit(self, name, factory):
         self.explicit.append((name, factory))
@@ -204,6 +209,29 @@ class Tweens(object):
             use = self.explicit
         else:
             use = self.implicit()
+        stats = self._get_stats(registry)
+        if stats is not None:
+            return self._instrumented(handler, registry, use, stats)
         for name, factory in use[::-1]:
             handler = factory(handler, registry)
         return handler
+
+    def _get_stats(self, registry):
+        # the TweenStats to record into when the ``pyramid.tween_stats``
+        # setting is true, shared by every chain built by this object
+        settings = getattr(registry, 'settings', None) or {}
+        if not asbool(settings.get('pyramid.tween_stats', False)):
+            return None
+        if self.stats is None:
+            self.stats = TweenStats(
+                settings.get('pyramid.tween_stats_file'),
+                float(settings.get('pyramid.tween_stats_interval', 10)),
+                )
+        return self.stats
+
+    def _instrumented(self, handler, registry, use, stats):
+        handler = timed_tween(MAIN, handler, stats, outermost=not use)
+        for i, (name, factory) in enumerate(use[::-1], 1):
+            handler = timed_tween(name, factory(handler, registry), stats,
+                                  outermost=i == len(use))
+        return handler
@@ -1882,6 +1882,23 @@ class ViewsConfiguratorMixin(object):
         viewing.  If ``permission`` is specified, the security checking will
         be performed against the default root factory ACL.
 
+        The ``file_cache`` keyword argument may be set to keep small static
+        assets in memory so they are served without filesystem access.  Its
+        value may be ``True``, in which case a
+        :class:`pyramid.static.FileCache` with default arguments is used, or
+        a :class:`pyramid.static.FileCache` instance.  By default, this
+        argument is ``None`` and no assets are cached.  This argument has no
+        effect when the ``name`` is a *url prefix*.
+
+        The ``precompressed`` keyword argument may be set to serve
+        precompressed sibling files (e.g. ``app.js.br`` or ``app.js.gz``
+        instead of ``app.js``) to clients which accept the matching content
+        encoding.  Its value may be ``True``, meaning ``('br', 'gzip')``, or a
+        sequence of encoding names in order of preference.  See
+        :class:`pyramid.static.static_view` for details.  By default, this
+        argument is ``None`` and precompressed files are never served.  This
+        argument has no effect when the ``name`` is a *url prefix*.
+
         Any other keyword arguments sent to ``add_static_view`` are passed on
         to :meth:`pyramid.config.Configurator.add_route` (e.g. ``factory``,
         perhaps to define a custom factory with a custom ACL for this static
@@ -1965,6 +1982,18 @@ def isexception(o):
     )
 
 
+def _is_plain_relative_path(path):
+    # True if joining ``path`` onto a base URL ending in a slash is a plain
+    # concatenation, i.e. ``urljoin`` would neither resolve dot segments nor
+    # treat ``path`` as absolute.
+    if path.startswith('/'):
+        return False
+    if '.' in path:
+        segments = path.split('/')
+        if '.' in segments or '..' in segments:
+            return False
+    return True
+
 @implementer(IStaticURLInfo)
 class StaticURLInfo(object):
     # Indirection for testing
@@ -1977,32 +2006,101 @@ class StaticURLInfo(object):
             reg = registry._static_url_registrations = []
         return reg
 
+    def _get_index(self, registry):
+        # Registrations are indexed by spec so that ``generate`` performs a
+        # dict lookup per distinct spec length (longest first) rather than a
+        # ``startswith`` scan over every registration.  External URLs are
+        # parsed once, here, instead of on every call.  ``add`` discards the
+        # index whenever it changes the registrations, so it is rebuilt on
+        # the next call.
+        cached = getattr(registry, '_static_url_index', None)
+        if cached is not None:
+            return cached
+        registrations = self._get_registrations(registry)
+        index = {}
+        for (url, spec, route_name, cachebust) in registrations:
+            if spec in index:
+                continue # the first registration of a spec wins
+            joinable = False
+            if url is not None:
+                parsed = url_parse(url)
+                joinable = (
+                    url.endswith('/') and
+                    not (parsed.params or parsed.query or parsed.fragment)
+                    )
+                scheme_relative = not parsed.scheme
+            else:
+                scheme_relative = False
+            index[spec] = (url, scheme_relative, joinable, route_name,
+                           cachebust)
+        lengths = sorted(set(len(spec) for spec in index), reverse=True)
+        try:
+            registry._static_url_index = (index, lengths)
+        except AttributeError: # pragma: no cover (slotted registry)
+            pass
+        return index, lengths
+
+    def _invalidate_index(self, registry):
+        try:
+            registry._static_url_index = None
+        except AttributeError: # pragma: no cover (slotted registry)
+            pass
+
     def generate(self, path, request, **kw):
         try:
             registry = request.registry
         except AttributeError: # bw compat (for tests)
             registry = get_current_registry()
-        registrations = self._get_registrations(registry)
-        for (url, spec, route_name, cachebust) in registrations:
-            if path.startswith(spec):
-                subpath = path[len(spec):]
-                if WIN: # pragma: no cover
-                    subpath = subpath.replace('\\', '/') # windows
-                if cachebust:
-                    subpath, kw = cachebust(subpath, kw)
-                if url is None:
-                    kw['subpath'] = subpath
-                    return request.route_url(route_name, **kw)
+        memo = getattr(request, '_static_url_memo', None)
+        try:
+            key = (id(registry), path, frozenset(kw.items()))
+        except TypeError: # unhashable keyword value, e.g. a _query dict
+            key = None
+        if memo is not None and key is not None:
+            result = memo.get(key)
+            if result is not None:
+                return result
+        result = self._generate(registry, path, request, kw)
+        if key is not None:
+            if memo is None:
+                memo = {}
+                try:
+                    request._static_url_memo = memo
+                except AttributeError: # pragma: no cover
+                    return result
+            memo[key] = result
+        return result
+
+    def _generate(self, registry, path, request, kw):
+        index, lengths = self._get_index(registry)
+        pathlen = len(path)
+        for length in lengths:
+            if length > pathlen:
+                continue
+            spec = path[:length]
+            info = index.get(spec)
+            if info is None:
+                continue
+            url, scheme_relative, joinable, route_name, cachebust = info
+            subpath = path[length:]
+            if WIN: # pragma: no cover
+                subpath = subpath.replace('\\', '/') # windows
+            if cachebust:
+                subpath, kw = cachebust(subpath, kw)
+            if url is None:
+                kw['subpath'] = subpath
+                return request.route_url(route_name, **kw)
+            else:
+                app_url, scheme, host, port, qs, anchor = \
+                    parse_url_overrides(kw)
+                if scheme_relative:
+                    url = request.environ['wsgi.url_scheme'] + ':' + url
+                subpath = url_quote(subpath)
+                if joinable and _is_plain_relative_path(subpath):
+                    result = url + subpath
                 else:
-                    app_url, scheme, host, port, qs, anchor = \
-                        parse_url_overrides(kw)
-                    parsed = url_parse(url)
-                    if not parsed.scheme:
-                        url = urlparse.urlunparse(parsed._replace(
-                            scheme=request.environ['wsgi.url_scheme']))
-                    subpath = url_quote(subpath)
                     result = urljoin(url, subpath)
-                    return result + qs + anchor
+                return result + qs + anchor
 
         raise ValueError('No static URL definition matching %s' % path)
 
@@ -2055,11 +2153,15 @@ class StaticURLInfo(object):
             ten_years = 10 * 365 * 24 * 60 * 60  # more or less
             default = ten_years if cb else None
             cache_max_age = extra.pop('cache_max_age', default)
+            file_cache = extra.pop('file_cache', None)
+            precompressed = extra.pop('precompressed', None)
 
             # create a view
             cb_match = getattr(cb, 'match', None)
             view = static_view(spec, cache_max_age=cache_max_age,
-                               use_subpath=True, cachebust_match=cb_match)
+                               use_subpath=True, cachebust_match=cb_match,
+                               file_cache=file_cache,
+                               precompressed=precompressed)
 
             # Mutate extra to allow factory, etc to be passed through here.
             # Treat permission specially because we'd like to default to
@@ -2101,6 +2203,7 @@ class StaticURLInfo(object):
 
             # url, spec, route_name
             registrations.append((url, spec, route_name, cachebust))
+            self._invalidate_index(config.registry)
 
         intr = config.introspectable('static views',
                                      name,
@@ -2,17 +2,71 @@ from pyramid.compat import (
     text_type,
     binary_type,
     is_nonstr_iter,
+    native_,
     url_quote as _url_quote,
     url_quote_plus as _quote_plus,
     )
 
-def url_quote(val, safe=''): # bw compat api
+# characters which the stdlib never quotes, whatever ``safe`` is; '~' is
+# only among them on some versions of Python
+_ALWAYS_SAFE = ''.join(
+    c for c in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~'
+    if _url_quote(c, safe='') == c
+    )
+
+_safe_chars_cache = {}
+
+def _safe_chars(safe):
+    # Return the characters which quoting with ``safe`` leaves unchanged.  A
+    # native string ``val`` needs no quoting if ``val.strip(chars)`` is
+    # empty, which is much cheaper to find out than quoting it.  A space is
+    # never considered safe, because ``quote_plus`` always replaces it, and
+    # neither are non-ASCII characters, which the stdlib ignores in ``safe``.
+    # ``safe`` may be text or bytes, like the stdlib's.
+    try:
+        return _safe_chars_cache[safe]
+    except KeyError:
+        text = safe
+        if isinstance(text, binary_type):
+            text = text.decode('latin-1')
+        chars = native_(_ALWAYS_SAFE + ''.join(
+            c for c in text if c != ' ' and ord(c) < 128))
+        _safe_chars_cache[safe] = chars
+        return chars
+
+# caches of the quoted form of strings which need quoting, keyed on
+# ``(value, safe)``; a cache is emptied rather than allowed to grow past
+# ``_CACHE_SIZE`` entries, which is far cheaper than LRU bookkeeping on
+# every hit
+_CACHE_SIZE = 10000
+_quote_cache = {}
+_quote_plus_cache = {}
+
+def _quote(val, safe, quote, cache):
     cls = val.__class__
-    if cls is text_type:
-        val = val.encode('utf-8')
-    elif cls is not binary_type:
-        val = str(val).encode('utf-8')
-    return _url_quote(val, safe=safe)
+    if cls is str and not val.strip(_safe_chars(safe)):
+        return val
+    if cls is text_type or cls is binary_type:
+        key = (val, safe)
+        try:
+            return cache[key]
+        except KeyError:
+            if cls is text_type:
+                result = quote(val.encode('utf-8'), safe=safe)
+            else:
+                result = quote(val, safe=safe)
+            if len(cache) >= _CACHE_SIZE:
+                cache.clear()
+            cache[key] = result
+            return result
+    val = str(val)
+    if not val.strip(_safe_chars(safe)):
+        return val
+    return quote(val.encode('utf-8'), safe=safe)
+
+def url_quote(val, safe=''): # bw compat api
+    return _quote(val, safe, _url_quote, _quote_cache)
 
 def urlencode(query, doseq=True):
     """
@@ -48,32 +102,22 @@ def urlencode(query, doseq=True):
     except AttributeError:
         pass
 
-    result = ''
-    prefix = ''
+    parts = []
+    append = parts.append
 
     for (k, v) in query:
         k = quote_plus(k)
 
         if is_nonstr_iter(v):
             for x in v:
-                x = quote_plus(x)
-                result += '%s%s=%s' % (prefix, k, x)
-                prefix = '&'
+                append('%s=%s' % (k, quote_plus(x)))
         elif v is None:
-            result += '%s%s=' % (prefix, k)
+            append(k + '=')
         else:
-            v = quote_plus(v)
-            result += '%s%s=%s' % (prefix, k, v)
+            append('%s=%s' % (k, quote_plus(v)))
 
-        prefix = '&'
-
-    return result
+    return '&'.join(parts)
 
 # bw compat api (dnr)
 def quote_plus(val, safe=''):
-    cls = val.__class__
-    if cls is text_type:
-        val = val.encode('utf-8')
-    elif cls is not binary_type:
-        val = str(val).encode('utf-8')
-    return _quote_plus(val, safe=safe)
+    return _quote(val, safe, _quote_plus, _quote_plus_cache)
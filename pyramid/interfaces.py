@@ -405,6 +405,28 @@ class IRenderer(Interface):
         view), and ``request`` (the request object passed to the
         view)."""
 
+class IFragmentCache(Interface):
+    """ A utility which stores rendered fragments (the results of
+    :func:`pyramid.renderers.render`) so they can be reused across requests.
+    Entries live in a *namespace*; all entries in a namespace may be
+    invalidated at once."""
+    def get(namespace, key, default=None):
+        """ Return the fragment stored under ``key`` in ``namespace`` or
+        ``default`` if there is no such fragment or it has expired."""
+
+    def set(namespace, key, value, ttl=None):
+        """ Store ``value`` under ``key`` in ``namespace``.  If ``ttl`` is
+        not ``None``, the entry expires after ``ttl`` seconds; otherwise the
+        cache's default expiration applies."""
+
+    def invalidate(namespace=None):
+        """ Discard every entry in ``namespace``.  If ``namespace`` is
+        ``None``, discard every entry in the cache."""
+
+    def stats():
+        """ Return a dictionary containing at least the integer keys
+        ``hits`` and ``misses`` describing the use of the cache."""
+
 class ITemplateRenderer(IRenderer):
     def implementation():
         """ Return the object that the underlying templating system
@@ -572,6 +594,24 @@ class IRequestExtensions(Interface):
     methods = Attribute(
         """A list of methods to be added to each request.""")
 
+class IRequestPropertyCache(Interface):
+    """ A cache shared by requests of the values of a request property added
+    using :meth:`pyramid.config.Configurator.add_request_method` with the
+    ``cache`` argument.  It is registered as a utility named after the
+    property."""
+    def invalidate(key):
+        """ Discard the value cached for ``key`` (a value returned by the
+        key function of the property), if any."""
+
+    def clear():
+        """ Discard every cached value."""
+
+    def stats():
+        """ Return a dictionary with the keys ``hits`` and ``misses`` (the
+        number of times the property was computed by requests which found,
+        or didn't find, a cached value) and ``size`` (the number of values
+        currently cached)."""
+
 class IRouteRequest(Interface):
     """ *internal only* interface used as in a utility lookup to find
     route-specific interfaces.  Not an API."""
@@ -688,6 +728,54 @@ class IDebugLogger(Interface):
 
 ILogger = IDebugLogger # b/c
 
+class IBackgroundExecutor(Interface):
+    """ An object which runs tasks outside of the request thread, used for
+    finished callbacks and subscribers added with ``background=True``.  See
+    :class:`pyramid.background.BackgroundExecutor`."""
+    def submit(fn, *args, **kw):
+        """ Arrange for ``fn(*args, **kw)`` to be called outside of the
+        calling thread."""
+
+    def shutdown(wait=True):
+        """ Stop accepting tasks, and let the tasks already submitted run.
+        If ``wait`` is true, block until they have finished."""
+
+class IRequestProfiler(Interface):
+    """ An object which is told how long each phase of the handling of a
+    request takes.  When one is registered (see
+    :meth:`pyramid.config.Configurator.set_request_profiler`), the
+    :app:`Pyramid` router, view lookup and renderers call its ``record``
+    method; when none is, they do not even read the clock.  See
+    :class:`pyramid.profiling.RequestProfiler`."""
+    def record(request, phase, start, stop, view=None):
+        """ Record that the ``phase`` of the handling of ``request`` started
+        at ``start`` and stopped at ``stop``, two
+        :func:`time.perf_counter` values.  ``phase`` is one of
+        ``route_match``, ``root_factory``, ``traversal``, ``view_lookup``,
+        ``view_call`` and ``render``; phases may nest (rendering happens
+        during the view call).  ``view`` is the :term:`view callable`
+        concerned by the ``view_call`` and ``render`` phases, if known, and
+        ``None`` otherwise.  ``request`` may be ``None`` when rendering
+        outside of a request.  This method must be thread-safe."""
+
+class IMemoryTracker(Interface):
+    """ An object which tracks the memory allocated by the handling of
+    requests, registered when the ``pyramid.debug_memory`` setting is true.
+    See :class:`pyramid.profiling.MemoryTracker`."""
+    def wrap(handler):
+        """ Return a function which calls ``handler(request)`` and records
+        the memory allocated meanwhile."""
+
+    def report():
+        """ Return the statistics collected so far, as a list of
+        JSON-serializable dictionaries."""
+
+    def reset():
+        """ Discard the statistics collected so far."""
+
+    def dump(path=None):
+        """ Write the report as JSON to ``path``."""
+
 class IRoutePregenerator(Interface):
     def __call__(request, elements, kw):
 
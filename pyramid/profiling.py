@@ -0,0 +1,698 @@
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+try:
+    import cProfile
+    import pstats
+except ImportError: # pragma: no cover (some distributions strip them)
+    cProfile = pstats = None
+
+try:
+    import tracemalloc
+except ImportError: # pragma: no cover (Python < 3.4)
+    tracemalloc = None
+
+from zope.interface import implementer
+
+from pyramid.compat import (
+    get_ident,
+    perf_counter,
+    )
+from pyramid.exceptions import ConfigurationError
+from pyramid.interfaces import (
+    IDebugLogger,
+    IMemoryTracker,
+    IRequestProfiler,
+    IRoutesMapper,
+    )
+from pyramid.settings import aslist
+
+def _write_atomically(path, write):
+    # call ``write(tmp)`` to write a temporary file next to ``path``, then
+    # rename it to ``path``
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    try:
+        write(tmp)
+        if os.path.exists(path): # windows can't rename over a file
+            os.remove(path)
+        os.rename(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError: # pragma: no cover
+            pass
+        raise
+
+def _process_path(path):
+    # ``path`` with any ``{pid}`` replaced by the id of this process, so
+    # that each worker process of a server can dump to its own file
+    return path.replace('{pid}', str(os.getpid()))
+
+class _JSONDumper(object):
+    # periodically dumps the ``dump_data()`` of an object to ``path``
+
+    path = None
+    interval = 10
+    last_dump = 0
+
+    def maybe_dump(self):
+        """ Write a dump to :attr:`path` if there is one and the last dump
+        is older than :attr:`interval` seconds."""
+        if self.path is not None:
+            now = perf_counter()
+            if now - self.last_dump >= self.interval:
+                self.last_dump = now
+                self.dump()
+
+    def dump(self, path=None):
+        """ Atomically write a JSON dump of the statistics to ``path`` (by
+        default :attr:`path`).  Any ``{pid}`` in the path is replaced by the
+        id of the current process."""
+        if path is None:
+            path = self.path
+        path = _process_path(path)
+        data = json.dumps(self.dump_data(), indent=2, sort_keys=True)
+        def write(tmp):
+            with open(tmp, 'w') as f:
+                f.write(data)
+        _write_atomically(path, write)
+
+class LatencyStats(_JSONDumper):
+    """ Thread-safe in-memory statistics of durations, kept per key: the
+    number of durations recorded, their total and maximum, and a histogram
+    of them.
+
+    If ``path`` is not ``None``, a JSON dump of the statistics is written to
+    it by :meth:`maybe_dump` at most every ``interval`` seconds.
+
+    .. versionadded:: 1.7
+    """
+
+    #: upper bounds (in seconds) of the histogram buckets; the last bucket
+    #: holds the durations longer than every bound
+    bounds = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+              0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, path=None, interval=10):
+        self.path = path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.last_dump = perf_counter()
+
+    def add(self, key, duration):
+        """ Add ``duration`` (in seconds) to the statistics of ``key``."""
+        bounds = self.bounds
+        lo, hi = 0, len(bounds)
+        while lo < hi: # bisect, without allocating
+            mid = (lo + hi) // 2
+            if bounds[mid] < duration:
+                lo = mid + 1
+            else:
+                hi = mid
+        with self.lock:
+            stat = self.stats.get(key)
+            if stat is None:
+                stat = self.stats[key] = [0, 0.0, duration,
+                                          [0] * (len(bounds) + 1)]
+            stat[0] += 1
+            stat[1] += duration
+            if duration > stat[2]:
+                stat[2] = duration
+            stat[3][lo] += 1
+
+    def snapshot(self):
+        """ Return a dictionary mapping each key to a dictionary with the
+        keys ``count`` (the number of durations recorded), ``total`` and
+        ``max`` (in seconds) and ``histogram`` (a list of the number of
+        durations per bucket, see :attr:`bounds`)."""
+        with self.lock:
+            return dict(
+                (key, {
+                    'count': count,
+                    'total': total,
+                    'max': max_,
+                    'histogram': list(histogram),
+                    })
+                for key, (count, total, max_, histogram)
+                in self.stats.items()
+                )
+
+    def reset(self):
+        """ Discard the statistics collected so far."""
+        with self.lock:
+            self.stats = {}
+
+    def dump_data(self):
+        """ Return the JSON-serializable data written by :meth:`dump`.
+        Subclasses whose keys are not strings override this."""
+        return {'bounds': list(self.bounds), 'stats': self.snapshot()}
+
+def view_description(view):
+    """ Return a stable description of the :term:`view callable` ``view``:
+    the dotted name of the function or class it was derived from."""
+    view = getattr(view, '__original_view__', view)
+    name = getattr(view, '__name__', None)
+    if name is None:
+        name = view.__class__.__name__
+    module = getattr(view, '__module__', None)
+    if module is None:
+        return name
+    return '%s.%s' % (module, name)
+
+@implementer(IRequestProfiler)
+class RequestProfiler(LatencyStats):
+    """ The default :class:`pyramid.interfaces.IRequestProfiler`, which
+    aggregates the durations of the phases of request handling in memory,
+    keyed by phase, :term:`route` name (``None`` when no route matched)
+    and view (``None`` for the phases preceding the view lookup).
+
+    Use :meth:`snapshot` to read the statistics, whose keys are tuples of
+    ``(phase, route name, view description)``.  If ``path`` is not
+    ``None``, a JSON dump of them is written to it at most every
+    ``interval`` seconds while requests are being handled.
+
+    Register it using
+    :meth:`pyramid.config.Configurator.set_request_profiler`.
+
+    .. versionadded:: 1.7
+    """
+
+    def record(self, request, phase, start, stop, view=None):
+        route = getattr(request, 'matched_route', None)
+        if route is not None:
+            route = route.name
+        if view is not None:
+            view = view_description(view)
+        self.add((phase, route, view), stop - start)
+        self.maybe_dump()
+
+    def dump_data(self):
+        stats = []
+        for (phase, route, view), stat in self.snapshot().items():
+            stat.update(phase=phase, route=route, view=view)
+            stats.append(stat)
+        stats.sort(key=lambda stat: (
+            stat['phase'], stat['route'] or '', stat['view'] or ''))
+        return {'bounds': list(self.bounds), 'stats': stats}
+
+class SamplingProfiler(object):
+    """ Profiles a sample of requests with :mod:`cProfile`, for use by
+    :func:`profiler_tween_factory`.
+
+    A request is profiled if it is one of every ``sample`` requests (no
+    request is sampled if ``sample`` is ``0``), if the name of the
+    :term:`route` it matches is in ``routes``, or if it has a ``header``
+    header.  When ``routes`` is not empty, ``routes_mapper`` (the
+    application's :class:`pyramid.interfaces.IRoutesMapper`) is used to
+    find out which requests may match one of them before they are handled,
+    and only those are profiled.  The route the router actually matched is
+    checked once the request has been handled, and the profile is
+    discarded if it is none of ``routes``, e.g. because a predicate only
+    known to the router made it match another route.
+
+    The profile of each request is written to ``directory`` as a
+    :mod:`pstats` file named after the time, the route name and the
+    duration of the request, e.g.
+    ``request-20151018T120000.123456-home-153ms.prof``; only the ``keep``
+    most recent files are kept.
+
+    If ``aggregate`` is not ``None``, the profiles are instead merged per
+    route, and every ``aggregate`` seconds the merged profile of each route
+    is written as e.g. ``aggregate-20151018T120000.123456-home-42req.prof``
+    (again, only the ``keep`` most recent such files are kept).
+
+    .. versionadded:: 1.7
+    """
+
+    def __init__(self, directory, sample=100, routes=(), header=None,
+                 keep=100, aggregate=None, routes_mapper=None):
+        self.directory = directory
+        self.sample = sample
+        self.routes = frozenset(routes)
+        self.header = header
+        self.keep = keep
+        self.aggregate = aggregate
+        self.routes_mapper = routes_mapper
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+        self.aggregates = {}
+        self.window_start = perf_counter()
+
+    def wanted(self, request):
+        """ Return ``True`` if ``request`` should be profiled whichever
+        route it matches, i.e. if it is sampled or has the header."""
+        if self.sample and next(self.counter) % self.sample == 0:
+            return True
+        if self.header is not None and self.header in request.headers:
+            return True
+        return False
+
+    def route_candidate(self, request):
+        """ Return ``True`` if ``request``, which has not been handled yet,
+        may match one of the routes whose requests are all profiled."""
+        if not self.routes or self.routes_mapper is None:
+            return False
+        route = self.routes_mapper(request)['route']
+        return route is not None and route.name in self.routes
+
+    def route_wanted(self, request):
+        """ Return ``True`` if ``request``, which has been handled, matched
+        one of the routes whose requests are all profiled."""
+        route = getattr(request, 'matched_route', None)
+        return route is not None and route.name in self.routes
+
+    def _filename(self, kind, route_name, suffix):
+        now = time.time()
+        stamp = '%s.%06d' % (time.strftime('%Y%m%dT%H%M%S',
+                                           time.localtime(now)),
+                             int(now % 1 * 1000000))
+        route_name = re.sub(r'[^\w.-]', '_', route_name or '_')
+        return os.path.join(
+            self.directory,
+            '%s-%s-%s-%s.prof' % (kind, stamp, route_name, suffix))
+
+    def _rotate(self, kind):
+        prefix = kind + '-'
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(prefix) and name.endswith('.prof'))
+        for name in names[:max(len(names) - self.keep, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError: # pragma: no cover (removed concurrently)
+                pass
+
+    def save(self, request, profile, duration):
+        """ Save the :class:`cProfile.Profile` ``profile`` of ``request``,
+        which took ``duration`` seconds."""
+        route = getattr(request, 'matched_route', None)
+        route_name = route.name if route is not None else None
+        if self.aggregate is not None:
+            with self.lock:
+                stats = self.aggregates.get(route_name)
+                if stats is None:
+                    self.aggregates[route_name] = [pstats.Stats(profile), 1]
+                else:
+                    stats[0].add(profile)
+                    stats[1] += 1
+                due = perf_counter() - self.window_start >= self.aggregate
+            if due:
+                self.flush()
+            return
+        path = self._filename('request', route_name,
+                              '%dms' % (duration * 1000))
+        _write_atomically(path, profile.dump_stats)
+        with self.lock:
+            self._rotate('request')
+
+    def flush(self):
+        """ Write the profiles merged so far in aggregate mode and start a
+        new window."""
+        with self.lock:
+            aggregates, self.aggregates = self.aggregates, {}
+            self.window_start = perf_counter()
+            for route_name, (stats, count) in sorted(
+                    aggregates.items(), key=lambda item: item[0] or ''):
+                path = self._filename('aggregate', route_name,
+                                      '%dreq' % count)
+                _write_atomically(path, stats.dump_stats)
+            if aggregates:
+                self._rotate('aggregate')
+
+def profiler_tween_factory(handler, registry):
+    """ A :term:`tween` factory which produces a tween that profiles a
+    sample of requests with :mod:`cProfile` and writes the profiles to a
+    directory, configured by these settings:
+
+    ``pyramid.profile_directory``
+      The directory to write profiles to (required).
+
+    ``pyramid.profile_sample``
+      Profile one of every this many requests, ``0`` to only profile
+      requests matching the two following settings (default: ``100``).
+
+    ``pyramid.profile_routes``
+      The names of :term:`route` objects whose requests are all profiled.
+      The routes are matched before the request is handled to decide
+      whether to profile it, and the profile is discarded if the route
+      the router matched is none of them.
+
+    ``pyramid.profile_header``
+      The name of a request header; the requests which have it are all
+      profiled.
+
+    ``pyramid.profile_keep``
+      The number of profile files to keep (default: ``100``).
+
+    ``pyramid.profile_aggregate``
+      If set, a number of seconds: the profiles of the requests matching
+      each route are merged, and written every this many seconds.
+
+    See :class:`pyramid.profiling.SamplingProfiler`.
+
+    .. versionadded:: 1.7
+    """
+    if cProfile is None: # pragma: no cover
+        raise ConfigurationError('The profiler tween requires cProfile')
+    settings = getattr(registry, 'settings', None) or {}
+    directory = settings.get('pyramid.profile_directory')
+    if not directory:
+        raise ConfigurationError(
+            'The profiler tween requires the "pyramid.profile_directory" '
+            'setting')
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    aggregate = settings.get('pyramid.profile_aggregate')
+    profiler = SamplingProfiler(
+        directory,
+        sample=int(settings.get('pyramid.profile_sample', 100)),
+        routes=aslist(settings.get('pyramid.profile_routes', '')),
+        header=settings.get('pyramid.profile_header') or None,
+        keep=int(settings.get('pyramid.profile_keep', 100)),
+        aggregate=float(aggregate) if aggregate else None,
+        routes_mapper=registry.queryUtility(IRoutesMapper),
+        )
+
+    def profiler_tween(request):
+        wanted = profiler.wanted(request)
+        if not wanted and not profiler.route_candidate(request):
+            return handler(request)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError: # pragma: no cover (another profiler is active)
+            return handler(request)
+        start = perf_counter()
+        try:
+            return handler(request)
+        finally:
+            profile.disable()
+            # the router may have matched another route than the mapper
+            if wanted or profiler.route_wanted(request):
+                profiler.save(request, profile, perf_counter() - start)
+
+    profiler_tween.profiler = profiler
+    return profiler_tween
+
+class SlowRequestDetector(object):
+    """ Finds out where requests which take longer than ``threshold``
+    seconds are stuck, for use by :func:`slow_request_tween_factory`.
+
+    Requests are registered by the thread handling them using :meth:`begin`
+    and :meth:`end`.  A watchdog thread, started by the first call to
+    :meth:`begin`, wakes up every ``interval`` seconds and records the
+    current stack of the threads handling a request which started more
+    than ``threshold`` seconds ago (at most ``max_samples`` distinct stacks
+    per request).  When such a request ends, its duration, route name,
+    view name and stack samples are logged as a warning to ``logger``.
+
+    .. versionadded:: 1.7
+    """
+
+    def __init__(self, threshold=1.0, interval=0.1, logger=None,
+                 max_samples=20):
+        self.threshold = threshold
+        self.interval = interval
+        self.logger = logger
+        self.max_samples = max_samples
+        self.active = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def begin(self, request):
+        """ Register that the current thread started handling
+        ``request``; return a token to pass to :meth:`end`."""
+        if self.thread is None:
+            self._start()
+        ident = get_ident()
+        active = self.active
+        # the entry of an enclosing request (see invoke_subrequest) is put
+        # back by end()
+        previous = active.get(ident)
+        active[ident] = entry = [perf_counter(), request, []]
+        return ident, entry, previous
+
+    def end(self, token):
+        """ Register that the request whose handling was registered by the
+        call to :meth:`begin` which returned ``token`` ended."""
+        ident, entry, previous = token
+        if previous is None:
+            self.active.pop(ident, None)
+        else:
+            self.active[ident] = previous
+        if entry[2]:
+            self.report(entry[1], perf_counter() - entry[0], entry[2])
+
+    def _start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._watch, name='pyramid-slow-requests')
+                self.thread.daemon = True
+                self.thread.start()
+
+    def _watch(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        """ Stop the watchdog thread."""
+        self.stopped.set()
+        thread = self.thread
+        if thread is not None:
+            thread.join()
+
+    def sample(self):
+        """ Record the stack of the threads handling slow requests."""
+        deadline = perf_counter() - self.threshold
+        slow = [(ident, entry) for ident, entry in list(self.active.items())
+                if entry[0] <= deadline]
+        if not slow:
+            return
+        frames = sys._current_frames()
+        for ident, entry in slow:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            stack = ''.join(traceback.format_stack(frame))
+            samples = entry[2]
+            for sample in samples:
+                if sample[0] == stack:
+                    sample[1] += 1
+                    break
+            else:
+                if len(samples) < self.max_samples:
+                    samples.append([stack, 1])
+        del frames # frames refer to the stacks of all the threads
+
+    def report(self, request, duration, samples):
+        """ Log that ``request`` took ``duration`` seconds, along with the
+        stack ``samples`` recorded while it was being handled."""
+        if self.logger is None:
+            return
+        attrs = getattr(request, '__dict__', {})
+        route = attrs.get('matched_route')
+        lines = [
+            'slow request for url %s; duration: %.3fs, route_name: %r, '
+            'view_name: %r; %d stack sample(s):' % (
+                getattr(request, 'url', None), duration,
+                route.name if route is not None else None,
+                attrs.get('view_name'),
+                sum(count for stack, count in samples))
+            ]
+        for stack, count in samples:
+            lines.append('%d sample(s) of:' % count)
+            lines.append(stack.rstrip('\n'))
+        self.logger.warning('\n'.join(lines))
+
+def slow_request_tween_factory(handler, registry):
+    """ A :term:`tween` factory which produces a tween that logs the
+    requests which take longer than the ``pyramid.slow_request_threshold``
+    setting (in seconds, default: ``1``) to the :term:`debug logger`, along
+    with samples of the stack of the thread handling them taken every
+    ``pyramid.slow_request_interval`` seconds (default: ``0.1``) once the
+    threshold has been passed.  The tween reads the clock once per request.
+
+    See :class:`pyramid.profiling.SlowRequestDetector`.
+
+    .. versionadded:: 1.7
+    """
+    settings = getattr(registry, 'settings', None) or {}
+    detector = SlowRequestDetector(
+        threshold=float(settings.get('pyramid.slow_request_threshold', 1.0)),
+        interval=float(settings.get('pyramid.slow_request_interval', 0.1)),
+        logger=registry.queryUtility(IDebugLogger),
+        )
+    begin = detector.begin
+    end = detector.end
+
+    def slow_request_tween(request):
+        token = begin(request)
+        try:
+            return handler(request)
+        finally:
+            end(token)
+
+    slow_request_tween.detector = detector
+    return slow_request_tween
+
+@implementer(IMemoryTracker)
+class MemoryTracker(_JSONDumper):
+    """ Tracks the memory allocated by the handling of requests using
+    :mod:`tracemalloc`, per :term:`route` name and view name; used when the
+    ``pyramid.debug_memory`` setting is true.
+
+    A snapshot of the traced memory blocks is taken before and after each
+    request handled by a handler wrapped using :meth:`wrap`; the difference
+    between them (the memory retained by the request, which is negative if
+    it freed more than it allocated) and its ``top`` largest allocation
+    sites are added to the statistics of the request's route and view.
+    Tracing is started with ``frames`` frames per traceback if it isn't
+    already.
+
+    Use :meth:`report` to read the statistics.  If ``path`` is not
+    ``None``, a JSON dump of them is written to it at most every
+    ``interval`` seconds while requests are being handled.
+
+    Taking snapshots is slow and the memory allocated by the other threads
+    in the meantime is attributed to the request, so this is meant for
+    debugging, e.g. in a staging environment.
+
+    .. versionadded:: 1.7
+    """
+
+    def __init__(self, top=10, frames=1, path=None, interval=10):
+        if tracemalloc is None: # pragma: no cover
+            raise ConfigurationError(
+                'Tracking memory requires the tracemalloc module '
+                '(Python 3.4+)')
+        self.top = top
+        self.frames = frames
+        self.path = path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.last_dump = perf_counter()
+        self.filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            )
+
+    def take_snapshot(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        return tracemalloc.take_snapshot().filter_traces(self.filters)
+
+    def wrap(self, handler):
+        """ Return a function which calls ``handler(request)`` and records
+        the memory allocated meanwhile."""
+        def tracked(request):
+            before = self.take_snapshot()
+            try:
+                return handler(request)
+            finally:
+                after = self.take_snapshot()
+                self.record(request, after.compare_to(before, 'lineno'))
+                self.maybe_dump()
+        return tracked
+
+    def record(self, request, differences):
+        """ Add the :class:`tracemalloc.StatisticDiff` list ``differences``,
+        sorted by decreasing size difference, to the statistics of the route
+        and view of ``request``."""
+        attrs = getattr(request, '__dict__', {})
+        route = attrs.get('matched_route')
+        key = (route.name if route is not None else None,
+               attrs.get('view_name'))
+        retained = sum(diff.size_diff for diff in differences)
+        top = []
+        for diff in differences[:self.top]:
+            frame = diff.traceback[0]
+            top.append(('%s:%s' % (frame.filename, frame.lineno),
+                        diff.size_diff, diff.count_diff))
+        with self.lock:
+            stat = self.stats.get(key)
+            if stat is None:
+                stat = self.stats[key] = [0, 0, retained, {}]
+            stat[0] += 1
+            stat[1] += retained
+            if retained > stat[2]:
+                stat[2] = retained
+            sites = stat[3]
+            for site, size, count in top:
+                totals = sites.setdefault(site, [0, 0])
+                totals[0] += size
+                totals[1] += count
+
+    def report(self):
+        """ Return a list of dictionaries, one per route name and view name
+        pair, sorted by decreasing total retained memory, with the keys
+        ``route`` and ``view`` (the names, or ``None``), ``count`` (the
+        number of requests), ``retained`` and ``max_retained`` (the total
+        and maximum memory retained by a request, in bytes) and ``top`` (a
+        list of the ``top`` allocation sites which retained the most memory
+        in total, as dictionaries with the keys ``site`` (``file:line``),
+        ``size`` (in bytes) and ``count`` (in memory blocks))."""
+        with self.lock:
+            stats = [
+                (key, count, retained, max_retained, list(sites.items()))
+                for key, (count, retained, max_retained, sites)
+                in self.stats.items()
+                ]
+        report = []
+        for (route, view), count, retained, max_retained, sites in stats:
+            sites.sort(key=lambda item: item[1][0], reverse=True)
+            report.append({
+                'route': route,
+                'view': view,
+                'count': count,
+                'retained': retained,
+                'max_retained': max_retained,
+                'top': [
+                    {'site': site, 'size': size, 'count': blocks}
+                    for site, (size, blocks) in sites[:self.top]
+                    ],
+                })
+        report.sort(key=lambda item: item['retained'], reverse=True)
+        return report
+
+    def reset(self):
+        """ Discard the statistics collected so far."""
+        with self.lock:
+            self.stats = {}
+
+    def dump_data(self):
+        return self.report()
+
+def get_memory_tracker(registry):
+    """ Return the :class:`pyramid.interfaces.IMemoryTracker` of
+    ``registry``, registering a :class:`MemoryTracker` configured by the
+    ``pyramid.debug_memory_top`` (default: ``10``),
+    ``pyramid.debug_memory_frames`` (default: ``1``),
+    ``pyramid.debug_memory_file`` and ``pyramid.debug_memory_interval``
+    (default: ``10``) settings if there is none.
+
+    .. versionadded:: 1.7
+    """
+    tracker = registry.queryUtility(IMemoryTracker)
+    if tracker is None:
+        settings = getattr(registry, 'settings', None) or {}
+        tracker = MemoryTracker(
+            top=int(settings.get('pyramid.debug_memory_top', 10)),
+            frames=int(settings.get('pyramid.debug_memory_frames', 1)),
+            path=settings.get('pyramid.debug_memory_file') or None,
+            interval=float(settings.get('pyramid.debug_memory_interval', 10)),
+            )
+        registry.registerUtility(tracker, IMemoryTracker)
+    return tracker
+
@@ -1,7 +1,12 @@
 import operator
 import threading
 
-from zope.interface import implementer
+from zope.interface import (
+    implementedBy,
+    implementer,
+    providedBy,
+    )
+from zope.interface.interfaces import IInterface
 
 from zope.interface.registry import Components
 
@@ -12,9 +17,17 @@ from pyramid.interfaces import (
     ISettings,
     IIntrospector,
     IIntrospectable,
+    IRequestPropertyCache,
+    IRequestProfiler,
     )
 
 empty = text_('')
+_marker = object()
+
+# the subscriber cache is emptied rather than allowed to grow past
+# ``_CACHE_SIZE`` entries, as events given per-instance interfaces (using
+# ``directlyProvides`` or ``alsoProvides``) add one per combination of them
+_CACHE_SIZE = 1000
 
 class Registry(Components, dict):
     """ A registry object is an :term:`application registry`.  It is used by
@@ -38,6 +51,10 @@ class Registry(Components, dict):
     # to notify them
     has_listeners = False
 
+    # the registered IRequestProfiler, kept as an attribute so that the
+    # request handling code can cheaply find out whether there is one
+    request_profiler = None
+
     _settings = None
 
     def __init__(self, *arg, **kw):
@@ -46,11 +63,28 @@ class Registry(Components, dict):
         self._lock = threading.Lock()
         # add a view lookup cache
         self._clear_view_lookup_cache()
+        # add a cache of facts derived from the set of registered subscribers
+        self._clear_subscriber_cache()
         Components.__init__(self, *arg, **kw)
 
     def _clear_view_lookup_cache(self):
         self._view_lookup_cache = {}
 
+    def _clear_subscriber_cache(self):
+        self._subscriber_cache = {}
+        self._subscriber_cache_generation = None
+
+    def _get_subscriber_cache(self):
+        # the subscriber cache, emptied when the adapter registry changed
+        # since it was filled: its generation is bumped by any registration
+        # made in it or in the registries it is based on, which the
+        # register*/unregister* methods of this registry don't see
+        generation = self.adapters._generation
+        if self._subscriber_cache_generation != generation:
+            self._subscriber_cache = {}
+            self._subscriber_cache_generation = generation
+        return self._subscriber_cache
+
     def __nonzero__(self):
         # defeat bool determination via dict.__len__
         return True
@@ -62,6 +96,22 @@ class Registry(Components, dict):
     def registerSubscriptionAdapter(self, *arg, **kw):
         result = Components.registerSubscriptionAdapter(self, *arg, **kw)
         self.has_listeners = True
+        self._clear_subscriber_cache()
+        return result
+
+    def unregisterSubscriptionAdapter(self, *arg, **kw):
+        result = Components.unregisterSubscriptionAdapter(self, *arg, **kw)
+        self._clear_subscriber_cache()
+        return result
+
+    def registerUtility(self, *arg, **kw):
+        result = Components.registerUtility(self, *arg, **kw)
+        self.request_profiler = self.queryUtility(IRequestProfiler)
+        return result
+
+    def unregisterUtility(self, *arg, **kw):
+        result = Components.unregisterUtility(self, *arg, **kw)
+        self.request_profiler = self.queryUtility(IRequestProfiler)
         return result
 
     def registerSelfAdapter(self, required=None, provided=None, name=empty,
@@ -83,12 +133,79 @@ class Registry(Components, dict):
     def registerHandler(self, *arg, **kw):
         result = Components.registerHandler(self, *arg, **kw)
         self.has_listeners = True
+        self._clear_subscriber_cache()
         return result
 
+    def unregisterHandler(self, *arg, **kw):
+        result = Components.unregisterHandler(self, *arg, **kw)
+        self._clear_subscriber_cache()
+        return result
+
+    def has_listeners_for(self, event_type):
+        """ Return ``True`` if an event of the class (or providing the
+        interface) ``event_type`` sent to :meth:`notify` would reach at
+        least one subscriber, ``False`` otherwise.  The answer for each
+        ``event_type`` is computed once and then remembered until a
+        subscriber is registered or unregistered, so that code can skip
+        creating events which nobody listens to.
+
+        .. versionadded:: 1.7
+        """
+        if not self.has_listeners:
+            return False
+        cache = self._get_subscriber_cache()
+        try:
+            return cache[event_type]
+        except KeyError:
+            if IInterface.providedBy(event_type):
+                spec = event_type
+            else:
+                spec = implementedBy(event_type)
+            result = bool(self.adapters.subscriptions((spec,), None))
+            if len(cache) >= _CACHE_SIZE:
+                cache.clear()
+            cache[event_type] = result
+            return result
+
     def notify(self, *events):
         if self.has_listeners:
-            # iterating over subscribers assures they get executed
-            [ _ for _ in self.subscribers(events, None) ]
+            # the handlers subscribed to events providing a given set of
+            # specifications are looked up once and then kept in the
+            # subscriber cache (cleared when a subscriber is registered or
+            # unregistered, or when it gets too large), so that notifying is
+            # a loop over a tuple
+            specs = tuple(map(providedBy, events))
+            cache = self._get_subscriber_cache()
+            try:
+                handlers = cache[specs]
+            except KeyError:
+                handlers = tuple(self.adapters.subscriptions(specs, None))
+                if len(cache) >= _CACHE_SIZE:
+                    cache.clear()
+                cache[specs] = handlers
+            for handler in handlers:
+                handler(*events)
+
+    def invalidate_request_property(self, name, key=_marker):
+        """ Discard the values of the request property named ``name`` which
+        are cached across requests (see the ``cache`` argument of
+        :meth:`pyramid.config.Configurator.add_request_method`).  If ``key``
+        is passed, only the value cached for that key is discarded.  Raise a
+        :exc:`KeyError` if no such cached property exists.
+
+        The values are only discarded from the cache: requests which already
+        computed or looked up the property keep their (reified) value, and a
+        request computing it concurrently may store a stale value again.
+
+        .. versionadded:: 1.7
+        """
+        cache = self.queryUtility(IRequestPropertyCache, name=name)
+        if cache is None:
+            raise KeyError(name)
+        if key is _marker:
+            cache.clear()
+        else:
+            cache.invalidate(key)
 
     # backwards compatibility for code that wants to look up a settings
     # object via ``registry.getUtility(ISettings)``
@@ -2,6 +2,9 @@ import contextlib
 import json
 import os
 import re
+import threading
+
+from repoze.lru import ExpiringLRUCache
 
 from zope.interface import (
     implementer,
@@ -10,12 +13,14 @@ from zope.interface import (
 from zope.interface.registry import Components
 
 from pyramid.interfaces import (
+    IFragmentCache,
     IJSONAdapter,
     IRendererFactory,
     IRendererInfo,
     )
 
 from pyramid.compat import (
+    perf_counter,
     string_types,
     text_type,
     )
@@ -145,6 +150,56 @@ def render_to_response(renderer_name,
 
     return result
 
+def render_cached(renderer_name, value, key, namespace=None, ttl=None,
+                  request=None, package=None):
+    """ Using the renderer ``renderer_name``, render ``value`` exactly as
+    :func:`pyramid.renderers.render` would, but store the result in the
+    :term:`fragment cache` under ``key`` and return the stored result on
+    subsequent calls instead of rendering again.  This is useful for
+    expensive fragments (navigation, footers, per-item cards) which do not
+    change from request to request.
+
+    ``key`` must be a hashable object which identifies the fragment; it
+    should encode every input which affects the rendering, as ``value`` is
+    not consulted when the cached result is found.  The renderer name and
+    package are combined with ``key`` so that distinct templates never share
+    an entry.
+
+    ``namespace`` (default ``None``) groups entries so they may be discarded
+    together via the ``invalidate`` method of the cache, e.g.
+    ``registry.getUtility(IFragmentCache).invalidate('nav')``.
+
+    ``ttl`` is the lifetime of the entry in seconds.  If it is ``None``, the
+    default lifetime of the cache is used.
+
+    The fragment cache is the :class:`pyramid.interfaces.IFragmentCache`
+    utility registered via
+    :meth:`pyramid.config.Configurator.set_fragment_cache`; a
+    :class:`pyramid.renderers.FragmentCache` with default arguments is
+    registered by default.  If the registry has no fragment cache at all
+    (it wasn't set up by a configurator), ``value`` is rendered every time.
+
+    The ``request`` and ``package`` arguments have the same meaning as they
+    do for :func:`pyramid.renderers.render`.
+
+    .. versionadded:: 1.7
+    """
+    try:
+        registry = request.registry
+    except AttributeError:
+        registry = get_current_registry()
+    if package is None:
+        package = caller_package()
+    cache = registry.queryUtility(IFragmentCache)
+    if cache is None:
+        return render(renderer_name, value, request=request, package=package)
+    cache_key = (getattr(package, '__name__', package), renderer_name, key)
+    result = cache.get(namespace, cache_key, _marker)
+    if result is _marker:
+        result = render(renderer_name, value, request=request, package=package)
+        cache.set(namespace, cache_key, result, ttl=ttl)
+    return result
+
 _marker = object()
 
 @contextlib.contextmanager
@@ -178,6 +233,65 @@ def get_renderer(renderer_name, package=None):
     helper = RendererHelper(name=renderer_name, package=package)
     return helper.renderer
 
+@implementer(IFragmentCache)
+class FragmentCache(object):
+    """ The default :term:`fragment cache` implementation used by
+    :func:`pyramid.renderers.render_cached`.  It keeps at most
+    ``max_entries`` fragments in memory, discarding the least recently used
+    ones when full.
+
+    ``default_ttl`` is the lifetime in seconds of entries stored without an
+    explicit ``ttl``.  If it is ``None`` (the default), such entries never
+    expire; they only leave the cache through eviction or invalidation.
+
+    Invalidating a namespace is a constant time operation: the namespace's
+    generation number is bumped, which makes its existing entries
+    unreachable, and they are eventually evicted.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, max_entries=1000, default_ttl=None):
+        if default_ttl is None:
+            self._lru = ExpiringLRUCache(max_entries)
+        else:
+            self._lru = ExpiringLRUCache(max_entries, default_ttl)
+        self._lock = threading.Lock()
+        self._generations = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _key(self, namespace, key):
+        return (namespace, self._generations.get(namespace, 0), key)
+
+    def get(self, namespace, key, default=None):
+        value = self._lru.get(self._key(namespace, key), _marker)
+        with self._lock:
+            if value is _marker:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def set(self, namespace, key, value, ttl=None):
+        self._lru.put(self._key(namespace, key), value, timeout=ttl)
+
+    def invalidate(self, namespace=None):
+        with self._lock:
+            self.invalidations += 1
+            if namespace is None:
+                self._generations.clear()
+                self._lru.clear()
+            else:
+                generation = self._generations.get(namespace, 0)
+                self._generations[namespace] = generation + 1
+
+    def stats(self):
+        return {'hits':self.hits,
+                'misses':self.misses,
+                'invalidations':self.invalidations,
+                }
+
 # concrete renderer factory implementations (also API)
 
 def string_renderer_factory(info):
@@ -403,6 +517,15 @@ class JSONP(JSON):
             return body
         return _render
 
+def _has_before_render_subscribers(registry):
+    # Answer whether a BeforeRender event sent through ``registry`` would
+    # reach any subscriber.  Registries which can't tell are always
+    # notified.
+    has_listeners_for = getattr(registry, 'has_listeners_for', None)
+    if has_listeners_for is None:
+        return True
+    return has_listeners_for(BeforeRender)
+
 @implementer(IRendererInfo)
 class RendererHelper(object):
     def __init__(self, name=None, package=None, registry=None):
@@ -460,12 +583,21 @@ class RendererHelper(object):
                 'req':request,
                 }
 
-        system_values = BeforeRender(system_values, value)
-
         registry = self.registry
-        registry.notify(system_values)
+        profiler = getattr(registry, 'request_profiler', None)
+        if profiler is not None:
+            start = perf_counter()
+        # renderers may rely on being passed a BeforeRender (e.g. to use its
+        # ``rendering_val``), so it is always built; only notifying is
+        # skipped when nothing listens
+        system_values = BeforeRender(system_values, value)
+        if _has_before_render_subscribers(registry):
+            registry.notify(system_values)
 
         result = renderer(value, system_values)
+        if profiler is not None:
+            profiler.record(request, 'render', start, perf_counter(),
+                            system_values.get('view'))
         return result
 
     def render_to_response(self, value, system_values, request=None):
@@ -6,9 +6,15 @@ from zope.interface.interface import InterfaceClass
 
 from webob import BaseRequest
 
+from repoze.lru import (
+    ExpiringLRUCache,
+    LRUCache,
+    )
+
 from pyramid.interfaces import (
     IRequest,
     IRequestExtensions,
+    IRequestPropertyCache,
     IResponse,
     ISessionFactory,
     )
@@ -17,11 +23,13 @@ from pyramid.compat import (
     text_,
     bytes_,
     native_,
-    iteritems_,
     )
 
+from pyramid.background import _submit as _submit_background
 from pyramid.decorator import reify
 from pyramid.i18n import LocalizerRequestMixin
+from pyramid.path import caller_package
+from pyramid.renderers import render_cached
 from pyramid.response import Response, _get_response_factory
 from pyramid.security import (
     AuthenticationAPIMixin,
@@ -33,9 +41,16 @@ from pyramid.util import (
     InstancePropertyMixin,
 )
 
+_marker = object()
+
 class TemplateContext(object):
     pass
 
+def _background_callback(callback):
+    def submit(request):
+        _submit_background(request.registry, callback, request)
+    return submit
+
 class CallbackMethodsMixin(object):
     @reify
     def finished_callbacks(self):
@@ -90,7 +105,7 @@ class CallbackMethodsMixin(object):
             callback = callbacks.popleft()
             callback(self, response)
 
-    def add_finished_callback(self, callback):
+    def add_finished_callback(self, callback, background=False):
         """
         Add a callback to the set of callbacks to be called
         unconditionally by the :term:`router` at the very end of
@@ -133,10 +148,29 @@ class CallbackMethodsMixin(object):
         They will be propagated to the caller of the :app:`Pyramid`
         router application.
 
+        If ``background`` is ``True``, the callback is not called by the
+        router itself: it is instead submitted to the
+        :class:`pyramid.interfaces.IBackgroundExecutor` of the application
+        registry (see
+        :func:`pyramid.background.get_background_executor`), which calls it
+        from another thread, so that slow work such as logging to a remote
+        service doesn't delay the response.  Errors raised by such a
+        callback are logged rather than propagated.  The executor is created
+        by :meth:`pyramid.config.Configurator.make_wsgi_app`; if the
+        registry has none, the callback is called when the request finishes,
+        like any other.  The callback must not
+        rely on :term:`thread local` state such as
+        :func:`pyramid.threadlocal.get_current_request`.
+
         .. seealso::
 
             See also :ref:`using_finished_callbacks`.
+
+        .. versionchanged:: 1.7
+           Added the ``background`` argument.
         """
+        if background:
+            callback = _background_callback(callback)
         self.finished_callbacks.append(callback)
 
     def _process_finished_callbacks(self):
@@ -230,6 +264,22 @@ class Request(
             return False
         return adapted is ob
 
+    def render_cached(self, renderer_name, value, key, namespace=None,
+                      ttl=None, package=None):
+        """ Render ``value`` using the renderer ``renderer_name``, reusing a
+        previous rendering stored in the :term:`fragment cache` under
+        ``key`` when one exists.  This is a shortcut for
+        :func:`pyramid.renderers.render_cached` which passes this request
+        as the ``request`` argument; see that function for the meaning of
+        the other arguments.
+
+        .. versionadded:: 1.7
+        """
+        if package is None:
+            package = caller_package()
+        return render_cached(renderer_name, value, key, namespace=namespace,
+                             ttl=ttl, request=self, package=package)
+
     @property
     def json_body(self):
         return json.loads(text_(self.body, self.charset))
@@ -312,6 +362,64 @@ def call_app_with_subpath_as_path_info(request, app):
 
     return new_request.get_response(app)
 
+@implementer(IRequestPropertyCache)
+class RequestPropertyCache(object):
+    """ A bounded cache of the values of a request property, shared by every
+    request.  ``key`` is a callable which accepts a request and returns a
+    hashable value: requests for which it returns the same value share the
+    cached value of the property.  At most ``maxsize`` values are cached,
+    the least recently used being discarded first, and each value is
+    discarded ``timeout`` seconds after it was computed unless ``timeout``
+    is ``None``.
+
+    Instances are created by
+    :meth:`pyramid.config.Configurator.add_request_method` when it is passed
+    a ``cache`` argument, and can be found using
+    :meth:`pyramid.registry.Registry.invalidate_request_property` or as
+    ``IRequestPropertyCache`` utilities named after the property.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, key, maxsize=1000, timeout=None):
+        self.key = key
+        self.maxsize = maxsize
+        self.timeout = timeout
+        if timeout is None:
+            self.cache = LRUCache(maxsize)
+        else:
+            self.cache = ExpiringLRUCache(maxsize, timeout)
+        self.hits = 0
+        self.misses = 0
+
+    def wrap(self, fn):
+        """ Return a function accepting a request which returns the value
+        cached for the request, calling ``fn`` with the request to compute
+        it when there is none."""
+        def cached(request):
+            key = self.key(request)
+            value = self.cache.get(key, _marker)
+            if value is _marker:
+                self.misses += 1
+                value = fn(request)
+                self.cache.put(key, value)
+            else:
+                self.hits += 1
+            return value
+        return cached
+
+    def invalidate(self, key):
+        self.cache.invalidate(key)
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.cache.data),
+            }
+
 def apply_request_extensions(request, extensions=None):
     """Apply request extensions (methods and properties) to an instance of
     :class:`pyramid.interfaces.IRequest`. This method is dependent on the
@@ -324,9 +432,40 @@ def apply_request_extensions(request, extensions=None):
     if extensions is None:
         extensions = request.registry.queryUtility(IRequestExtensions)
     if extensions is not None:
-        for name, fn in iteritems_(extensions.methods):
-            method = fn.__get__(request, request.__class__)
-            setattr(request, name, method)
-
-        InstancePropertyHelper.apply_properties(
-            request, extensions.descriptors)
+        cls = request.__class__
+        if (
+            getattr(cls, '_applied_request_extensions', None) is extensions and
+            cls._applied_request_extensions_version ==
+                getattr(extensions, 'version', None)
+        ):
+            # e.g. created by the router from a precomputed class
+            return
+        request.__class__ = _extended_request_class(cls, extensions)
+
+def _extended_request_class(cls, extensions):
+    """ Return a subclass of ``cls`` which has the methods and properties of
+    the request ``extensions``.  Methods are bound through the class, like
+    any other method, rather than being set on every instance.  The class is
+    created once per ``cls`` and cached by ``extensions`` when possible, so
+    that applying extensions to a request only has to change its class.
+
+    If ``cls`` is itself a class made by this function, for an earlier
+    version of the extensions (one which preceded another call to
+    :meth:`pyramid.config.Configurator.add_request_method`), the class it
+    extends is extended anew instead."""
+    cls = getattr(cls, '_request_extensions_base', cls)
+    version = getattr(extensions, 'version', None)
+    classes = getattr(extensions, 'classes', None)
+    if classes is not None:
+        newcls = classes.get((cls, version))
+        if newcls is not None:
+            return newcls
+    attrs = dict(extensions.methods)
+    attrs.update(extensions.descriptors)
+    attrs['_applied_request_extensions'] = extensions
+    attrs['_applied_request_extensions_version'] = version
+    attrs['_request_extensions_base'] = cls
+    newcls = InstancePropertyHelper.make_class(cls, attrs)
+    if classes is not None:
+        classes[(cls, version)] = newcls
+    return newcls
@@ -50,20 +50,23 @@ class FileResponse(Response):
     It's generally safe to leave this set to ``None`` if you're serving a
     binary file.  This argument will be ignored if you also leave
     ``content-type`` as ``None``.
+
+    The response is a conditional response: ``Range`` requests
+    (optionally guarded by ``If-Range``) are answered with a ``206 Partial
+    Content`` response which seeks to the requested slice of the file and
+    reads only that slice.  The server's ``wsgi.file_wrapper`` (which
+    servers commonly implement with ``sendfile``) is used for complete
+    responses; it is bypassed for ``Range`` requests because it cannot
+    serve a slice of a file.
+
+    .. versionchanged:: 1.7
+       ``Range`` requests no longer read and discard the part of the file
+       preceding the requested range.
     """
     def __init__(self, path, request=None, cache_max_age=None,
                  content_type=None, content_encoding=None):
         if content_type is None:
-            content_type, content_encoding = mimetypes.guess_type(
-                path,
-                strict=False
-                )
-            if content_type is None:
-                content_type = 'application/octet-stream'
-            # str-ifying content_type is a workaround for a bug in Python 2.7.7
-            # on Windows where mimetypes.guess_type returns unicode for the
-            # content_type.
-            content_type = str(content_type)
+            content_type, content_encoding = _guess_type(path)
         super(FileResponse, self).__init__(
             conditional_response=True,
             content_type=content_type,
@@ -75,7 +78,7 @@ class FileResponse(Response):
         app_iter = None
         if request is not None:
             environ = request.environ
-            if 'wsgi.file_wrapper' in environ:
+            if 'wsgi.file_wrapper' in environ and 'HTTP_RANGE' not in environ:
                 app_iter = environ['wsgi.file_wrapper'](f, _BLOCK_SIZE)
         if app_iter is None:
             app_iter = FileIter(f, _BLOCK_SIZE)
@@ -85,6 +88,15 @@ class FileResponse(Response):
         if cache_max_age is not None:
             self.cache_expires = cache_max_age
 
+def _guess_type(path):
+    content_type, content_encoding = mimetypes.guess_type(path, strict=False)
+    if content_type is None:
+        content_type = 'application/octet-stream'
+    # str-ifying content_type is a workaround for a bug in Python 2.7.7
+    # on Windows where mimetypes.guess_type returns unicode for the
+    # content_type.
+    return str(content_type), content_encoding
+
 class FileIter(object):
     """ A fixed-block-size iterator for use as a WSGI app_iter.
 
@@ -92,7 +104,12 @@ class FileIter(object):
     method that takes a size hint).
 
     ``block_size`` is an optional block size for iteration.
+
+    .. versionchanged:: 1.7
+       Added the ``app_iter_range`` and ``fileno`` methods.
     """
+    remaining = None
+
     def __init__(self, file, block_size=_BLOCK_SIZE):
         self.file = file
         self.block_size = block_size
@@ -101,13 +118,47 @@ class FileIter(object):
         return self
 
     def next(self):
-        val = self.file.read(self.block_size)
+        block_size = self.block_size
+        remaining = self.remaining
+        if remaining is not None:
+            if remaining <= 0:
+                raise StopIteration
+            block_size = min(block_size, remaining)
+        val = self.file.read(block_size)
         if not val:
             raise StopIteration
+        if remaining is not None:
+            self.remaining = remaining - len(val)
         return val
 
     __next__ = next # py3
 
+    def app_iter_range(self, start, stop):
+        """ Restrict iteration to the bytes of the file from offset
+        ``start`` up to (but not including) offset ``stop`` and return this
+        iterator.  WebOb calls this method to serve ``Range`` requests.  If
+        the file has a ``seek`` method, the bytes before ``start`` are not
+        read.  ``stop`` may be ``None`` to mean the end of the file."""
+        start = start or 0
+        seek = getattr(self.file, 'seek', None)
+        if seek is not None:
+            seek(start)
+        else:
+            skip = start
+            while skip > 0:
+                val = self.file.read(min(self.block_size, skip))
+                if not val:
+                    break
+                skip -= len(val)
+        if stop is not None:
+            self.remaining = stop - start
+        return self
+
+    def fileno(self):
+        """ Return the operating system file descriptor of the file, so a
+        server which knows how to may send it using ``sendfile``."""
+        return self.file.fileno()
+
     def close(self):
         self.file.close()
 
@@ -22,10 +22,15 @@ from pyramid.events import (
     NewResponse,
     )
 
+from pyramid.compat import perf_counter
 from pyramid.httpexceptions import HTTPNotFound
+from pyramid.profiling import get_memory_tracker
 from pyramid.request import Request
 from pyramid.view import _call_view
-from pyramid.request import apply_request_extensions
+from pyramid.request import (
+    _extended_request_class,
+    apply_request_extensions,
+    )
 from pyramid.threadlocal import manager
 
 from pyramid.traversal import (
@@ -50,6 +55,12 @@ class Router(object):
         self.routes_mapper = q(IRoutesMapper)
         self.request_factory = q(IRequestFactory, default=Request)
         self.request_extensions = q(IRequestExtensions)
+        if (self.request_extensions is not None and
+            isinstance(self.request_factory, type)):
+            # create requests which already have the extensions rather than
+            # applying them to each request
+            self.request_factory = _extended_request_class(
+                self.request_factory, self.request_extensions)
         tweens = q(ITweens)
         if tweens is None:
             tweens = excview_tween_factory
@@ -61,6 +72,9 @@ class Router(object):
         if settings is not None:
             self.debug_notfound = settings['debug_notfound']
             self.debug_routematch = settings['debug_routematch']
+            if settings.get('debug_memory'):
+                tracker = get_memory_tracker(registry)
+                self.handle_request = tracker.wrap(self.handle_request)
 
     def handle_request(self, request):
         attrs = request.__dict__
@@ -71,14 +85,18 @@ class Router(object):
         routes_mapper = self.routes_mapper
         debug_routematch = self.debug_routematch
         adapters = registry.adapters
-        has_listeners = registry.has_listeners
+        has_listeners_for = registry.has_listeners_for
         notify = registry.notify
         logger = self.logger
+        profiler = getattr(registry, 'request_profiler', None)
 
-        has_listeners and notify(NewRequest(request))
+        # events which no subscriber listens to are not even created
+        has_listeners_for(NewRequest) and notify(NewRequest(request))
         # find the root object
         root_factory = self.root_factory
         if routes_mapper is not None:
+            if profiler is not None:
+                start = perf_counter()
             info = routes_mapper(request)
             match, route = info['match'], info['route']
             if route is None:
@@ -114,14 +132,24 @@ class Router(object):
 
                 root_factory = route.factory or self.root_factory
 
+            if profiler is not None:
+                profiler.record(request, 'route_match', start, perf_counter())
+
+        if profiler is not None:
+            start = perf_counter()
         root = root_factory(request)
         attrs['root'] = root
+        if profiler is not None:
+            profiler.record(request, 'root_factory', start, perf_counter())
+            start = perf_counter()
 
         # find a context
         traverser = adapters.queryAdapter(root, ITraverser)
         if traverser is None:
             traverser = ResourceTreeTraverser(root)
         tdict = traverser(request)
+        if profiler is not None:
+            profiler.record(request, 'traversal', start, perf_counter())
 
         context, view_name, subpath, traversed, vroot, vroot_path = (
             tdict['context'],
@@ -133,7 +161,7 @@ class Router(object):
             )
 
         attrs.update(tdict)
-        has_listeners and notify(ContextFound(request))
+        has_listeners_for(ContextFound) and notify(ContextFound(request))
 
         # find a view callable
         context_iface = providedBy(context)
@@ -176,7 +204,7 @@ class Router(object):
         See the API for pyramid.request for complete documentation.
         """
         registry = self.registry
-        has_listeners = self.registry.has_listeners
+        has_listeners_for = self.registry.has_listeners_for
         notify = self.registry.notify
         threadlocals = {'registry':registry, 'request':request}
         manager = self.threadlocal_manager
@@ -200,7 +228,8 @@ class Router(object):
                 if request.response_callbacks:
                     request._process_response_callbacks(response)
 
-                has_listeners and notify(NewResponse(request, response))
+                (has_listeners_for(NewResponse) and
+                 notify(NewResponse(request, response)))
                 
                 return response
 
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 from pyramid.compat import configparser
 from logging.config import fileConfig
@@ -34,3 +35,22 @@ def logging_file_config(config_file, fileConfig=fileConfig,
             config_file,
             dict(__file__=config_file, here=os.path.dirname(config_file))
             )
+
+def parallel_map(func, items, jobs=None):
+    """
+    Return ``[func(item) for item in items]``, computing the results in a
+    pool of ``jobs`` worker processes (by default, one per CPU).  ``func``
+    must be a picklable (module-level) function.  The work is done in the
+    current process when ``jobs`` is 1 or there is at most one item.
+    """
+    items = list(items)
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+    if jobs <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    pool = multiprocessing.Pool(jobs)
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
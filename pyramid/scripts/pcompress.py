@@ -0,0 +1,185 @@
+import gzip
+import io
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+
+from pyramid.scripts.common import parallel_map
+from pyramid.static import PRECOMPRESSED_EXTENSIONS
+
+try:
+    import brotli
+except ImportError: # pragma: no cover
+    brotli = None
+
+DEFAULT_EXTENSIONS = (
+    '.css', '.htm', '.html', '.js', '.json', '.map', '.svg', '.txt', '.xml',
+    '.eot', '.otf', '.ttf',
+    )
+
+def main(argv=sys.argv, quiet=False):
+    command = PCompressCommand(argv, quiet)
+    return command.run()
+
+def _compress_gzip(data):
+    out = io.BytesIO()
+    f = gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=out)
+    try:
+        f.write(data)
+    finally:
+        f.close()
+    return out.getvalue()
+
+def _compress_br(data): # pragma: no cover (requires brotli)
+    return brotli.compress(data)
+
+COMPRESSORS = {
+    'gzip': _compress_gzip,
+    'br': _compress_br,
+    }
+
+def compress_file(task):
+    """ Compress the file at ``path`` using ``encoding`` and write the
+    result next to it (e.g. ``app.js.gz`` for ``app.js``), preserving the
+    modification time of the original.  The sibling is only written when it
+    is smaller than the original.  Return a tuple of ``(path, encoding,
+    original size, compressed size)``; the compressed size is ``None`` when
+    no sibling was written."""
+    path, encoding = task
+    with open(path, 'rb') as f:
+        data = f.read()
+    compressed = COMPRESSORS[encoding](data)
+    target = path + PRECOMPRESSED_EXTENSIONS[encoding]
+    if len(compressed) >= len(data):
+        if os.path.exists(target):
+            os.remove(target)
+        return path, encoding, len(data), None
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(compressed)
+        shutil.copystat(path, tmp)
+        if os.path.exists(target): # windows can't rename over a file
+            os.remove(target)
+        os.rename(tmp, target)
+    except:
+        os.remove(tmp)
+        raise
+    return path, encoding, len(data), len(compressed)
+
+class PCompressCommand(object):
+    usage = '%prog [options] directory [directory ...]'
+    description = """\
+    Precompress the static assets found in one or more directories for use
+    with the "precompressed" argument of
+    pyramid.config.Configurator.add_static_view.  For every matching file
+    (e.g. "app.js"), a sibling file is written for each requested encoding
+    ("app.js.gz" for gzip, "app.js.br" for brotli), unless an up-to-date
+    sibling already exists or compression would not make the file smaller.
+    Files are compressed in parallel using a pool of processes.
+
+    Example: "pcompress -e gzip -e br myapp/static".
+
+    """
+    parser = optparse.OptionParser(
+        usage,
+        description=textwrap.dedent(description),
+        )
+    parser.add_option('-e', '--encoding',
+                      dest='encodings',
+                      action='append',
+                      choices=sorted(PRECOMPRESSED_EXTENSIONS),
+                      help=('Encoding to precompress with; may be passed '
+                            'more than once (default: gzip, plus br if the '
+                            '"brotli" package is installed)'))
+    parser.add_option('-x', '--extension',
+                      dest='extensions',
+                      action='append',
+                      help=('File extension to compress, e.g. ".js"; may be '
+                            'passed more than once (default: %s)'
+                            % ' '.join(DEFAULT_EXTENSIONS)))
+    parser.add_option('-m', '--min-size',
+                      dest='min_size',
+                      type='int',
+                      default=256,
+                      help=('Do not compress files smaller than this many '
+                            'bytes (default: 256)'))
+    parser.add_option('-j', '--jobs',
+                      dest='jobs',
+                      type='int',
+                      default=None,
+                      help=('Number of worker processes (default: the '
+                            'number of CPUs)'))
+    parser.add_option('-f', '--force',
+                      dest='force',
+                      action='store_true',
+                      help='Recompress files even if their siblings are '
+                           'up to date')
+
+    def __init__(self, argv, quiet=False):
+        self.quiet = quiet
+        self.options, self.args = self.parser.parse_args(argv[1:])
+
+    def out(self, msg): # pragma: no cover
+        if not self.quiet:
+            print(msg)
+
+    def find_tasks(self, directories, encodings):
+        extensions = tuple(
+            ext.lower() for ext in
+            (self.options.extensions or DEFAULT_EXTENSIONS)
+            )
+        for directory in directories:
+            for root, dirs, files in os.walk(directory):
+                dirs.sort()
+                for name in sorted(files):
+                    if not name.lower().endswith(extensions):
+                        continue
+                    path = os.path.join(root, name)
+                    st = os.stat(path)
+                    if st.st_size < self.options.min_size:
+                        continue
+                    for encoding in encodings:
+                        target = path + PRECOMPRESSED_EXTENSIONS[encoding]
+                        if not self.options.force:
+                            try:
+                                if os.stat(target).st_mtime == st.st_mtime:
+                                    continue
+                            except OSError:
+                                pass
+                        yield path, encoding
+
+    def run(self):
+        if not self.args:
+            self.out('Requires at least one directory argument')
+            return 2
+        for directory in self.args:
+            if not os.path.isdir(directory):
+                self.out('Not a directory: %s' % directory)
+                return 2
+        encodings = self.options.encodings
+        if not encodings:
+            encodings = ['gzip']
+            if brotli is not None: # pragma: no cover
+                encodings.append('br')
+        if 'br' in encodings and brotli is None:
+            self.out('The "br" encoding requires the "brotli" package')
+            return 2
+        tasks = self.find_tasks(self.args, encodings)
+        results = parallel_map(compress_file, tasks, self.options.jobs)
+        written = 0
+        for path, encoding, size, compressed_size in results:
+            if compressed_size is None:
+                self.out('%s (%s): not smaller, skipped' % (path, encoding))
+            else:
+                written += 1
+                self.out('%s (%s): %d -> %d bytes' % (
+                    path, encoding, size, compressed_size))
+        self.out('%d file(s) written' % written)
+        return 0
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main() or 0)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import optparse
+import os
+import sys
+import tempfile
+import textwrap
+
+from pyramid.scripts.common import parallel_map
+
+def main(argv=sys.argv, quiet=False):
+    command = PManifestCommand(argv, quiet)
+    return command.run()
+
+def hash_file(task):
+    """ Return a tuple of ``(relpath, md5 hexdigest)`` for the file at
+    ``path``, where ``task`` is a tuple of ``(path, relpath)``."""
+    path, relpath = task
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            md5.update(chunk)
+    return relpath, md5.hexdigest()
+
+def busted_path(relpath, token):
+    """ Insert ``token`` before the extension of the last segment of
+    ``relpath``, e.g. ``css/main.css`` -> ``css/main.<token>.css``."""
+    head, sep, name = relpath.rpartition('/')
+    root, ext = os.path.splitext(name)
+    if not root: # dotfiles such as ".htaccess"
+        root, ext = name, ''
+    return '%s%s%s.%s%s' % (head, sep, root, token, ext)
+
+class PManifestCommand(object):
+    usage = '%prog [options] directory'
+    description = """\
+    Generate a JSON manifest for use with
+    pyramid.static.ManifestCacheBuster.  Every file below the directory is
+    hashed and mapped to a cache busted path containing a prefix of its md5
+    digest, e.g. "css/main.css" -> "css/main.4b9a7c3e51d2.css".  Files are
+    hashed in parallel using a pool of processes.
+
+    Example: "pmanifest myapp/static".
+
+    """
+    parser = optparse.OptionParser(
+        usage,
+        description=textwrap.dedent(description),
+        )
+    parser.add_option('-o', '--output',
+                      dest='output',
+                      default=None,
+                      help=('Path of the manifest to write (default: '
+                            'manifest.json in the directory)'))
+    parser.add_option('-l', '--token-length',
+                      dest='token_length',
+                      type='int',
+                      default=12,
+                      help=('Number of hexadecimal digits of the md5 digest '
+                            'to include in cache busted paths (default: 12)'))
+    parser.add_option('-j', '--jobs',
+                      dest='jobs',
+                      type='int',
+                      default=None,
+                      help=('Number of worker processes (default: the '
+                            'number of CPUs)'))
+
+    def __init__(self, argv, quiet=False):
+        self.quiet = quiet
+        self.options, self.args = self.parser.parse_args(argv[1:])
+
+    def out(self, msg): # pragma: no cover
+        if not self.quiet:
+            print(msg)
+
+    def find_tasks(self, directory, output):
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if os.path.abspath(path) == output:
+                    continue
+                relpath = os.path.relpath(path, directory)
+                yield path, relpath.replace(os.sep, '/')
+
+    def run(self):
+        if len(self.args) != 1:
+            self.out('Requires exactly one directory argument')
+            return 2
+        directory = self.args[0]
+        if not os.path.isdir(directory):
+            self.out('Not a directory: %s' % directory)
+            return 2
+        output = self.options.output
+        if output is None:
+            output = os.path.join(directory, 'manifest.json')
+        output = os.path.abspath(output)
+        length = self.options.token_length
+        tasks = self.find_tasks(directory, output)
+        manifest = {}
+        for relpath, digest in parallel_map(hash_file, tasks,
+                                            self.options.jobs):
+            manifest[relpath] = busted_path(relpath, digest[:length])
+        data = json.dumps(manifest, indent=2, sort_keys=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(output))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            if os.path.exists(output): # windows can't rename over a file
+                os.remove(output)
+            os.rename(tmp, output)
+        except:
+            os.remove(tmp)
+            raise
+        self.out('%d asset(s) written to %s' % (len(manifest), output))
+        return 0
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main() or 0)
@@ -0,0 +1,161 @@
+import glob
+import json
+import optparse
+import sys
+import textwrap
+
+from pyramid.paster import bootstrap
+from pyramid.scripts.common import parse_vars
+
+def main(argv=sys.argv, quiet=False):
+    command = PMemoryCommand(argv, quiet)
+    return command.run()
+
+def merge_reports(reports, top=None):
+    """ Merge the reports of :class:`pyramid.profiling.MemoryTracker`
+    dumped by several processes into one, sorted like
+    :meth:`pyramid.profiling.MemoryTracker.report`.  Only the ``top`` (by
+    default, all the) allocation sites which retained the most memory in
+    total are kept per route and view."""
+    merged = {}
+    for report in reports:
+        for item in report:
+            key = (item['route'], item['view'])
+            into = merged.get(key)
+            if into is None:
+                into = merged[key] = {
+                    'route': item['route'],
+                    'view': item['view'],
+                    'count': 0,
+                    'retained': 0,
+                    'max_retained': item['max_retained'],
+                    'top': {},
+                    }
+            into['count'] += item['count']
+            into['retained'] += item['retained']
+            into['max_retained'] = max(into['max_retained'],
+                                       item['max_retained'])
+            sites = into['top']
+            for site in item['top']:
+                totals = sites.setdefault(site['site'], [0, 0])
+                totals[0] += site['size']
+                totals[1] += site['count']
+    result = []
+    for item in merged.values():
+        sites = sorted(item['top'].items(), key=lambda site: site[1][0],
+                       reverse=True)
+        item['top'] = [
+            {'site': site, 'size': size, 'count': blocks}
+            for site, (size, blocks) in sites[:top]
+            ]
+        result.append(item)
+    result.sort(key=lambda item: item['retained'], reverse=True)
+    return result
+
+class PMemoryCommand(object):
+    usage = '%prog config_uri'
+    description = """\
+    Print the memory retained by the requests handled by a Pyramid
+    application, per route name and view name, as dumped by the
+    application to the file named by its "pyramid.debug_memory_file"
+    setting (collected when the "pyramid.debug_memory" setting is true).
+    If that setting contains "{pid}", the dumps of every process of the
+    application are merged.
+
+    This command accepts one positional argument named "config_uri" which
+    specifies the PasteDeploy config file to use for the interactive
+    shell. The format is "inifile#name". If the name is left off, "main"
+    will be assumed.  Example: "pmemory myapp.ini#main".
+
+    """
+    parser = optparse.OptionParser(
+        usage,
+        description=textwrap.dedent(description),
+        )
+    parser.add_option('-s', '--sites',
+                      dest='sites',
+                      action='store_true',
+                      help=('Show the allocation sites which retained the '
+                            'most memory for each route and view'))
+    parser.add_option('-t', '--top',
+                      dest='top',
+                      type='int',
+                      default=None,
+                      help=('Number of allocation sites to show per route '
+                            'and view (default: all the dumped ones)'))
+
+    stdout = sys.stdout
+    bootstrap = (bootstrap,) # testing
+
+    def __init__(self, argv, quiet=False):
+        self.quiet = quiet
+        self.options, self.args = self.parser.parse_args(argv[1:])
+
+    def out(self, msg): # pragma: no cover
+        if not self.quiet:
+            print(msg)
+
+    def _get_report(self, registry):
+        path = registry.settings.get('pyramid.debug_memory_file')
+        if not path:
+            self.out('The "pyramid.debug_memory_file" setting is required '
+                     'to show memory statistics')
+            return None
+        if '{pid}' in path:
+            # one dump per process of the application
+            paths = sorted(glob.glob(path.replace('{pid}', '*')))
+            if not paths:
+                self.out('No memory statistics found matching %s' % path)
+                return None
+        else:
+            paths = [path]
+        reports = []
+        for path in paths:
+            try:
+                with open(path) as f:
+                    reports.append(json.load(f))
+            except (IOError, OSError, ValueError) as e:
+                self.out('Could not read memory statistics from %s: %s'
+                         % (path, e))
+                return None
+        return merge_reports(reports, self.options.top)
+
+    def show_report(self, report):
+        fmt = '%-25s  %-25s  %8s  %12s  %12s  %12s'
+        headers = ('Route', 'View', 'Count', 'Retained KB', 'Mean KB',
+                   'Max KB')
+        self.out(fmt % headers)
+        self.out(fmt % tuple('-' * len(header) for header in headers))
+        kb = lambda size: '%.1f' % (size / 1024.0)
+        for item in report:
+            self.out(fmt % (
+                '-' if item['route'] is None else item['route'],
+                '-' if item['view'] is None else repr(item['view']),
+                item['count'],
+                kb(item['retained']),
+                kb(item['retained'] / float(item['count'] or 1)),
+                kb(item['max_retained']),
+                ))
+            if self.options.sites:
+                for site in item['top']:
+                    self.out('    %12s KB  %8s blocks  %s' % (
+                        kb(site['size']), site['count'], site['site']))
+
+    def run(self):
+        if not self.args:
+            self.out('Requires a config file argument')
+            return 2
+        config_uri = self.args[0]
+        env = self.bootstrap[0](config_uri, options=parse_vars(self.args[1:]))
+        registry = env['registry']
+        report = self._get_report(registry)
+        if report is None:
+            return 2
+        if not report:
+            self.out('No requests have been tracked')
+            return 0
+        self.show_report(report)
+        return 0
+
+if __name__ == '__main__': # pragma: no cover
+    sys.exit(main() or 0)
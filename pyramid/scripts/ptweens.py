@@ -1,3 +1,5 @@
+import glob
+import json
 import optparse
 import sys
 import textwrap
@@ -13,6 +15,36 @@ def main(argv=sys.argv, quiet=False):
     command = PTweensCommand(argv, quiet)
     return command.run()
 
+def percentile(bounds, stat, fraction):
+    """ Estimate the ``fraction`` percentile of the durations of the
+    ``stat`` of a tween, as dumped by :class:`pyramid.tweens.TweenStats`,
+    using the upper bound of the histogram bucket it falls into."""
+    wanted = stat['count'] * fraction
+    seen = 0
+    for bound, count in zip(bounds, stat['histogram']):
+        seen += count
+        if count and seen >= wanted:
+            return min(bound, stat['max'])
+    return stat['max']
+
+def merge_stats(dumps):
+    """ Merge the dumps of :class:`pyramid.tweens.TweenStats` written by
+    several processes into one."""
+    merged = {'bounds': dumps[0]['bounds'], 'tweens': {}}
+    tweens = merged['tweens']
+    for dump in dumps:
+        for name, stat in dump['tweens'].items():
+            into = tweens.get(name)
+            if into is None:
+                tweens[name] = dict(stat, histogram=list(stat['histogram']))
+                continue
+            into['count'] += stat['count']
+            into['total'] += stat['total']
+            into['max'] = max(into['max'], stat['max'])
+            into['histogram'] = [
+                a + b for a, b in zip(into['histogram'], stat['histogram'])]
+    return merged
+
 class PTweensCommand(object):
     usage = '%prog config_uri'
     description = """\
@@ -27,11 +59,22 @@ class PTweensCommand(object):
     shell. The format is "inifile#name". If the name is left off, "main"
     will be assumed.  Example: "ptweens myapp.ini#main".
 
+    When the "--stats" option is passed, the timing statistics dumped by
+    the application to the file named by its "pyramid.tween_stats_file"
+    setting (collected when the "pyramid.tween_stats" setting is true) are
+    printed alongside the chain.  If that setting contains "{pid}", the
+    dumps of every process of the application are merged.
+
     """
     parser = optparse.OptionParser(
         usage,
         description=textwrap.dedent(description),
         )
+    parser.add_option('-s', '--stats',
+                      dest='stats',
+                      action='store_true',
+                      help=('Show the time spent in each tween, as dumped by '
+                            'the running application'))
 
     stdout = sys.stdout
     bootstrap = (bootstrap,) # testing
@@ -49,14 +92,64 @@ class PTweensCommand(object):
         if not self.quiet:
             print(msg)
 
-    def show_chain(self, chain):
-        fmt = '%-10s  %-65s'
-        self.out(fmt % ('Position', 'Name'))
-        self.out(fmt % ('-' * len('Position'), '-' * len('Name')))
-        self.out(fmt % ('-', INGRESS))
-        for pos, (name, _) in enumerate(chain):
-            self.out(fmt % (pos, name))
-        self.out(fmt % ('-', MAIN))
+    def _get_stats(self, registry):
+        path = registry.settings.get('pyramid.tween_stats_file')
+        if not path:
+            self.out('The "pyramid.tween_stats_file" setting is required '
+                     'to show tween statistics')
+            return None
+        if '{pid}' in path:
+            # one dump per process of the application
+            paths = sorted(glob.glob(path.replace('{pid}', '*')))
+            if not paths:
+                self.out('No tween statistics found matching %s' % path)
+                return None
+        else:
+            paths = [path]
+        dumps = []
+        for path in paths:
+            try:
+                with open(path) as f:
+                    dumps.append(json.load(f))
+            except (IOError, OSError, ValueError) as e:
+                self.out('Could not read tween statistics from %s: %s'
+                         % (path, e))
+                return None
+        return merge_stats(dumps)
+
+    def show_chain(self, chain, stats=None):
+        if stats is None:
+            fmt = '%-10s  %-65s'
+            self.out(fmt % ('Position', 'Name'))
+            self.out(fmt % ('-' * len('Position'), '-' * len('Name')))
+            self.out(fmt % ('-', INGRESS))
+            for pos, (name, _) in enumerate(chain):
+                self.out(fmt % (pos, name))
+            self.out(fmt % ('-', MAIN))
+            return
+        fmt = '%-10s  %-45s  %8s  %9s  %9s  %9s  %9s'
+        headers = ('Position', 'Name', 'Count', 'Mean ms', 'p50 ms',
+                   'p95 ms', 'Max ms')
+        self.out(fmt % headers)
+        self.out(fmt % tuple('-' * len(header) for header in headers))
+        self.out(fmt % (('-', INGRESS) + ('',) * 5))
+        for pos, name in list(enumerate(name for name, _ in chain)) + [
+                ('-', MAIN)]:
+            self.out(fmt % ((pos, name) + self._format_stat(stats, name)))
+
+    def _format_stat(self, stats, name):
+        stat = stats['tweens'].get(name)
+        if not stat or not stat['count']:
+            return ('0', '-', '-', '-', '-')
+        count = stat['count']
+        ms = lambda seconds: '%.3f' % (seconds * 1000)
+        return (
+            str(count),
+            ms(stat['total'] / count),
+            ms(percentile(stats['bounds'], stat, 0.5)),
+            ms(percentile(stats['bounds'], stat, 0.95)),
+            ms(stat['max']),
+            )
 
     def run(self):
         if not self.args:
@@ -66,6 +159,11 @@ class PTweensCommand(object):
         env = self.bootstrap[0](config_uri, options=parse_vars(self.args[1:]))
         registry = env['registry']
         tweens = self._get_tweens(registry)
+        stats = None
+        if self.options.stats:
+            stats = self._get_stats(registry)
+            if stats is None:
+                return 2
         if tweens is not None:
             explicit = tweens.explicit
             if explicit:
@@ -74,7 +172,7 @@ class PTweensCommand(object):
                 self.out('')
                 self.out('Explicit Tween Chain (used)')
                 self.out('')
-                self.show_chain(tweens.explicit)
+                self.show_chain(tweens.explicit, stats)
                 self.out('')
                 self.out('Implicit Tween Chain (not used)')
                 self.out('')
@@ -85,7 +183,7 @@ class PTweensCommand(object):
                 self.out('')
                 self.out('Implicit Tween Chain')
                 self.out('')
-                self.show_chain(tweens.implicit())
+                self.show_chain(tweens.implicit(), stats)
         return 0
 
 if __name__ == '__main__': # pragma: no cover
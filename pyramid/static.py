@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 import hashlib
+import json
 import os
+import stat
+import threading
+import time
 
 from os.path import (
+    getmtime,
     normcase,
     normpath,
     join,
@@ -16,7 +21,10 @@ from pkg_resources import (
     resource_isdir,
     )
 
-from repoze.lru import lru_cache
+from repoze.lru import (
+    LRUCache,
+    lru_cache,
+    )
 
 from pyramid.asset import resolve_asset_spec
 
@@ -27,8 +35,15 @@ from pyramid.httpexceptions import (
     HTTPMovedPermanently,
     )
 
+from pyramid.interfaces import IPackageOverrides
+
 from pyramid.path import AssetResolver, caller_package
-from pyramid.response import FileResponse
+from pyramid.response import (
+    FileResponse,
+    Response,
+    _guess_type,
+    )
+from pyramid.threadlocal import get_current_registry
 from pyramid.traversal import traversal_path_info
 
 slash = text_('/')
@@ -76,10 +91,49 @@ class static_view(object):
        assets within the named ``root_dir`` package-relative directory.
        However, if the ``root_dir`` is absolute, configuration will not be able
        to override the assets it contains.
+
+    ``file_cache`` may be a :class:`pyramid.static.FileCache` instance (or
+    ``True`` to use one with default arguments).  Small files served by the
+    view are then kept in memory and served without touching the
+    filesystem.  By default, this is ``None`` and no files are cached.
+
+    ``precompressed`` may be a sequence of content encoding names (``'br'``
+    and/or ``'gzip'``) in order of preference, or ``True`` to mean
+    ``('br', 'gzip')``.  When a file is requested by a client whose
+    ``Accept-Encoding`` header allows one of these encodings, and a sibling
+    file with the matching extension (``.br`` or ``.gz``) exists next to
+    it, the sibling is served instead with the proper ``Content-Encoding``
+    header.  Siblings of package assets are looked up through any asset
+    overrides, just like the requested file.  Every response from such a
+    view carries a ``Vary: Accept-Encoding`` header and an ``ETag`` which
+    differs between the variants of a file.  Use the ``pcompress`` command
+    to create the sibling files.  By default, this is ``None`` and only the
+    requested file is ever served.
+
+    When ``root_dir`` is relative to a package, the filesystem path each
+    requested asset resolves to (taking any asset overrides into account) is
+    remembered, so later requests for it need not consult ``pkg_resources``
+    again; serving a remembered file costs no filesystem lookups beyond
+    opening it.  Remembered resolutions are discarded when an asset override
+    is added to the package, and a remembered resolution is discarded when
+    its file can no longer be opened (that request gets a ``404 Not
+    Found``).  Set the
+    ``resolution_recheck_interval`` attribute to a number of seconds to also
+    resolve each asset anew once its resolution is that old; by default
+    (``None``) resolutions do not expire.  The absence of an asset is only
+    remembered when such an interval is set.  The precompressed siblings of
+    an asset, or their absence, are remembered along with its resolution,
+    so siblings created later are only served once it is renewed.
+
+    .. versionchanged:: 1.7
+       Added the ``file_cache`` and ``precompressed`` arguments.
     """
+    resolution_recheck_interval = None
+    resolution_cache_size = 1000
 
     def __init__(self, root_dir, cache_max_age=3600, package_name=None,
-                 use_subpath=False, index='index.html', cachebust_match=None):
+                 use_subpath=False, index='index.html', cachebust_match=None,
+                 file_cache=None, precompressed=None):
         # package_name is for bw compat; it is preferred to pass in a
         # package-relative path as root_dir
         # (e.g. ``anotherpackage:foo/static``).
@@ -93,6 +147,24 @@ class static_view(object):
         self.norm_docroot = normcase(normpath(docroot))
         self.index = index
         self.cachebust_match = cachebust_match
+        if file_cache is True:
+            file_cache = FileCache()
+        self.file_cache = file_cache
+        if precompressed is True:
+            precompressed = ('br', 'gzip')
+        if precompressed:
+            try:
+                precompressed = tuple(
+                    (encoding, PRECOMPRESSED_EXTENSIONS[encoding])
+                    for encoding in precompressed
+                    )
+            except KeyError as e:
+                raise ValueError(
+                    'Unknown precompressed encoding %s' % e.args[0])
+        else:
+            precompressed = ()
+        self.precompressed = precompressed
+        self._resolutions = LRUCache(self.resolution_cache_size)
 
     def __call__(self, context, request):
         if self.use_subpath:
@@ -106,18 +178,42 @@ class static_view(object):
         if path is None:
             raise HTTPNotFound('Out of bounds: %s' % request.url)
 
+        precompressed = self.precompressed
+        if precompressed:
+            encodings = _accepted_precompressed(
+                precompressed, request.headers.get('Accept-Encoding', ''))
+        else:
+            encodings = ()
+
+        file_cache = self.file_cache
+        if file_cache is not None:
+            # the negotiated encodings are part of the key, so a client
+            # which accepts no encoding never gets a compressed entry and
+            # vice versa
+            cache_key = (self.package_name, self.docroot, path, encodings)
+            entry = file_cache.get(cache_key)
+            if entry is not None:
+                return self._finish(entry.make_response(self.cache_max_age))
+
+        is_index = False
+        resource_path = resolution_key = registry = None
+
         if self.package_name: # package resource
+            try:
+                registry = request.registry
+            except AttributeError: # bw compat (for tests)
+                registry = get_current_registry()
             resource_path = '%s/%s' % (self.docroot.rstrip('/'), path)
-            if resource_isdir(self.package_name, resource_path):
-                if not request.path_url.endswith('/'):
-                    self.add_slash_redirect(request)
-                resource_path = '%s/%s' % (
-                    resource_path.rstrip('/'), self.index
-                )
-
-            if not resource_exists(self.package_name, resource_path):
+            resolution_key = resource_path
+            is_index, filepath = self._resolve_resource(registry,
+                                                        resource_path)
+            if is_index:
+                resource_path = '%s/%s' % (resource_path.rstrip('/'),
+                                           self.index)
+            if is_index and not request.path_url.endswith('/'):
+                self.add_slash_redirect(request)
+            if filepath is None:
                 raise HTTPNotFound(request.url)
-            filepath = resource_filename(self.package_name, resource_path)
 
         else: # filesystem file
 
@@ -127,10 +223,121 @@ class static_view(object):
                 if not request.path_url.endswith('/'):
                     self.add_slash_redirect(request)
                 filepath = join(filepath, self.index)
+                is_index = True
             if not exists(filepath):
                 raise HTTPNotFound(request.url)
 
-        return FileResponse(filepath, request, self.cache_max_age)
+        content_type = content_encoding = None
+        if encodings:
+            content_type, content_encoding = _guess_type(filepath)
+            # a file which is itself encoded (e.g. foo.tar.gz) is served as-is
+            if content_encoding is None:
+                for encoding, ext in encodings:
+                    variant = self._find_variant(
+                        registry, resolution_key, resource_path, filepath,
+                        ext)
+                    if variant is not None:
+                        filepath = variant
+                        content_encoding = encoding
+                        break
+
+        # directory index responses are never cached: the same path must
+        # still redirect when requested without a trailing slash
+        if file_cache is not None and not is_index:
+            entry = file_cache.add(cache_key, filepath, content_type,
+                                   content_encoding)
+            if entry is not None:
+                return self._finish(entry.make_response(self.cache_max_age))
+
+        try:
+            response = FileResponse(
+                filepath, request, self.cache_max_age,
+                content_type=content_type, content_encoding=content_encoding)
+        except (IOError, OSError):
+            if resource_path is None:
+                raise
+            # the file a remembered resolution points to has gone away;
+            # the resolutions of its variants are forgotten along with it
+            self._resolutions.invalidate(resolution_key)
+            raise HTTPNotFound(request.url)
+        if self.precompressed:
+            # every variant of a negotiated resource needs its own validator
+            response.etag = _file_etag(filepath, content_encoding)
+        return self._finish(response)
+
+    def _find_variant(self, registry, resolution_key, resource_path,
+                      filepath, ext):
+        # Return the filesystem path of the ``ext`` sibling of the requested
+        # file or ``None``.  Package resources are looked up like the file
+        # itself, so an asset override of the sibling is honored, and the
+        # result (including the absence of the sibling) is remembered in
+        # the resolution of the file, which was made by this request.
+        if resource_path is None:
+            variant = filepath + ext
+            if exists(variant):
+                return variant
+            return None
+        entry = self._resolutions.get(resolution_key)
+        variants = entry[4] if entry is not None else {}
+        try:
+            return variants[ext]
+        except KeyError:
+            pass
+        package_name = self.package_name
+        path = resource_path + ext
+        variant = None
+        if (
+            resource_exists(package_name, path) and
+            not resource_isdir(package_name, path)
+        ):
+            variant = resource_filename(package_name, path)
+        variants[ext] = variant
+        return variant
+
+    def _resolve_resource(self, registry, resource_path):
+        # Return ``(is_index, filepath)`` for the package resource at
+        # ``resource_path``; ``filepath`` is ``None`` if it does not exist.
+        # Resolutions are keyed on the package's overrides object and its
+        # generation, both of which change when an override is added.  A
+        # remembered resolution is returned without touching the filesystem.
+        # Each resolution also holds a dictionary of the precompressed
+        # siblings of the file found by ``_find_variant``.
+        overrides = registry.queryUtility(
+            IPackageOverrides, name=self.package_name)
+        token = (overrides, getattr(overrides, 'generation', None))
+        interval = self.resolution_recheck_interval
+        now = time.time()
+        entry = self._resolutions.get(resource_path)
+        if entry is not None:
+            entry_token, checked, is_index, filepath, variants = entry
+            if (
+                entry_token == token and
+                (interval is None or now - checked < interval)
+            ):
+                return is_index, filepath
+
+        package_name = self.package_name
+        path = resource_path
+        is_index = False
+        if resource_isdir(package_name, path):
+            path = '%s/%s' % (path.rstrip('/'), self.index)
+            is_index = True
+        if resource_exists(package_name, path):
+            filepath = resource_filename(package_name, path)
+        else:
+            filepath = None
+            if interval is None:
+                # the asset may still appear; only a bounded recheck
+                # interval makes it safe to remember its absence
+                return is_index, filepath
+        self._resolutions.put(resource_path,
+                              (token, now, is_index, filepath, {}))
+        return is_index, filepath
+
+    def _finish(self, response):
+        if self.precompressed:
+            response.vary = ('Accept-Encoding',)
+        return response
 
     def add_slash_redirect(self, request):
         url = request.path_url + '/'
@@ -139,6 +346,215 @@ class static_view(object):
             url = url + '?' + qs
         raise HTTPMovedPermanently(url)
 
+def _file_etag(filepath, content_encoding=None):
+    # an ETag for the file at ``filepath`` derived from its modification
+    # time and size, qualified by the content coding it is served with
+    st = os.stat(filepath)
+    etag = '%x-%x' % (int(st.st_mtime * 1000), st.st_size)
+    if content_encoding:
+        etag = '%s-%s' % (etag, content_encoding)
+    return etag
+
+PRECOMPRESSED_EXTENSIONS = {
+    'br': '.br',
+    'gzip': '.gz',
+    }
+
+def _parse_accept_encoding(value):
+    # returns a mapping of lowercased content coding to quality value
+    result = {}
+    for item in value.split(','):
+        params = item.split(';')
+        coding = params[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params[1:]:
+            name, _, v = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(v)
+                except ValueError:
+                    q = 0.0
+        result[coding] = q
+    return result
+
+@lru_cache(1000)
+def _accepted_precompressed(precompressed, accept_encoding):
+    # return the (encoding, extension) pairs of ``precompressed`` which the
+    # Accept-Encoding header value ``accept_encoding`` allows, in order
+    if not accept_encoding:
+        return ()
+    accepted = _parse_accept_encoding(accept_encoding)
+    default = accepted.get('*', 0.0)
+    if 'x-gzip' in accepted and 'gzip' not in accepted:
+        accepted['gzip'] = accepted['x-gzip']
+    return tuple(
+        (encoding, ext) for encoding, ext in precompressed
+        if accepted.get(encoding, default) > 0
+        )
+
+class _CachedFile(object):
+    def __init__(self, filepath, body, mtime, checked, content_type=None,
+                 content_encoding=None):
+        self.filepath = filepath
+        self.body = body
+        self.size = len(body)
+        self.mtime = mtime
+        self.checked = checked
+        self.used = 0
+        if content_type is None:
+            content_type, content_encoding = _guess_type(filepath)
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.etag = hashlib.md5(body).hexdigest()
+
+    def make_response(self, cache_max_age):
+        response = Response(
+            conditional_response=True,
+            content_type=self.content_type,
+            content_encoding=self.content_encoding,
+            )
+        response.body = self.body
+        response.last_modified = self.mtime
+        response.etag = self.etag
+        if cache_max_age is not None:
+            response.cache_expires = cache_max_age
+        return response
+
+class FileCache(object):
+    """ An in-memory cache of small files for use as the ``file_cache``
+    argument of :class:`pyramid.static.static_view` (and
+    :meth:`pyramid.config.Configurator.add_static_view`).  A cached file is
+    served from memory, along with its content type, modification time and
+    an md5-based ``ETag``, without any filesystem access.
+
+    ``max_file_size`` is the size in bytes above which a file is never
+    cached (default 64KB).
+
+    ``max_entries`` is the maximum number of files kept in the cache
+    (default 1000) and ``max_total_size`` the maximum number of bytes of
+    file content kept in the cache (default 16MB).  When either limit would
+    be exceeded, the least recently served files are discarded.
+
+    ``recheck_interval`` is the number of seconds (default 1) during which a
+    cached file is served without checking whether it changed on disk.  Once
+    it elapses, the next request for the file compares its modification
+    time and size with the cached ones; a changed or missing file is
+    discarded and looked up anew.  Likewise, a file which is too large to be
+    cached or isn't a regular file is remembered as such under its key, and
+    isn't examined again until ``recheck_interval`` has elapsed.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, max_file_size=64 * 1024, max_entries=1000,
+                 max_total_size=16 * 1024 * 1024, recheck_interval=1):
+        self.max_file_size = max_file_size
+        self.max_entries = max_entries
+        self.max_total_size = max_total_size
+        self.recheck_interval = recheck_interval
+        self.total_size = 0
+        self._entries = {}
+        # key -> (filepath, checked) of the files which can't be cached
+        self._uncacheable = {}
+        self._lock = threading.Lock()
+        self._clock = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """ Return the entry cached under ``key`` or ``None``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if now - entry.checked >= self.recheck_interval:
+            try:
+                st = os.stat(entry.filepath)
+            except OSError:
+                st = None
+            if (st is None or st.st_mtime != entry.mtime or
+                    st.st_size != entry.size):
+                self.discard(key)
+                return None
+            entry.checked = now
+        self._clock += 1
+        entry.used = self._clock
+        return entry
+
+    def add(self, key, filepath, content_type=None, content_encoding=None):
+        """ Read the file at ``filepath`` into the cache under ``key`` and
+        return the new entry, or return ``None`` if the file is not a
+        regular file or is too large to be cached.  If ``content_type`` is
+        ``None``, the content type and encoding are guessed from
+        ``filepath``."""
+        now = time.time()
+        uncacheable = self._uncacheable.get(key)
+        if (
+            uncacheable is not None and uncacheable[0] == filepath and
+            now - uncacheable[1] < self.recheck_interval
+        ):
+            return None
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        if (
+            not stat.S_ISREG(st.st_mode) or
+            st.st_size > min(self.max_file_size, self.max_total_size)
+        ):
+            with self._lock:
+                if len(self._uncacheable) >= self.max_entries:
+                    # cheaper to start over than to track their use
+                    self._uncacheable = {}
+                self._uncacheable[key] = (filepath, now)
+            return None
+        with open(filepath, 'rb') as f:
+            body = f.read(self.max_file_size + 1)
+        if len(body) != st.st_size:
+            # the file changed while we were looking at it
+            return None
+        entry = _CachedFile(filepath, body, st.st_mtime, now, content_type,
+                            content_encoding)
+        with self._lock:
+            self._uncacheable.pop(key, None)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_size -= old.size
+            self._evict(entry.size)
+            self._clock += 1
+            entry.used = self._clock
+            self._entries[key] = entry
+            self.total_size += entry.size
+        return entry
+
+    def discard(self, key):
+        """ Remove the entry cached under ``key``, if any."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.total_size -= entry.size
+
+    def clear(self):
+        """ Remove every entry from the cache."""
+        with self._lock:
+            self._entries = {}
+            self._uncacheable = {}
+            self.total_size = 0
+
+    def _evict(self, size):
+        # must be called with the lock held; eviction is rare enough in
+        # steady state that a scan for the least recently used entry is
+        # cheaper overall than maintaining an ordered structure on every hit
+        entries = self._entries
+        while entries and (
+            len(entries) >= self.max_entries or
+            self.total_size + size > self.max_total_size
+        ):
+            key = min(entries, key=lambda k: entries[k].used)
+            self.total_size -= entries.pop(key).size
+
 _seps = set(['/', os.sep])
 def _contains_slash(item):
     for sep in _seps:
@@ -284,3 +700,92 @@ class QueryStringConstantCacheBuster(QueryStringCacheBuster):
 
     def tokenize(self, pathspec):
         return self._token
+
+class ManifestCacheBuster(object):
+    """
+    An implementation of :class:`~pyramid.interfaces.ICacheBuster` which
+    uses a manifest file to map the path of an asset to a cache busted
+    version of that path.  No asset is ever read or hashed while generating
+    URLs; the manifest is typically produced at build time, either by the
+    ``pmanifest`` command or by an external asset pipeline.
+
+    ``manifest_spec`` is an absolute path or an :term:`asset specification`
+    of a JSON file containing a mapping of asset paths (relative to the
+    static view's directory, using ``/`` as a separator) to their cache
+    busted paths, e.g.:
+
+    .. code-block:: json
+
+       {
+         "css/main.css": "css/main.4b9a7c3e51d2.css",
+         "js/app.js": "js/app.e2f0b1c45a87.js"
+       }
+
+    Assets missing from the manifest are left untouched.  Incoming requests
+    for a cache busted path are mapped back to the original asset by
+    :meth:`match`, so the cache busted files need not exist on disk.
+
+    If ``reload`` is ``True``, the modification time of the manifest is
+    checked each time it is used and the manifest is reloaded when it
+    changes.  Otherwise (the default), it is loaded once, when first used.
+    A missing manifest is treated as an empty one.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self, manifest_spec, reload=False):
+        package_name = caller_package().__name__
+        self.manifest_path = AssetResolver(package_name).resolve(
+            manifest_spec).abspath()
+        self.reload = reload
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._manifest = None
+        self._reverse = None
+
+    def parse_manifest(self, content):
+        """
+        Parse the ``content`` read from the manifest file (bytes) and return
+        a dictionary mapping asset paths to cache busted paths.  Override
+        this method to support a different manifest format.
+        """
+        return json.loads(content.decode('utf-8'))
+
+    def _load(self):
+        try:
+            mtime = getmtime(self.manifest_path)
+        except OSError:
+            mtime = None
+        if self._manifest is not None and mtime == self._mtime:
+            return
+        with self._lock:
+            if self._manifest is not None and mtime == self._mtime:
+                return
+            manifest = {}
+            if mtime is not None:
+                with open(self.manifest_path, 'rb') as f:
+                    manifest = self.parse_manifest(f.read())
+            self._reverse = dict((v, k) for k, v in manifest.items())
+            self._manifest = manifest
+            self._mtime = mtime
+
+    @property
+    def manifest(self):
+        """ The current mapping of asset paths to cache busted paths."""
+        if self._manifest is None or self.reload:
+            self._load()
+        return self._manifest
+
+    def pregenerate(self, pathspec, subpath, kw):
+        path = '/'.join(subpath)
+        busted = self.manifest.get(path)
+        if busted is not None:
+            subpath = tuple(busted.split('/'))
+        return subpath, kw
+
+    def match(self, subpath):
+        if self._manifest is None or self.reload:
+            self._load()
+        original = self._reverse.get('/'.join(subpath))
+        if original is not None:
+            subpath = tuple(original.split('/'))
+        return subpath
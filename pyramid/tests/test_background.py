@@ -0,0 +1,290 @@
+import threading
+import unittest
+
+class TestBackgroundExecutor(unittest.TestCase):
+    def _makeOne(self, max_workers=1, max_queue=10, timeout=1.0,
+                 logger=None):
+        from pyramid.background import BackgroundExecutor
+        return BackgroundExecutor(max_workers, max_queue, timeout, logger)
+
+    def test_conforms_to_IBackgroundExecutor(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IBackgroundExecutor
+        verifyObject(IBackgroundExecutor, self._makeOne())
+
+    def test_workers_started_lazily(self):
+        executor = self._makeOne(max_workers=2)
+        self.assertEqual(executor.workers, [])
+        executor.submit(lambda: None)
+        self.assertEqual(len(executor.workers), 2)
+        self.assertTrue(all(w.daemon for w in executor.workers))
+        executor.shutdown()
+
+    def test_submit_runs_in_worker(self):
+        executor = self._makeOne()
+        L = []
+        def task(*arg, **kw):
+            L.append((arg, kw, threading.current_thread()))
+        executor.submit(task, 1, a=2)
+        executor.shutdown()
+        self.assertEqual(len(L), 1)
+        self.assertEqual(L[0][:2], ((1,), {'a': 2}))
+        self.assertTrue(L[0][2] is executor.workers[0])
+
+    def test_submit_in_order(self):
+        executor = self._makeOne()
+        L = []
+        for i in range(20):
+            executor.submit(L.append, i)
+        executor.shutdown()
+        self.assertEqual(L, list(range(20)))
+
+    def test_submit_full_queue_runs_inline(self):
+        executor = self._makeOne(max_workers=1, max_queue=1, timeout=0.01)
+        started = threading.Event()
+        release = threading.Event()
+        def block():
+            started.set()
+            release.wait()
+        L = []
+        executor.submit(block)
+        started.wait()
+        executor.submit(L.append, 'queued')
+        executor.submit(
+            lambda: L.append(threading.current_thread()))
+        self.assertEqual(L, [threading.current_thread()])
+        release.set()
+        executor.shutdown()
+        self.assertEqual(L, [threading.current_thread(), 'queued'])
+
+    def test_submit_enqueues_under_lock(self):
+        # shutdown can't queue its stop markers between the closed check
+        # and the put, and strand the task behind them
+        executor = self._makeOne()
+        put_nowait = executor.queue.put_nowait
+        locked = []
+        def checking_put_nowait(*arg):
+            locked.append(executor.lock.locked())
+            return put_nowait(*arg)
+        executor.queue.put_nowait = checking_put_nowait
+        L = []
+        executor.submit(L.append, 1)
+        executor.shutdown()
+        self.assertEqual(L, [1])
+        self.assertEqual(locked, [True])
+
+    def test_submit_full_queue_waits_concurrently(self):
+        # callers waiting for room don't queue up behind each other for
+        # the lock, so each waits about ``timeout``, not a multiple of it
+        from pyramid.compat import perf_counter
+        executor = self._makeOne(max_workers=1, max_queue=1, timeout=0.2)
+        started = threading.Event()
+        release = threading.Event()
+        def block():
+            started.set()
+            release.wait()
+        executor.submit(block)
+        started.wait()
+        executor.submit(lambda: None)
+        waited = []
+        def submitter():
+            start = perf_counter()
+            executor.submit(lambda: None)
+            waited.append(perf_counter() - start)
+        threads = [threading.Thread(target=submitter) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        release.set()
+        executor.shutdown()
+        self.assertEqual(len(waited), 6)
+        self.assertTrue(max(waited) < 0.6, waited)
+
+    def test_submit_waiting_runs_inline_on_shutdown(self):
+        executor = self._makeOne(max_workers=1, max_queue=1, timeout=10)
+        started = threading.Event()
+        release = threading.Event()
+        def block():
+            started.set()
+            release.wait()
+        executor.submit(block)
+        started.wait()
+        executor.submit(lambda: None)
+        L = []
+        def submitter():
+            executor.submit(lambda: L.append(threading.current_thread()))
+        thread = threading.Thread(target=submitter)
+        thread.start()
+        executor.shutdown(wait=False)
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(L, [thread])
+        release.set()
+        for worker in executor.workers:
+            worker.join()
+
+    def test_submit_waiting_gets_room(self):
+        executor = self._makeOne(max_workers=1, max_queue=1, timeout=10)
+        started = threading.Event()
+        release = threading.Event()
+        def block():
+            started.set()
+            release.wait()
+        executor.submit(block)
+        started.wait()
+        executor.submit(lambda: None)
+        L = []
+        def submitter():
+            executor.submit(lambda: L.append(threading.current_thread()))
+        thread = threading.Thread(target=submitter)
+        thread.start()
+        release.set()
+        thread.join(5)
+        executor.shutdown()
+        self.assertEqual(L, [executor.workers[0]])
+
+    def test_submit_after_shutdown_runs_inline(self):
+        executor = self._makeOne()
+        executor.submit(lambda: None)
+        executor.shutdown()
+        L = []
+        executor.submit(lambda: L.append(threading.current_thread()))
+        self.assertEqual(L, [threading.current_thread()])
+
+    def test_shutdown_drains(self):
+        executor = self._makeOne()
+        release = threading.Event()
+        L = []
+        executor.submit(release.wait)
+        executor.submit(L.append, 1)
+        release.set()
+        executor.shutdown(wait=True)
+        self.assertEqual(L, [1])
+        self.assertFalse(executor.workers[0].is_alive())
+
+    def test_shutdown_twice(self):
+        executor = self._makeOne()
+        executor.submit(lambda: None)
+        executor.shutdown()
+        executor.shutdown()
+        self.assertTrue(executor.closed)
+
+    def test_shutdown_not_started(self):
+        executor = self._makeOne()
+        executor.shutdown()
+        self.assertEqual(executor.workers, [])
+
+    def test_exception_logged(self):
+        logger = DummyLogger()
+        executor = self._makeOne(logger=logger)
+        def task():
+            raise ValueError
+        executor.submit(task)
+        executor.submit(logger.messages.append, 'after')
+        executor.shutdown()
+        self.assertEqual(len(logger.messages), 2)
+        self.assertTrue(
+            logger.messages[0].startswith('Exception in background task'))
+        self.assertEqual(logger.messages[1], 'after')
+
+    def test_exception_without_logger(self):
+        executor = self._makeOne()
+        L = []
+        def task():
+            raise ValueError
+        executor.submit(task)
+        executor.submit(L.append, 1)
+        executor.shutdown()
+        self.assertEqual(L, [1])
+
+class Test_shutdown_started(unittest.TestCase):
+    def test_it(self):
+        from pyramid.background import BackgroundExecutor
+        from pyramid.background import _shutdown_started
+        executor = BackgroundExecutor(max_workers=1)
+        executor.submit(lambda: None)
+        _shutdown_started()
+        self.assertTrue(executor.closed)
+
+class Test_get_background_executor(unittest.TestCase):
+    def _callFUT(self, registry):
+        from pyramid.background import get_background_executor
+        return get_background_executor(registry)
+
+    def _makeRegistry(self, settings=None):
+        from pyramid.registry import Registry
+        registry = Registry()
+        registry.settings = settings
+        return registry
+
+    def test_creates_and_registers(self):
+        from pyramid.interfaces import IBackgroundExecutor
+        from pyramid.interfaces import IDebugLogger
+        registry = self._makeRegistry()
+        logger = DummyLogger()
+        registry.registerUtility(logger, IDebugLogger)
+        executor = self._callFUT(registry)
+        self.assertEqual(executor.max_workers, 4)
+        self.assertEqual(executor.max_queue, 1000)
+        self.assertTrue(executor.logger is logger)
+        self.assertTrue(registry.getUtility(IBackgroundExecutor) is executor)
+        self.assertTrue(self._callFUT(registry) is executor)
+
+    def test_settings(self):
+        registry = self._makeRegistry({'pyramid.background_workers': '2',
+                                       'pyramid.background_queue_size': '5'})
+        executor = self._callFUT(registry)
+        self.assertEqual(executor.max_workers, 2)
+        self.assertEqual(executor.max_queue, 5)
+
+    def test_registered(self):
+        from pyramid.interfaces import IBackgroundExecutor
+        registry = self._makeRegistry()
+        executor = object()
+        registry.registerUtility(executor, IBackgroundExecutor)
+        self.assertTrue(self._callFUT(registry) is executor)
+
+class Test__submit(unittest.TestCase):
+    def _callFUT(self, registry, fn, *args):
+        from pyramid.background import _submit
+        return _submit(registry, fn, *args)
+
+    def test_with_executor(self):
+        from pyramid.interfaces import IBackgroundExecutor
+        from pyramid.registry import Registry
+        registry = Registry()
+        executor = DummyExecutor()
+        registry.registerUtility(executor, IBackgroundExecutor)
+        self._callFUT(registry, len, 'abc')
+        self.assertEqual(executor.submitted, [(len, ('abc',))])
+
+    def test_without_executor_runs_now(self):
+        from pyramid.interfaces import IBackgroundExecutor
+        from pyramid.interfaces import IDebugLogger
+        from pyramid.registry import Registry
+        registry = Registry()
+        logger = DummyLogger()
+        registry.registerUtility(logger, IDebugLogger)
+        L = []
+        self._callFUT(registry, L.append, 1)
+        def task():
+            raise ValueError
+        self._callFUT(registry, task)
+        self.assertEqual(L, [1])
+        self.assertEqual(len(logger.messages), 1)
+        self.assertEqual(registry.queryUtility(IBackgroundExecutor), None)
+
+class DummyExecutor(object):
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+class DummyLogger(object):
+    def __init__(self):
+        self.messages = []
+
+    def exception(self, msg):
+        self.messages.append(msg)
@@ -108,6 +108,48 @@ class AdaptersConfiguratorMixinTests(unittest.TestCase):
         config.registry.notify(object())
         self.assertEqual(len(L), 1)
 
+    def test_add_subscriber_background(self):
+        from zope.interface import implementer
+        from zope.interface import Interface
+        from pyramid.interfaces import IBackgroundExecutor
+        class IEvent(Interface):
+            pass
+        @implementer(IEvent)
+        class Event:
+            pass
+        L = []
+        def subscriber(event):
+            L.append(event)
+        config = self._makeOne(autocommit=True)
+        executor = DummyExecutor()
+        config.registry.registerUtility(executor, IBackgroundExecutor)
+        predlist = config.get_predlist('subscriber')
+        predlist.add('jam', predicate_maker('jam'))
+        config.add_subscriber(subscriber, IEvent, background=True, jam=True)
+        event = Event()
+        event.jam = True
+        config.registry.notify(event)
+        event2 = Event()
+        event2.jam = False
+        config.registry.notify(event2)
+        self.assertEqual(L, [])
+        self.assertEqual(len(executor.submitted), 1)
+        fn, args = executor.submitted[0]
+        self.assertEqual(args, (event,))
+        fn(*args)
+        self.assertEqual(L, [event])
+        intr = list(config.registry.introspector.get_category(
+            'subscribers'))[0]['introspectable']
+        self.assertEqual(intr['background'], True)
+
+    def test_add_subscriber_background_creates_executor(self):
+        from pyramid.interfaces import IBackgroundExecutor
+        config = self._makeOne(autocommit=True)
+        config.add_subscriber(lambda event: None, background=True)
+        executor = config.registry.queryUtility(IBackgroundExecutor)
+        self.assertNotEqual(executor, None)
+        self.assertEqual(executor.workers, [])
+
     def test_add_subscriber_with_default_type_predicates_True(self):
         from zope.interface import implementer
         from zope.interface import Interface
@@ -363,3 +405,9 @@ def predicate_maker(name):
             return getattr(event, name, None) == self.val
     return Predicate
 
+class DummyExecutor(object):
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
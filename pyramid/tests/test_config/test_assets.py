@@ -513,6 +513,21 @@ class TestPackageOverrides(unittest.TestCase):
         override = po.overrides[0]
         self.assertEqual(override.__class__, DirectoryOverride)
 
+    def test_insert_increments_generation(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        generation = po.generation
+        po.insert('foo.pt', DummyAssetSource())
+        po.insert('bar/', DummyAssetSource())
+        self.assertEqual(po.generation, generation + 2)
+
+    def test_set_overrides_increments_generation(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        generation = po.generation
+        po.overrides = [None]
+        self.assertEqual(po.generation, generation + 1)
+
     def test_insert_file(self):
         from pyramid.config.assets import FileOverride
         package = DummyPackage('package')
@@ -535,6 +550,17 @@ class TestPackageOverrides(unittest.TestCase):
         override = po.overrides[0]
         self.assertEqual(override.__class__, DirectoryOverride)
 
+    def test_filtered_sources_reindexed_after_insert(self):
+        package = DummyPackage('package')
+        po = self._makeOne(package)
+        source = DummyAssetSource()
+        po.insert('foo/', source)
+        self.assertEqual(list(po.filtered_sources('bar.pt')), [])
+        po.insert('bar.pt', source)
+        self.assertEqual(list(po.filtered_sources('bar.pt')), [(source, '')])
+        po.overrides = []
+        self.assertEqual(list(po.filtered_sources('bar.pt')), [])
+
     def test_filtered_sources(self):
         overrides = [ DummyOverride(None), DummyOverride('foo')]
         package = DummyPackage('package')
@@ -846,6 +872,48 @@ class TestFileOverride(unittest.TestCase):
         result = o('notfound.pt')
         self.assertEqual(result, None)
 
+class TestOverrideIndex(unittest.TestCase):
+    def _makeOne(self, overrides):
+        from pyramid.config.assets import OverrideIndex
+        return OverrideIndex(overrides)
+
+    def _makeOverrides(self):
+        from pyramid.config.assets import DirectoryOverride
+        from pyramid.config.assets import FileOverride
+        source = DummyAssetSource()
+        return [
+            FileOverride('a/b/c.pt', source),
+            DirectoryOverride('a/b/', source),
+            DirectoryOverride('a/', source),
+            FileOverride('a/b', source),
+            DirectoryOverride('x/', source),
+            DirectoryOverride('', source),
+            FileOverride('c.pt', source),
+            DirectoryOverride('a/b/', source),
+            ]
+
+    def test_matches_linear_scan(self):
+        overrides = self._makeOverrides()
+        inst = self._makeOne(overrides)
+        names = ['a/b/c.pt', 'a/b/d.pt', 'a/b', 'a/b/', 'a', 'a/', 'c.pt',
+                 'x', 'x/y/z', '', 'b/c.pt', 'a//b', 'a/bc/d']
+        for name in names:
+            expected = [o for o in overrides if o(name) is not None]
+            self.assertEqual(inst.matching(name), expected, name)
+
+    def test_unindexed_overrides_always_returned_in_order(self):
+        from pyramid.config.assets import FileOverride
+        first = DummyOverride(None)
+        file_override = FileOverride('foo.pt', DummyAssetSource())
+        last = DummyOverride(None)
+        inst = self._makeOne([first, file_override, last])
+        self.assertEqual(inst.matching('foo.pt'), [first, file_override, last])
+        self.assertEqual(inst.matching('bar.pt'), [first, last])
+
+    def test_empty(self):
+        inst = self._makeOne([])
+        self.assertEqual(inst.matching('foo.pt'), [])
+
 class DummyOverride:
     def __init__(self, result):
         self.result = result
@@ -23,6 +23,23 @@ class TestFactoriesMixin(unittest.TestCase):
         self.assertEqual(config.registry.getUtility(IRequestFactory),
                          dummyfactory)
 
+    def test_set_request_profiler(self):
+        from pyramid.interfaces import IRequestProfiler
+        config = self._makeOne(autocommit=True)
+        profiler = object()
+        config.set_request_profiler(profiler)
+        self.assertEqual(config.registry.getUtility(IRequestProfiler),
+                         profiler)
+        self.assertTrue(config.registry.request_profiler is profiler)
+
+    def test_set_request_profiler_dottedname(self):
+        from pyramid.interfaces import IRequestProfiler
+        config = self._makeOne(autocommit=True)
+        config.set_request_profiler(
+            'pyramid.tests.test_config.dummyfactory')
+        self.assertEqual(config.registry.getUtility(IRequestProfiler),
+                         dummyfactory)
+
     def test_set_response_factory(self):
         from pyramid.interfaces import IResponseFactory
         config = self._makeOne(autocommit=True)
@@ -98,6 +115,80 @@ class TestFactoriesMixin(unittest.TestCase):
         exts = config.registry.getUtility(IRequestExtensions)
         self.assertTrue('foo' in exts.methods)
 
+    def test_add_request_method_invalidates_extended_classes(self):
+        from pyramid.interfaces import IRequestExtensions
+        config = self._makeOne(autocommit=True)
+        def foo(self): pass
+        def bar(self): pass
+        config.add_request_method(foo)
+        exts = config.registry.getUtility(IRequestExtensions)
+        version = exts.version
+        exts.classes[(object, version)] = object
+        config.add_request_method(bar)
+        self.assertEqual(exts.classes, {})
+        self.assertEqual(exts.version, version + 1)
+
+    def test_add_request_method_with_cache(self):
+        from pyramid.interfaces import IRequestExtensions
+        from pyramid.interfaces import IRequestPropertyCache
+        from pyramid.request import RequestPropertyCache
+        from pyramid.decorator import reify
+        config = self._makeOne(autocommit=True)
+        calls = []
+        def tenant(request):
+            calls.append(request)
+            return request.host
+        config.add_request_method(tenant, cache=lambda r: r.host,
+                                  cache_ttl=60, cache_size=10)
+        exts = config.registry.getUtility(IRequestExtensions)
+        self.assertTrue(isinstance(exts.descriptors['tenant'], reify))
+        cache = config.registry.getUtility(IRequestPropertyCache,
+                                           name='tenant')
+        self.assertTrue(isinstance(cache, RequestPropertyCache))
+        self.assertEqual(cache.maxsize, 10)
+        self.assertEqual(cache.timeout, 60)
+        intr = config.registry.introspector.get('request extensions',
+                                                'tenant')
+        self.assertTrue(intr['cache'] is cache)
+        self.assertEqual(intr['reify'], True)
+
+    def test_add_request_method_with_cache_shared_by_requests(self):
+        from pyramid.interfaces import IRequestExtensions
+        from pyramid.request import Request
+        from pyramid.request import apply_request_extensions
+        config = self._makeOne(autocommit=True)
+        calls = []
+        def tenant(request):
+            calls.append(request)
+            return request.host
+        config.add_request_method(tenant, cache=lambda r: r.host)
+        def make_request():
+            request = Request.blank('/')
+            exts = config.registry.getUtility(IRequestExtensions)
+            apply_request_extensions(request, exts)
+            return request
+        request = make_request()
+        self.assertEqual(request.tenant, 'localhost:80')
+        self.assertEqual(request.tenant, 'localhost:80')
+        self.assertEqual(make_request().tenant, 'localhost:80')
+        self.assertEqual(len(calls), 1)
+        config.registry.invalidate_request_property('tenant')
+        self.assertEqual(make_request().tenant, 'localhost:80')
+        self.assertEqual(len(calls), 2)
+
+    def test_add_request_method_with_cache_and_no_callable(self):
+        from pyramid.exceptions import ConfigurationError
+        config = self._makeOne(autocommit=True)
+        self.assertRaises(ConfigurationError, config.add_request_method,
+                          name='foo', cache=lambda r: None)
+
+    def test_add_request_method_with_cache_and_descriptor(self):
+        from pyramid.exceptions import ConfigurationError
+        config = self._makeOne(autocommit=True)
+        self.assertRaises(ConfigurationError, config.add_request_method,
+                          property(lambda r: None), name='foo',
+                          cache=lambda r: None)
+
     def test_set_multiple_request_methods_conflict(self):
         from pyramid.exceptions import ConfigurationConflictError
         config = self._makeOne()
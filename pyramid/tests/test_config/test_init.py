@@ -306,6 +306,12 @@ class ConfiguratorTests(unittest.TestCase):
         config._fix_registry()
         self.assertEqual(reg.has_listeners, True)
 
+    def test__fix_registry_has_listeners_for(self):
+        reg = DummyRegistry()
+        config = self._makeOne(reg)
+        config._fix_registry()
+        self.assertEqual(reg.has_listeners_for(object), True)
+
     def test__fix_registry_notify(self):
         reg = DummyRegistry()
         config = self._makeOne(reg)
@@ -681,6 +687,18 @@ pyramid.tests.test_config.dummy_include2""",
         self.assertTrue(IApplicationCreated.providedBy(subscriber[0]))
         pyramid.config.global_registries.empty()
 
+    def test_make_wsgi_app_creates_background_executor(self):
+        import pyramid.config
+        from pyramid.interfaces import IBackgroundExecutor
+        config = self._makeOne()
+        config.manager = DummyThreadLocalManager()
+        self.assertEqual(
+            config.registry.queryUtility(IBackgroundExecutor), None)
+        config.make_wsgi_app()
+        self.assertNotEqual(
+            config.registry.queryUtility(IBackgroundExecutor), None)
+        pyramid.config.global_registries.empty()
+
     def test_include_with_dotted_name(self):
         from pyramid.tests import test_config
         config = self._makeOne()
@@ -32,3 +32,35 @@ class TestRenderingConfiguratorMixin(unittest.TestCase):
         self.assertEqual(config.registry.getUtility(IRendererFactory, 'name'),
                          pyramid.tests.test_config)
 
+
+    def test_default_fragment_cache(self):
+        from pyramid.interfaces import IFragmentCache
+        from pyramid.renderers import FragmentCache
+        config = self._makeOne(autocommit=True)
+        config.setup_registry()
+        cache = config.registry.getUtility(IFragmentCache)
+        self.assertEqual(cache.__class__, FragmentCache)
+
+    def test_set_fragment_cache_overrides_default(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne()
+        config.setup_registry()
+        cache = object()
+        config.set_fragment_cache(cache)
+        config.commit()
+        self.assertEqual(config.registry.getUtility(IFragmentCache), cache)
+
+    def test_set_fragment_cache(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne(autocommit=True)
+        cache = object()
+        config.set_fragment_cache(cache)
+        self.assertEqual(config.registry.getUtility(IFragmentCache), cache)
+
+    def test_set_fragment_cache_dottedname(self):
+        from pyramid.interfaces import IFragmentCache
+        config = self._makeOne(autocommit=True)
+        import pyramid.tests.test_config
+        config.set_fragment_cache('pyramid.tests.test_config')
+        self.assertEqual(config.registry.getUtility(IFragmentCache),
+                         pyramid.tests.test_config)
@@ -428,6 +428,29 @@ class TestSettings(unittest.TestCase):
         self.assertEqual(result['debug_routematch'], True)
         self.assertEqual(result['pyramid.debug_routematch'], True)
 
+    def test_debug_memory(self):
+        result = self._makeOne({})
+        self.assertEqual(result['debug_memory'], False)
+        self.assertEqual(result['pyramid.debug_memory'], False)
+        result = self._makeOne({'debug_memory':'t'})
+        self.assertEqual(result['debug_memory'], True)
+        self.assertEqual(result['pyramid.debug_memory'], True)
+        result = self._makeOne({'pyramid.debug_memory':'1'})
+        self.assertEqual(result['debug_memory'], True)
+        self.assertEqual(result['pyramid.debug_memory'], True)
+        result = self._makeOne({}, {'PYRAMID_DEBUG_MEMORY':'1'})
+        self.assertEqual(result['debug_memory'], True)
+        self.assertEqual(result['pyramid.debug_memory'], True)
+        result = self._makeOne({'debug_memory':'false',
+                                'pyramid.debug_memory':'false'},
+                               {'PYRAMID_DEBUG_MEMORY':'1'})
+        self.assertEqual(result['debug_memory'], True)
+        self.assertEqual(result['pyramid.debug_memory'], True)
+        # too slow to be implied by debug_all
+        result = self._makeOne({'debug_all':'true'})
+        self.assertEqual(result['debug_memory'], False)
+        self.assertEqual(result['pyramid.debug_memory'], False)
+
     def test_debug_templates(self):
         result = self._makeOne({})
         self.assertEqual(result['debug_templates'], False)
@@ -205,6 +205,70 @@ class TestTweens(unittest.TestCase):
         tweens.add_implicit('name1', factory1)
         self.assertEqual(tweens(None, None), '123')
 
+    def test___call___stats_disabled(self):
+        tweens = self._makeOne()
+        def factory(handler, registry):
+            return handler
+        tweens.add_implicit('name', factory)
+        registry = DummyRegistry({'pyramid.tween_stats': 'false'})
+        handler = object()
+        self.assertTrue(tweens(handler, registry) is handler)
+        self.assertEqual(tweens.stats, None)
+
+    def test___call___stats_enabled(self):
+        from pyramid.tweens import MAIN
+        tweens = self._makeOne()
+        def outer_factory(handler, registry):
+            def outer(request):
+                request.seen.append('outer')
+                return handler(request)
+            return outer
+        def inner_factory(handler, registry):
+            def inner(request):
+                request.seen.append('inner')
+                return handler(request)
+            return inner
+        tweens.add_implicit('inner', inner_factory)
+        tweens.add_implicit('outer', outer_factory)
+        registry = DummyRegistry({'pyramid.tween_stats': 'true'})
+        def main(request):
+            request.seen.append('main')
+            return 'response'
+        handler = tweens(main, registry)
+        request = DummyRequest()
+        self.assertEqual(handler(request), 'response')
+        self.assertEqual(handler(request), 'response')
+        self.assertEqual(request.seen, ['outer', 'inner', 'main'] * 2)
+        self.assertFalse('_tween_time' in request.__dict__)
+        snapshot = tweens.stats.snapshot()
+        self.assertEqual(sorted(snapshot), sorted([MAIN, 'inner', 'outer']))
+        for stat in snapshot.values():
+            self.assertEqual(stat['count'], 2)
+            self.assertEqual(sum(stat['histogram']), 2)
+        # every chain built by the same object shares its statistics
+        stats = tweens.stats
+        tweens(main, registry)
+        self.assertTrue(tweens.stats is stats)
+
+    def test___call___stats_enabled_no_tweens(self):
+        from pyramid.tweens import MAIN
+        tweens = self._makeOne()
+        registry = DummyRegistry({
+            'pyramid.tween_stats': 'true',
+            'pyramid.tween_stats_file': '/tmp/stats.json',
+            'pyramid.tween_stats_interval': '5',
+            })
+        def main(request):
+            raise KeyError
+        handler = tweens(main, registry)
+        dumps = []
+        tweens.stats.maybe_dump = lambda: dumps.append(True)
+        self.assertRaises(KeyError, handler, DummyRequest())
+        self.assertEqual(tweens.stats.snapshot()[MAIN]['count'], 1)
+        self.assertEqual(tweens.stats.path, '/tmp/stats.json')
+        self.assertEqual(tweens.stats.interval, 5)
+        self.assertEqual(dumps, [True])
+
     def test_implicit_ordering_1(self):
         tweens = self._makeOne()
         tweens.add_implicit('name1', 'factory1')
@@ -408,3 +472,10 @@ class TestTweens(unittest.TestCase):
         add('dbt', 'dbt_factory', under='browserid', over='auth')
         self.assertRaises(CyclicDependencyError, tweens.implicit)
 
+class DummyRegistry(object):
+    def __init__(self, settings):
+        self.settings = settings
+
+class DummyRequest(object):
+    def __init__(self):
+        self.seen = []
@@ -4015,6 +4015,105 @@ class TestStaticURLInfo(unittest.TestCase):
         request.route_url = route_url
         inst.generate('package:path/abc', request)
 
+    def test_generate_longest_spec_wins(self):
+        inst = self._makeOne()
+        registrations = [
+            ('http://example.com/a/', 'package:path/', None, None),
+            ('http://example.com/b/', 'package:path/sub/', None, None)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        self.assertEqual(inst.generate('package:path/sub/abc', request),
+                         'http://example.com/b/abc')
+        self.assertEqual(inst.generate('package:path/abc', request),
+                         'http://example.com/a/abc')
+
+    def test_generate_scheme_relative_url(self):
+        inst = self._makeOne()
+        registrations = [('//example.com/', 'package:path/', None, None)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        request.environ['wsgi.url_scheme'] = 'https'
+        result = inst.generate('package:path/abc', request)
+        self.assertEqual(result, 'https://example.com/abc')
+
+    def test_generate_url_dot_segments(self):
+        inst = self._makeOne()
+        registrations = [('http://example.com/foo/', 'package:path/', None,
+                          None)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        result = inst.generate('package:path/../abc', request)
+        self.assertEqual(result, 'http://example.com/abc')
+
+    def test_generate_index_cached(self):
+        inst = self._makeOne()
+        registrations = [('http://example.com/a/', 'package:path/', None,
+                          None)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        self.assertEqual(inst.generate('package:path/abc', request),
+                         'http://example.com/a/abc')
+        index = request.registry._static_url_index
+        # changes made behind ``add``'s back are not noticed
+        registrations[0] = ('http://example.com/b/', 'package:path/', None,
+                            None)
+        registry = request.registry
+        request = self._makeRequest()
+        request.registry = registry
+        self.assertEqual(inst.generate('package:path/abc', request),
+                         'http://example.com/a/abc')
+        self.assertTrue(registry._static_url_index is index)
+
+    def test_generate_index_rebuilt_after_add(self):
+        inst = self._makeOne()
+        config = self._makeConfig()
+        inst.add(config, 'http://example.com/a', 'package:path')
+        request = self._makeRequest()
+        request.registry = config.registry
+        self.assertEqual(inst.generate('package:path/abc', request),
+                         'http://example.com/a/abc')
+        inst.add(config, 'http://example.com/a', 'package:other')
+        request = self._makeRequest()
+        request.registry = config.registry
+        self.assertEqual(inst.generate('package:other/abc', request),
+                         'http://example.com/a/abc')
+        self.assertRaises(ValueError, inst.generate, 'package:path/abc',
+                          request)
+
+    def test_generate_memoized_per_request(self):
+        calls = []
+        def cachebust(subpath, kw):
+            calls.append(subpath)
+            return subpath, kw
+        inst = self._makeOne()
+        registrations = [('http://example.com/', 'package:path/', None,
+                          cachebust)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        first = inst.generate('package:path/abc', request, _anchor='a')
+        second = inst.generate('package:path/abc', request, _anchor='a')
+        self.assertEqual(first, 'http://example.com/abc#a')
+        self.assertEqual(second, first)
+        self.assertEqual(calls, ['abc'])
+        inst.generate('package:path/abc', self._makeRequest(), _anchor='a')
+        self.assertEqual(calls, ['abc', 'abc'])
+
+    def test_generate_unhashable_kw_not_memoized(self):
+        calls = []
+        def cachebust(subpath, kw):
+            calls.append(subpath)
+            return subpath, kw
+        inst = self._makeOne()
+        registrations = [('http://example.com/', 'package:path/', None,
+                          cachebust)]
+        inst._get_registrations = lambda *x: registrations
+        request = self._makeRequest()
+        for i in range(2):
+            result = inst.generate('package:path/abc', request,
+                                   _query={'a': '1'})
+            self.assertEqual(result, 'http://example.com/abc?a=1')
+        self.assertEqual(calls, ['abc', 'abc'])
+
     def test_add_already_exists(self):
         inst = self._makeOne()
         config = self._makeConfig(
@@ -4104,6 +4203,21 @@ class TestStaticURLInfo(unittest.TestCase):
         self.assertEqual(config.view_kw['renderer'],
                          'mypackage:templates/index.pt')
 
+    def test_add_viewname_with_file_cache(self):
+        from pyramid.static import FileCache
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', file_cache=True)
+        self.assertEqual(config.view_kw['view'].file_cache.__class__,
+                         FileCache)
+
+    def test_add_viewname_with_precompressed(self):
+        config = self._makeConfig()
+        inst = self._makeOne()
+        inst.add(config, 'view', 'anotherpackage:path', precompressed=('gzip',))
+        self.assertEqual(config.view_kw['view'].precompressed,
+                         (('gzip', '.gz'),))
+
     def test_add_cachebust_default(self):
         config = self._makeConfig()
         inst = self._makeOne()
@@ -53,6 +53,15 @@ class UrlEncodeTests(unittest.TestCase):
         result = self._callFUT([('a', '1'), ('b', None), ('c', None)])
         self.assertEqual(result, 'a=1&b=&c=')
 
+    def test_empty_sequence_value(self):
+        result = self._callFUT([('a', []), ('b', 2)])
+        self.assertEqual(result, 'b=2')
+
+    def test_same_as_stdlib(self):
+        from pyramid.compat import url_encode
+        query = [('a b', 'c&d'), ('e', 'f~g.h-i_j'), ('k', '/?#')]
+        self.assertEqual(self._callFUT(query), url_encode(query))
+
 class URLQuoteTests(unittest.TestCase):
     def _callFUT(self, val, safe=''):
         from pyramid.encode import url_quote
@@ -73,7 +82,69 @@ class URLQuoteTests(unittest.TestCase):
         result = self._callFUT(la, '/')
         self.assertEqual(result, 'La/Pe%C3%B1a')
 
+    def test_it_with_bytes_safe(self):
+        self.assertEqual(self._callFUT('a/b:c', b'/'), 'a/b%3Ac')
+        self.assertEqual(self._callFUT(b'a/b:c', b'/'), 'a/b%3Ac')
+        self.assertEqual(self._callFUT(42, b'/'), '42')
+
+    def test_it_with_nonascii_safe(self):
+        from pyramid.compat import url_quote
+        val = text_(b'\xc3\xa9', 'utf-8')
+        safe = text_(b'/\xc3\xa9', 'utf-8')
+        self.assertEqual(self._callFUT(native_(val, 'utf-8'), safe),
+                         url_quote(val.encode('utf-8'), safe=safe))
+
     def test_it_with_nonstr_nonbinary(self):
         la = None
         result = self._callFUT(la, '/')
         self.assertEqual(result, 'None')
+
+    def test_it_safe_native_returned_unchanged(self):
+        val = 'abc-1.2_3'
+        self.assertTrue(self._callFUT(val) is val)
+
+    def test_it_safe_chars(self):
+        self.assertEqual(self._callFUT('a/b:c', '/:'), 'a/b:c')
+        self.assertEqual(self._callFUT('a/b:c', '/'), 'a/b%3Ac')
+
+    def test_it_same_as_stdlib(self):
+        from pyramid.compat import url_quote
+        for val in ('~tilde', 'a b', '%41', 'x+y', ''):
+            self.assertEqual(self._callFUT(val), url_quote(val, safe=''))
+
+    def test_it_int(self):
+        self.assertEqual(self._callFUT(42), '42')
+
+    def test_it_cached(self):
+        from pyramid.encode import _quote_cache
+        val = text_(b'caf\xc3\xa9 cached', 'utf-8')
+        result = self._callFUT(val)
+        self.assertEqual(result, 'caf%C3%A9%20cached')
+        self.assertEqual(_quote_cache.get((val, '')), result)
+
+class QuotePlusTests(unittest.TestCase):
+    def _callFUT(self, val, safe=''):
+        from pyramid.encode import quote_plus
+        return quote_plus(val, safe)
+
+    def test_it_spaces(self):
+        self.assertEqual(self._callFUT('a b'), 'a+b')
+
+    def test_it_space_in_safe(self):
+        from pyramid.compat import url_quote_plus
+        self.assertEqual(self._callFUT('a b', ' '),
+                         url_quote_plus('a b', safe=' '))
+
+    def test_it_safe_native_returned_unchanged(self):
+        val = 'abc'
+        self.assertTrue(self._callFUT(val) is val)
+
+    def test_it_with_bytes_safe(self):
+        self.assertEqual(self._callFUT('a/b c', b'/'), 'a/b+c')
+
+    def test_it_unicode(self):
+        la = text_(b'La Pe\xc3\xb1a', 'utf-8')
+        self.assertEqual(self._callFUT(la), 'La+Pe%C3%B1a')
+
+    def test_it_bytes(self):
+        self.assertEqual(self._callFUT(b'a&b'), 'a%26b')
@@ -0,0 +1,636 @@
+import unittest
+
+class TestLatencyStats(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.profiling import LatencyStats
+        return LatencyStats(*arg, **kw)
+
+    def test_add_and_snapshot(self):
+        stats = self._makeOne()
+        stats.add(('a', 1), 0.002)
+        stats.add(('a', 1), 0.0005)
+        stat = stats.snapshot()[('a', 1)]
+        self.assertEqual(stat['count'], 2)
+        self.assertAlmostEqual(stat['total'], 0.0025)
+        self.assertEqual(stat['max'], 0.002)
+        self.assertEqual(stat['histogram'][stats.bounds.index(0.0025)], 1)
+        self.assertEqual(stat['histogram'][stats.bounds.index(0.0005)], 1)
+
+    def test_dump_data(self):
+        stats = self._makeOne()
+        stats.add('a', 0.002)
+        data = stats.dump_data()
+        self.assertEqual(data['bounds'], list(stats.bounds))
+        self.assertEqual(data['stats']['a']['count'], 1)
+
+class Test__write_atomically(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _callFUT(self, path, write):
+        from pyramid.profiling import _write_atomically
+        return _write_atomically(path, write)
+
+    def test_it(self):
+        import os
+        path = os.path.join(self.tmp, 'out')
+        def write(tmp):
+            with open(tmp, 'w') as f:
+                f.write('data')
+        self._callFUT(path, write)
+        self._callFUT(path, write)
+        with open(path) as f:
+            self.assertEqual(f.read(), 'data')
+        self.assertEqual(os.listdir(self.tmp), ['out'])
+
+    def test_error_removes_temporary_file(self):
+        import os
+        def write(tmp):
+            raise ValueError
+        self.assertRaises(ValueError, self._callFUT,
+                          os.path.join(self.tmp, 'out'), write)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_base_exception_not_caught(self):
+        import os
+        def write(tmp):
+            raise KeyboardInterrupt
+        self.assertRaises(KeyboardInterrupt, self._callFUT,
+                          os.path.join(self.tmp, 'out'), write)
+
+class Test_view_description(unittest.TestCase):
+    def _callFUT(self, view):
+        from pyramid.profiling import view_description
+        return view_description(view)
+
+    def test_function(self):
+        def aview(request): pass
+        self.assertEqual(self._callFUT(aview), __name__ + '.aview')
+
+    def test_derived(self):
+        def aview(request): pass
+        def wrapper(context, request): pass
+        wrapper.__original_view__ = aview
+        self.assertEqual(self._callFUT(wrapper), __name__ + '.aview')
+
+    def test_instance(self):
+        self.assertEqual(self._callFUT(DummyView()),
+                         __name__ + '.DummyView')
+
+class TestRequestProfiler(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.profiling import RequestProfiler
+        return RequestProfiler(*arg, **kw)
+
+    def test_conforms_to_IRequestProfiler(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IRequestProfiler
+        verifyObject(IRequestProfiler, self._makeOne())
+
+    def test_record(self):
+        profiler = self._makeOne()
+        request = DummyRequest()
+        request.matched_route = DummyRoute('home')
+        view = DummyView()
+        profiler.record(request, 'traversal', 1.0, 1.5)
+        profiler.record(request, 'view_call', 1.5, 1.75, view)
+        profiler.record(None, 'render', 2.0, 2.25, view)
+        snapshot = profiler.snapshot()
+        self.assertEqual(sorted(snapshot, key=str), [
+            ('render', None, __name__ + '.DummyView'),
+            ('traversal', 'home', None),
+            ('view_call', 'home', __name__ + '.DummyView'),
+            ])
+        self.assertEqual(snapshot[('traversal', 'home', None)]['total'], 0.5)
+
+    def test_record_dumps(self):
+        profiler = self._makeOne('/tmp/profile.json')
+        dumps = []
+        profiler.maybe_dump = lambda: dumps.append(True)
+        profiler.record(DummyRequest(), 'traversal', 1.0, 1.5)
+        self.assertEqual(dumps, [True])
+
+    def test_dump_data(self):
+        profiler = self._makeOne()
+        request = DummyRequest()
+        profiler.record(request, 'view_lookup', 1.0, 1.5)
+        request.matched_route = DummyRoute('home')
+        profiler.record(request, 'traversal', 1.0, 1.5)
+        data = profiler.dump_data()
+        self.assertEqual(data['bounds'], list(profiler.bounds))
+        self.assertEqual(
+            [(s['phase'], s['route'], s['view'], s['count'])
+             for s in data['stats']],
+            [('traversal', 'home', None, 1), ('view_lookup', None, None, 1)])
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _makeOne(self, **kw):
+        from pyramid.profiling import SamplingProfiler
+        return SamplingProfiler(self.tmp, **kw)
+
+    def _makeProfile(self):
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+        sorted(range(10))
+        profile.disable()
+        return profile
+
+    def _listdir(self):
+        import os
+        return sorted(os.listdir(self.tmp))
+
+    def test_wanted_sample(self):
+        profiler = self._makeOne(sample=3)
+        request = DummyRequest()
+        self.assertEqual([profiler.wanted(request) for i in range(6)],
+                         [False, False, True, False, False, True])
+
+    def test_wanted_no_sample(self):
+        profiler = self._makeOne(sample=0)
+        self.assertFalse(profiler.wanted(DummyRequest()))
+
+    def test_wanted_header(self):
+        profiler = self._makeOne(sample=0, header='X-Profile')
+        request = DummyRequest()
+        request.headers = {}
+        self.assertFalse(profiler.wanted(request))
+        request.headers = {'X-Profile': '1'}
+        self.assertTrue(profiler.wanted(request))
+
+    def test_route_wanted(self):
+        profiler = self._makeOne(sample=0, routes=['home'])
+        request = DummyRequest()
+        self.assertFalse(profiler.route_wanted(request))
+        request.matched_route = DummyRoute('other')
+        self.assertFalse(profiler.route_wanted(request))
+        request.matched_route = DummyRoute('home')
+        self.assertTrue(profiler.route_wanted(request))
+
+    def test_route_candidate(self):
+        request = DummyRequest()
+        mapper = DummyMapper('home')
+        profiler = self._makeOne(sample=0, routes=['home'],
+                                 routes_mapper=mapper)
+        self.assertTrue(profiler.route_candidate(request))
+        self.assertEqual(mapper.requests, [request])
+        mapper.route = DummyRoute('other')
+        self.assertFalse(profiler.route_candidate(request))
+        mapper.route = None
+        self.assertFalse(profiler.route_candidate(request))
+
+    def test_route_candidate_no_routes(self):
+        mapper = DummyMapper('home')
+        profiler = self._makeOne(sample=0, routes_mapper=mapper)
+        self.assertFalse(profiler.route_candidate(DummyRequest()))
+        self.assertEqual(mapper.requests, [])
+
+    def test_route_candidate_no_mapper(self):
+        profiler = self._makeOne(sample=0, routes=['home'])
+        self.assertFalse(profiler.route_candidate(DummyRequest()))
+
+    def test_save_and_rotate(self):
+        import pstats
+        import os
+        profiler = self._makeOne(keep=2)
+        request = DummyRequest()
+        request.matched_route = DummyRoute('a/b')
+        for i in range(3):
+            profiler.save(request, self._makeProfile(), 0.1534)
+        names = self._listdir()
+        self.assertEqual(len(names), 2)
+        for name in names:
+            self.assertTrue(name.startswith('request-'))
+            self.assertTrue(name.endswith('-a_b-153ms.prof'))
+        pstats.Stats(os.path.join(self.tmp, names[0]))
+
+    def test_save_no_route(self):
+        profiler = self._makeOne()
+        profiler.save(DummyRequest(), self._makeProfile(), 0.002)
+        name, = self._listdir()
+        self.assertTrue(name.endswith('-_-2ms.prof'))
+
+    def test_save_aggregate(self):
+        import pstats
+        import os
+        profiler = self._makeOne(aggregate=3600)
+        request = DummyRequest()
+        request.matched_route = DummyRoute('home')
+        profiler.save(request, self._makeProfile(), 0.1)
+        profiler.save(request, self._makeProfile(), 0.1)
+        profiler.save(DummyRequest(), self._makeProfile(), 0.1)
+        self.assertEqual(self._listdir(), [])
+        profiler.window_start -= 3600
+        profiler.save(request, self._makeProfile(), 0.1)
+        names = self._listdir()
+        self.assertEqual(len(names), 2)
+        self.assertTrue(names[0].endswith('-_-1req.prof'))
+        self.assertTrue(names[1].endswith('-home-3req.prof'))
+        stats = pstats.Stats(os.path.join(self.tmp, names[1]))
+        self.assertTrue(stats.total_calls > 0)
+        self.assertEqual(profiler.aggregates, {})
+
+    def test_flush_nothing(self):
+        profiler = self._makeOne(aggregate=1)
+        profiler.flush()
+        self.assertEqual(self._listdir(), [])
+
+class Test_profiler_tween_factory(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _callFUT(self, handler, registry):
+        from pyramid.profiling import profiler_tween_factory
+        return profiler_tween_factory(handler, registry)
+
+    def _makeRegistry(self, **settings):
+        from pyramid.registry import Registry
+        registry = Registry()
+        registry.settings = settings
+        return registry
+
+    def test_no_directory(self):
+        from pyramid.exceptions import ConfigurationError
+        self.assertRaises(ConfigurationError, self._callFUT, None,
+                          self._makeRegistry())
+
+    def test_creates_directory(self):
+        import os
+        directory = os.path.join(self.tmp, 'profiles')
+        self._callFUT(None, self._makeRegistry(**{
+            'pyramid.profile_directory': directory}))
+        self.assertTrue(os.path.isdir(directory))
+
+    def test_settings(self):
+        registry = self._makeRegistry(**{
+            'pyramid.profile_directory': self.tmp,
+            'pyramid.profile_sample': '0',
+            'pyramid.profile_routes': 'a b',
+            'pyramid.profile_header': 'X-Profile',
+            'pyramid.profile_keep': '5',
+            'pyramid.profile_aggregate': '60',
+            })
+        profiler = self._callFUT(None, registry).profiler
+        self.assertEqual(profiler.directory, self.tmp)
+        self.assertEqual(profiler.sample, 0)
+        self.assertEqual(profiler.routes, frozenset(['a', 'b']))
+        self.assertEqual(profiler.header, 'X-Profile')
+        self.assertEqual(profiler.keep, 5)
+        self.assertEqual(profiler.aggregate, 60.0)
+        self.assertEqual(profiler.routes_mapper, None)
+
+    def test_it(self):
+        import os
+        registry = self._makeRegistry(**{
+            'pyramid.profile_directory': self.tmp,
+            'pyramid.profile_sample': '2',
+            })
+        def handler(request):
+            return 'response'
+        tween = self._callFUT(handler, registry)
+        self.assertEqual(tween(DummyRequest()), 'response')
+        self.assertEqual(os.listdir(self.tmp), [])
+        self.assertEqual(tween(DummyRequest()), 'response')
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+
+    def test_routes(self):
+        import os
+        import sys
+        from pyramid.interfaces import IRoutesMapper
+        registry = self._makeRegistry(**{
+            'pyramid.profile_directory': self.tmp,
+            'pyramid.profile_sample': '0',
+            'pyramid.profile_routes': 'home',
+            })
+        mapper = DummyMapper(None)
+        registry.registerUtility(mapper, IRoutesMapper)
+        profiled = []
+        def handler(request):
+            profiled.append(sys.getprofile() is not None)
+            request.matched_route = DummyRoute(request.route_name)
+            return 'response'
+        tween = self._callFUT(handler, registry)
+        # the mapper matches no profiled route: the request isn't profiled
+        request = DummyRequest()
+        request.route_name = 'other'
+        self.assertEqual(tween(request), 'response')
+        self.assertEqual(profiled, [False])
+        self.assertEqual(os.listdir(self.tmp), [])
+        # the mapper and the router agree
+        mapper.route = DummyRoute('home')
+        request = DummyRequest()
+        request.route_name = 'home'
+        self.assertEqual(tween(request), 'response')
+        self.assertEqual(profiled, [False, True])
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+        self.assertTrue('-home-' in os.listdir(self.tmp)[0])
+        # the router matched another route: the profile is discarded
+        request = DummyRequest()
+        request.route_name = 'other'
+        self.assertEqual(tween(request), 'response')
+        self.assertEqual(profiled, [False, True, True])
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+
+    def test_handler_raises(self):
+        import os
+        registry = self._makeRegistry(**{
+            'pyramid.profile_directory': self.tmp,
+            'pyramid.profile_sample': '1',
+            })
+        def handler(request):
+            raise ValueError
+        tween = self._callFUT(handler, registry)
+        self.assertRaises(ValueError, tween, DummyRequest())
+        self.assertEqual(len(os.listdir(self.tmp)), 1)
+
+class TestSlowRequestDetector(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from pyramid.profiling import SlowRequestDetector
+        detector = SlowRequestDetector(**kw)
+        self.addCleanup(detector.stop)
+        return detector
+
+    def test_fast_request(self):
+        logger = DummyLogger()
+        detector = self._makeOne(threshold=3600, logger=logger)
+        token = detector.begin(DummyRequest())
+        self.assertEqual(len(detector.active), 1)
+        detector.sample()
+        detector.end(token)
+        self.assertEqual(detector.active, {})
+        self.assertEqual(logger.messages, [])
+
+    def test_slow_request(self):
+        logger = DummyLogger()
+        detector = self._makeOne(threshold=0, interval=3600, logger=logger)
+        request = DummyRequest()
+        request.url = 'http://example.com/'
+        request.matched_route = DummyRoute('home')
+        request.view_name = 'edit'
+        token = detector.begin(request)
+        detector.sample()
+        detector.sample()
+        detector.end(token)
+        self.assertEqual(len(logger.messages), 1)
+        message = logger.messages[0]
+        self.assertTrue(message.startswith(
+            'slow request for url http://example.com/; duration: '))
+        self.assertTrue("route_name: 'home', view_name: 'edit'; "
+                        "2 stack sample(s):" in message)
+        self.assertTrue('test_slow_request' in message)
+
+    def test_max_samples(self):
+        logger = DummyLogger()
+        detector = self._makeOne(threshold=0, interval=3600, logger=logger,
+                                 max_samples=1)
+        token = detector.begin(DummyRequest())
+        detector.sample() # distinct stacks, from different lines
+        detector.sample()
+        self.assertEqual(len(token[1][2]), 1)
+        detector.end(token)
+        self.assertTrue("route_name: None, view_name: None; "
+                        "1 stack sample(s):" in logger.messages[0])
+
+    def test_nested_requests(self):
+        detector = self._makeOne(threshold=3600)
+        outer = detector.begin(DummyRequest())
+        inner = detector.begin(DummyRequest())
+        detector.end(inner)
+        self.assertTrue(list(detector.active.values())[0] is outer[1])
+        detector.end(outer)
+        self.assertEqual(detector.active, {})
+
+    def test_no_logger(self):
+        detector = self._makeOne(threshold=0, interval=3600)
+        token = detector.begin(DummyRequest())
+        detector.sample()
+        detector.end(token) # does not fail
+
+    def test_watchdog(self):
+        import time
+        logger = DummyLogger()
+        detector = self._makeOne(threshold=0, interval=0.001, logger=logger)
+        token = detector.begin(DummyRequest())
+        self.assertTrue(detector.thread.daemon)
+        for i in range(1000):
+            if token[1][2]:
+                break
+            time.sleep(0.001)
+        detector.end(token)
+        self.assertEqual(len(logger.messages), 1)
+        detector.stop()
+        self.assertFalse(detector.thread.is_alive())
+
+class Test_slow_request_tween_factory(unittest.TestCase):
+    def _callFUT(self, handler, registry):
+        from pyramid.profiling import slow_request_tween_factory
+        tween = slow_request_tween_factory(handler, registry)
+        self.addCleanup(tween.detector.stop)
+        return tween
+
+    def _makeRegistry(self, **settings):
+        from pyramid.interfaces import IDebugLogger
+        from pyramid.registry import Registry
+        registry = Registry()
+        registry.settings = settings
+        self.logger = DummyLogger()
+        registry.registerUtility(self.logger, IDebugLogger)
+        return registry
+
+    def test_defaults(self):
+        detector = self._callFUT(None, self._makeRegistry()).detector
+        self.assertEqual(detector.threshold, 1.0)
+        self.assertEqual(detector.interval, 0.1)
+        self.assertTrue(detector.logger is self.logger)
+
+    def test_it(self):
+        registry = self._makeRegistry(**{
+            'pyramid.slow_request_threshold': '0',
+            'pyramid.slow_request_interval': '3600',
+            })
+        def handler(request):
+            tween.detector.sample()
+            raise ValueError
+        tween = self._callFUT(handler, registry)
+        self.assertEqual(tween.detector.threshold, 0)
+        self.assertEqual(tween.detector.interval, 3600)
+        self.assertRaises(ValueError, tween, DummyRequest())
+        self.assertEqual(tween.detector.active, {})
+        self.assertEqual(len(self.logger.messages), 1)
+        self.assertTrue('in handler' in self.logger.messages[0])
+
+class TestMemoryTracker(unittest.TestCase):
+    def setUp(self):
+        import tracemalloc
+        self.was_tracing = tracemalloc.is_tracing()
+
+    def tearDown(self):
+        import tracemalloc
+        if not self.was_tracing:
+            tracemalloc.stop()
+
+    def _makeOne(self, **kw):
+        from pyramid.profiling import MemoryTracker
+        return MemoryTracker(**kw)
+
+    def test_conforms_to_IMemoryTracker(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IMemoryTracker
+        verifyObject(IMemoryTracker, self._makeOne())
+
+    def test_wrap(self):
+        retained = []
+        def handler(request):
+            request.matched_route = DummyRoute('home')
+            request.view_name = 'edit'
+            retained.append(bytearray(1024 * 1024))
+            return 'response'
+        tracker = self._makeOne(top=3)
+        tracked = tracker.wrap(handler)
+        self.assertEqual(tracked(DummyRequest()), 'response')
+        self.assertEqual(tracked(DummyRequest()), 'response')
+        report, = tracker.report()
+        self.assertEqual(report['route'], 'home')
+        self.assertEqual(report['view'], 'edit')
+        self.assertEqual(report['count'], 2)
+        self.assertTrue(report['retained'] >= 2 * 1024 * 1024)
+        self.assertTrue(report['max_retained'] >= 1024 * 1024)
+        self.assertTrue(len(report['top']) <= 3)
+        top = report['top'][0]
+        self.assertTrue(top['site'].startswith(__file__.rstrip('c')))
+        self.assertTrue(top['size'] >= 2 * 1024 * 1024)
+        self.assertTrue(top['count'] >= 2)
+
+    def test_wrap_handler_raises(self):
+        def handler(request):
+            raise ValueError
+        tracker = self._makeOne()
+        dumps = []
+        tracker.maybe_dump = lambda: dumps.append(True)
+        self.assertRaises(ValueError, tracker.wrap(handler), DummyRequest())
+        report, = tracker.report()
+        self.assertEqual((report['route'], report['view']), (None, None))
+        self.assertEqual(dumps, [True])
+
+    def test_report_sorted(self):
+        tracker = self._makeOne()
+        request = DummyRequest()
+        tracker.record(request, [DummyStatisticDiff('a.py', 1, 10, 1)])
+        request.view_name = 'big'
+        tracker.record(request, [DummyStatisticDiff('a.py', 2, 100, 2),
+                                 DummyStatisticDiff('b.py', 1, -5, -1)])
+        tracker.record(request, [DummyStatisticDiff('b.py', 1, 50, 1)])
+        report = tracker.report()
+        self.assertEqual([item['view'] for item in report], ['big', None])
+        self.assertEqual(report[0]['retained'], 145)
+        self.assertEqual(report[0]['max_retained'], 95)
+        self.assertEqual(report[0]['top'], [
+            {'site': 'a.py:2', 'size': 100, 'count': 2},
+            {'site': 'b.py:1', 'size': 45, 'count': 0},
+            ])
+        tracker.reset()
+        self.assertEqual(tracker.report(), [])
+
+    def test_dump(self):
+        import json
+        import os
+        import shutil
+        import tempfile
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'memory.json')
+            tracker = self._makeOne(path=path, interval=0)
+            tracker.record(DummyRequest(),
+                           [DummyStatisticDiff('a.py', 1, 10, 1)])
+            tracker.maybe_dump()
+            with open(path) as f:
+                self.assertEqual(json.load(f), tracker.report())
+        finally:
+            shutil.rmtree(tmp)
+
+class Test_get_memory_tracker(unittest.TestCase):
+    def _callFUT(self, registry):
+        from pyramid.profiling import get_memory_tracker
+        return get_memory_tracker(registry)
+
+    def test_registers_one(self):
+        from pyramid.interfaces import IMemoryTracker
+        from pyramid.registry import Registry
+        registry = Registry()
+        registry.settings = {
+            'pyramid.debug_memory_top': '3',
+            'pyramid.debug_memory_frames': '5',
+            'pyramid.debug_memory_file': '/tmp/memory.json',
+            'pyramid.debug_memory_interval': '60',
+            }
+        tracker = self._callFUT(registry)
+        self.assertTrue(registry.getUtility(IMemoryTracker) is tracker)
+        self.assertEqual(tracker.top, 3)
+        self.assertEqual(tracker.frames, 5)
+        self.assertEqual(tracker.path, '/tmp/memory.json')
+        self.assertEqual(tracker.interval, 60)
+        self.assertTrue(self._callFUT(registry) is tracker)
+
+    def test_defaults(self):
+        from pyramid.registry import Registry
+        tracker = self._callFUT(Registry())
+        self.assertEqual(tracker.top, 10)
+        self.assertEqual(tracker.frames, 1)
+        self.assertEqual(tracker.path, None)
+
+class DummyRequest(object):
+    pass
+
+class DummyRoute(object):
+    def __init__(self, name):
+        self.name = name
+
+class DummyMapper(object):
+    def __init__(self, name):
+        self.route = DummyRoute(name) if name is not None else None
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        return {'route': self.route, 'match': None}
+
+class DummyView(object):
+    def __call__(self, context, request):
+        pass
+
+class DummyLogger(object):
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, msg):
+        self.messages.append(msg)
+
+class DummyFrame(object):
+    def __init__(self, filename, lineno):
+        self.filename = filename
+        self.lineno = lineno
+
+class DummyStatisticDiff(object):
+    def __init__(self, filename, lineno, size_diff, count_diff):
+        self.traceback = [DummyFrame(filename, lineno)]
+        self.size_diff = size_diff
+        self.count_diff = count_diff
+
@@ -22,6 +22,12 @@ class TestRegistry(unittest.TestCase):
         registry._clear_view_lookup_cache()
         self.assertEqual(registry._view_lookup_cache, {})
 
+    def test_clear_subscriber_cache(self):
+        registry = self._makeOne()
+        registry._subscriber_cache[1] = 2
+        registry._clear_subscriber_cache()
+        self.assertEqual(registry._subscriber_cache, {})
+
     def test_package_name(self):
         package_name = 'testing'
         registry = self._getTargetClass()(package_name)
@@ -47,6 +53,179 @@ class TestRegistry(unittest.TestCase):
                                              [IDummyEvent], Interface)
         self.assertEqual(registry.has_listeners, True)
 
+    def test_request_profiler(self):
+        from pyramid.interfaces import IRequestProfiler
+        registry = self._makeOne()
+        self.assertEqual(registry.request_profiler, None)
+        profiler = object()
+        registry.registerUtility(profiler, IRequestProfiler)
+        self.assertTrue(registry.request_profiler is profiler)
+        registry.registerUtility(object(), IDummyEvent)
+        self.assertTrue(registry.request_profiler is profiler)
+        registry.unregisterUtility(profiler, IRequestProfiler)
+        self.assertEqual(registry.request_profiler, None)
+
+    def test_registerHandler_clears_subscriber_cache(self):
+        registry = self._makeOne()
+        registry._subscriber_cache[1] = 2
+        registry.registerHandler(lambda event: None, [IDummyEvent])
+        self.assertEqual(registry._subscriber_cache, {})
+
+    def test_unregisterHandler_clears_subscriber_cache(self):
+        registry = self._makeOne()
+        def f(event): pass
+        registry.registerHandler(f, [IDummyEvent])
+        registry._subscriber_cache[1] = 2
+        registry.unregisterHandler(f, [IDummyEvent])
+        self.assertEqual(registry._subscriber_cache, {})
+
+    def test_registerSubscriptionAdapter_clears_subscriber_cache(self):
+        registry = self._makeOne()
+        from zope.interface import Interface
+        registry._subscriber_cache[1] = 2
+        registry.registerSubscriptionAdapter(DummyEvent,
+                                             [IDummyEvent], Interface)
+        self.assertEqual(registry._subscriber_cache, {})
+
+    def test_unregisterSubscriptionAdapter_clears_subscriber_cache(self):
+        registry = self._makeOne()
+        from zope.interface import Interface
+        registry.registerSubscriptionAdapter(DummyEvent,
+                                             [IDummyEvent], Interface)
+        registry._subscriber_cache[1] = 2
+        registry.unregisterSubscriptionAdapter(DummyEvent,
+                                               [IDummyEvent], Interface)
+        self.assertEqual(registry._subscriber_cache, {})
+
+    def test_has_listeners_for_no_listeners(self):
+        registry = self._makeOne()
+        self.assertEqual(registry.has_listeners_for(DummyEvent), False)
+        self.assertEqual(registry._subscriber_cache, {})
+
+    def test_has_listeners_for_class(self):
+        registry = self._makeOne()
+        registry.registerHandler(lambda event: None, [IDummyEvent])
+        self.assertEqual(registry.has_listeners_for(DummyEvent), True)
+        self.assertEqual(registry._subscriber_cache, {DummyEvent: True})
+        self.assertEqual(registry.has_listeners_for(OtherEvent), False)
+
+    def test_has_listeners_for_interface(self):
+        registry = self._makeOne()
+        registry.registerHandler(lambda event: None, [IDummyEvent])
+        self.assertEqual(registry.has_listeners_for(IDummyEvent), True)
+        self.assertEqual(registry.has_listeners_for(IOtherEvent), False)
+
+    def test_has_listeners_for_catchall_listener(self):
+        from zope.interface import Interface
+        registry = self._makeOne()
+        registry.registerHandler(lambda event: None, [Interface])
+        self.assertEqual(registry.has_listeners_for(OtherEvent), True)
+
+    def test_has_listeners_for_cached(self):
+        registry = self._makeOne()
+        registry.registerHandler(lambda event: None, [IOtherEvent])
+        registry._get_subscriber_cache()[DummyEvent] = True
+        self.assertEqual(registry.has_listeners_for(DummyEvent), True)
+
+    def test_has_listeners_for_base_registration(self):
+        base = self._makeOne()
+        registry = self._getTargetClass()(bases=(base,))
+        registry.registerHandler(lambda event: None, [IOtherEvent])
+        self.assertEqual(registry.has_listeners_for(DummyEvent), False)
+        base.registerHandler(lambda event: None, [IDummyEvent])
+        self.assertEqual(registry.has_listeners_for(DummyEvent), True)
+
+    def test_has_listeners_for_after_registration(self):
+        registry = self._makeOne()
+        registry.registerHandler(lambda event: None, [IOtherEvent])
+        self.assertEqual(registry.has_listeners_for(DummyEvent), False)
+        registry.registerHandler(lambda event: None, [IDummyEvent])
+        self.assertEqual(registry.has_listeners_for(DummyEvent), True)
+
+    def test_notify_no_listeners(self):
+        registry = self._makeOne()
+        registry.notify(DummyEvent())
+        self.assertEqual(registry._subscriber_cache, {})
+
+    def test_notify_calls_handlers_in_order(self):
+        from zope.interface import Interface
+        registry = self._makeOne()
+        L = []
+        registry.registerHandler(lambda e: L.append(('dummy', e)),
+                                 [IDummyEvent])
+        registry.registerHandler(lambda e: L.append(('any', e)), [Interface])
+        registry.registerHandler(lambda e: L.append(('other', e)),
+                                 [IOtherEvent])
+        event = DummyEvent()
+        registry.notify(event)
+        self.assertEqual(L, [('any', event), ('dummy', event)])
+
+    def test_notify_caches_handlers(self):
+        from zope.interface import providedBy
+        registry = self._makeOne()
+        L = []
+        registry.registerHandler(L.append, [IDummyEvent])
+        event = DummyEvent()
+        registry.notify(event)
+        self.assertEqual(registry._subscriber_cache,
+                         {(providedBy(event),): (L.append,)})
+        registry._subscriber_cache[(providedBy(event),)] = ()
+        registry.notify(event)
+        self.assertEqual(L, [event])
+
+    def test_notify_cache_bounded(self):
+        from zope.interface import alsoProvides
+        from zope.interface.interface import InterfaceClass
+        from pyramid import registry as module
+        saved = module._CACHE_SIZE
+        module._CACHE_SIZE = 3
+        self.addCleanup(setattr, module, '_CACHE_SIZE', saved)
+        registry = self._makeOne()
+        L = []
+        registry.registerHandler(L.append, [IDummyEvent])
+        events = []
+        for i in range(5):
+            # each event gets a specification of its own
+            event = DummyEvent()
+            alsoProvides(event, InterfaceClass('IEvent%d' % i))
+            registry.notify(event)
+            events.append(event)
+            self.assertTrue(len(registry._subscriber_cache) <= 3)
+        self.assertEqual(L, events)
+        self.assertEqual(len(registry._subscriber_cache), 2)
+
+    def test_has_listeners_for_cache_bounded(self):
+        from pyramid import registry as module
+        saved = module._CACHE_SIZE
+        module._CACHE_SIZE = 1
+        self.addCleanup(setattr, module, '_CACHE_SIZE', saved)
+        registry = self._makeOne()
+        registry.registerHandler(lambda event: None, [IDummyEvent])
+        self.assertEqual(registry.has_listeners_for(DummyEvent), True)
+        self.assertEqual(registry.has_listeners_for(OtherEvent), False)
+        self.assertEqual(registry._subscriber_cache, {OtherEvent: False})
+
+    def test_notify_after_registration(self):
+        registry = self._makeOne()
+        L = []
+        registry.registerHandler(lambda e: None, [IOtherEvent])
+        event = DummyEvent()
+        registry.notify(event)
+        registry.registerHandler(L.append, [IDummyEvent])
+        registry.notify(event)
+        self.assertEqual(L, [event])
+
+    def test_notify_multiple_events(self):
+        registry = self._makeOne()
+        L = []
+        registry.registerHandler(lambda *events: L.append(events),
+                                 [IDummyEvent, IOtherEvent])
+        registry.registerHandler(L.append, [IDummyEvent])
+        event = DummyEvent()
+        other = OtherEvent()
+        registry.notify(event, other)
+        self.assertEqual(L, [(event, other)])
+
     def test__get_settings(self):
         registry = self._makeOne()
         registry._settings = 'foo'
@@ -57,6 +236,29 @@ class TestRegistry(unittest.TestCase):
         registry.settings = 'foo'
         self.assertEqual(registry._settings, 'foo')
 
+    def test_invalidate_request_property_missing(self):
+        registry = self._makeOne()
+        self.assertRaises(KeyError, registry.invalidate_request_property,
+                          'foo')
+
+    def test_invalidate_request_property_all(self):
+        from pyramid.interfaces import IRequestPropertyCache
+        registry = self._makeOne()
+        cache = DummyRequestPropertyCache()
+        registry.registerUtility(cache, IRequestPropertyCache, name='foo')
+        registry.invalidate_request_property('foo')
+        self.assertEqual(cache.cleared, True)
+        self.assertEqual(cache.invalidated, [])
+
+    def test_invalidate_request_property_key(self):
+        from pyramid.interfaces import IRequestPropertyCache
+        registry = self._makeOne()
+        cache = DummyRequestPropertyCache()
+        registry.registerUtility(cache, IRequestPropertyCache, name='foo')
+        registry.invalidate_request_property('foo', None)
+        self.assertEqual(cache.cleared, False)
+        self.assertEqual(cache.invalidated, [None])
+
 class TestIntrospector(unittest.TestCase):
     def _getTargetClass(slf):
         from pyramid.registry import Introspector
@@ -334,6 +536,17 @@ class TestIntrospectable(unittest.TestCase):
         self.assertEqual(introspector.unrelations,
                          [(('category', 'discrim'), ('category2', 'discrim2'))])
 
+class DummyRequestPropertyCache(object):
+    cleared = False
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, key):
+        self.invalidated.append(key)
+
+    def clear(self):
+        self.cleared = True
+
 class DummyIntrospector(object):
     def __init__(self):
         self.intrs = []
@@ -375,4 +588,10 @@ class IDummyEvent(Interface):
 @implementer(IDummyEvent)
 class DummyEvent(object):
     pass
-    
+
+class IOtherEvent(Interface):
+    pass
+
+@implementer(IOtherEvent)
+class OtherEvent(object):
+    pass
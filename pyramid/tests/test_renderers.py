@@ -222,6 +222,21 @@ class TestRendererHelper(unittest.TestCase):
                            'req': request,}
                          )
 
+    def test_render_view_with_request_profiler(self):
+        from pyramid.interfaces import IRequestProfiler
+        self._registerRendererFactory()
+        self._registerResponseFactory()
+        records = []
+        class DummyProfiler(object):
+            def record(self, request, phase, start, stop, view=None):
+                records.append((request, phase, start <= stop, view))
+        self.config.registry.registerUtility(DummyProfiler(),
+                                             IRequestProfiler)
+        helper = self._makeOne('loo.foo')
+        request = testing.DummyRequest()
+        helper.render_view(request, 'response', 'view', 'context')
+        self.assertEqual(records, [(request, 'render', True, 'view')])
+
     def test_render_explicit_registry(self):
         factory = self._registerRendererFactory()
         class DummyRegistry(object):
@@ -258,6 +273,48 @@ class TestRendererHelper(unittest.TestCase):
         self.assertEqual(result[0], 'values')
         self.assertEqual(result[1], system)
 
+    def test_render_no_before_render_subscribers(self):
+        self._registerRendererFactory()
+        helper = self._makeOne('loo.foo')
+        result = helper.render('values', {'a':1})
+        self.assertEqual(result[1], {'a':1})
+        # renderers are still passed a BeforeRender
+        self.assertEqual(result[1].__class__.__name__, 'BeforeRender')
+        self.assertEqual(result[1].rendering_val, 'values')
+
+    def test_render_before_render_subscriber(self):
+        from pyramid.interfaces import IBeforeRender
+        self._registerRendererFactory()
+        events = []
+        def subscriber(event):
+            event['b'] = 2
+            events.append(event)
+        self.config.add_subscriber(subscriber, IBeforeRender)
+        helper = self._makeOne('loo.foo')
+        result = helper.render('values', {'a':1})
+        self.assertEqual(result[1], {'a':1, 'b':2})
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].rendering_val, 'values')
+
+    def test_render_before_render_subscriber_added_after_render(self):
+        from pyramid.interfaces import IBeforeRender
+        self._registerRendererFactory()
+        helper = self._makeOne('loo.foo')
+        helper.render('values', {})
+        events = []
+        self.config.add_subscriber(events.append, IBeforeRender)
+        helper.render('values', {})
+        self.assertEqual(len(events), 1)
+
+    def test_render_unrelated_subscriber_only(self):
+        from pyramid.interfaces import INewRequest
+        self._registerRendererFactory()
+        events = []
+        self.config.add_subscriber(events.append, INewRequest)
+        helper = self._makeOne('loo.foo')
+        helper.render('values', {})
+        self.assertEqual(events, [])
+
     def test__make_response_request_is_None(self):
         request = None
         helper = self._makeOne('loo.foo')
@@ -510,6 +567,147 @@ class Test_render(unittest.TestCase):
         self.assertEqual(result, '{"a": 1}')
         self.assertFalse('response' in request.__dict__)
 
+class Test_render_cached(unittest.TestCase):
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def _callFUT(self, renderer_name, value, key, **kw):
+        from pyramid.renderers import render_cached
+        return render_cached(renderer_name, value, key, **kw)
+
+    def _registerRenderer(self):
+        renderer = self.config.testing_add_renderer(
+            'pyramid.tests:abc/def.pt')
+        renderer.string_response = 'abc'
+        return renderer
+
+    def _getCache(self):
+        from pyramid.interfaces import IFragmentCache
+        return self.config.registry.getUtility(IFragmentCache)
+
+    def test_miss_renders_and_stores(self):
+        renderer = self._registerRenderer()
+        result = self._callFUT('abc/def.pt', dict(a=1), 'k')
+        self.assertEqual(result, 'abc')
+        renderer.assert_(a=1)
+        cache = self._getCache()
+        self.assertEqual(
+            cache.get(None, ('pyramid.tests', 'abc/def.pt', 'k')), 'abc')
+
+    def test_hit_does_not_render(self):
+        renderer = self._registerRenderer()
+        self._callFUT('abc/def.pt', dict(a=1), 'k')
+        renderer.string_response = 'def'
+        result = self._callFUT('abc/def.pt', dict(a=2), 'k')
+        self.assertEqual(result, 'abc')
+        self.assertEqual(self._getCache().stats()['hits'], 1)
+
+    def test_distinct_keys(self):
+        renderer = self._registerRenderer()
+        self._callFUT('abc/def.pt', dict(a=1), 'k1')
+        renderer.string_response = 'def'
+        result = self._callFUT('abc/def.pt', dict(a=2), 'k2')
+        self.assertEqual(result, 'def')
+
+    def test_namespace_invalidation(self):
+        renderer = self._registerRenderer()
+        self._callFUT('abc/def.pt', dict(a=1), 'k', namespace='nav')
+        self._getCache().invalidate('nav')
+        renderer.string_response = 'def'
+        result = self._callFUT('abc/def.pt', dict(a=2), 'k', namespace='nav')
+        self.assertEqual(result, 'def')
+
+    def test_with_request_uses_request_registry(self):
+        from pyramid.interfaces import IFragmentCache
+        self._registerRenderer()
+        cache = DummyFragmentCache()
+        self.config.registry.registerUtility(cache, IFragmentCache)
+        request = testing.DummyRequest()
+        request.registry = self.config.registry
+        result = self._callFUT('abc/def.pt', dict(a=1), 'k', request=request,
+                               ttl=5)
+        self.assertEqual(result, 'abc')
+        self.assertEqual(cache.stored,
+                         [(None, ('pyramid.tests', 'abc/def.pt', 'k'),
+                           'abc', 5)])
+
+    def test_no_cache_registered(self):
+        from pyramid.interfaces import IFragmentCache
+        renderer = self._registerRenderer()
+        self.config.registry.unregisterUtility(self._getCache(),
+                                               IFragmentCache)
+        self._callFUT('abc/def.pt', dict(a=1), 'k')
+        renderer.string_response = 'def'
+        result = self._callFUT('abc/def.pt', dict(a=2), 'k')
+        self.assertEqual(result, 'def')
+        self.assertEqual(
+            self.config.registry.queryUtility(IFragmentCache), None)
+
+class TestFragmentCache(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.renderers import FragmentCache
+        return FragmentCache(*arg, **kw)
+
+    def test_conforms_to_IFragmentCache(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IFragmentCache
+        verifyObject(IFragmentCache, self._makeOne())
+
+    def test_get_miss(self):
+        cache = self._makeOne()
+        self.assertEqual(cache.get(None, 'k', 'default'), 'default')
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_set_and_get(self):
+        cache = self._makeOne()
+        cache.set(None, 'k', 'v')
+        self.assertEqual(cache.get(None, 'k'), 'v')
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_namespaces_are_distinct(self):
+        cache = self._makeOne()
+        cache.set('a', 'k', 'v')
+        self.assertEqual(cache.get('b', 'k'), None)
+
+    def test_ttl_expired(self):
+        cache = self._makeOne()
+        cache.set(None, 'k', 'v', ttl=-1)
+        self.assertEqual(cache.get(None, 'k'), None)
+
+    def test_default_ttl(self):
+        cache = self._makeOne(default_ttl=-1)
+        cache.set(None, 'k', 'v')
+        self.assertEqual(cache.get(None, 'k'), None)
+
+    def test_max_entries(self):
+        cache = self._makeOne(max_entries=1)
+        cache.set(None, 'k1', 'v1')
+        cache.set(None, 'k2', 'v2')
+        self.assertEqual(cache.get(None, 'k1'), None)
+        self.assertEqual(cache.get(None, 'k2'), 'v2')
+
+    def test_invalidate_namespace(self):
+        cache = self._makeOne()
+        cache.set('a', 'k', 'v')
+        cache.set('b', 'k', 'v')
+        cache.invalidate('a')
+        self.assertEqual(cache.get('a', 'k'), None)
+        self.assertEqual(cache.get('b', 'k'), 'v')
+        cache.set('a', 'k', 'v2')
+        self.assertEqual(cache.get('a', 'k'), 'v2')
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+    def test_invalidate_all(self):
+        cache = self._makeOne()
+        cache.set('a', 'k', 'v')
+        cache.set(None, 'k', 'v')
+        cache.invalidate()
+        self.assertEqual(cache.get('a', 'k'), None)
+        self.assertEqual(cache.get(None, 'k'), None)
+
 class Test_render_to_response(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -723,3 +921,13 @@ class DummyResponse:
         self.body = val.encode('utf8')
     text = property(fset=_set_text)
 
+
+class DummyFragmentCache(object):
+    def __init__(self):
+        self.stored = []
+
+    def get(self, namespace, key, default=None):
+        return default
+
+    def set(self, namespace, key, value, ttl=None):
+        self.stored.append((namespace, key, value, ttl))
@@ -179,6 +179,20 @@ class TestRequest(unittest.TestCase):
         inst.add_finished_callback(callback)
         self.assertEqual(list(inst.finished_callbacks), [callback, callback])
 
+    def test_add_finished_callback_background(self):
+        from pyramid.interfaces import IBackgroundExecutor
+        from pyramid.registry import Registry
+        inst = self._makeOne()
+        inst.registry = Registry()
+        executor = DummyExecutor()
+        inst.registry.registerUtility(executor, IBackgroundExecutor)
+        def callback(request):
+            """ """
+        inst.add_finished_callback(callback, background=True)
+        self.assertEqual(executor.submitted, [])
+        inst._process_finished_callbacks()
+        self.assertEqual(executor.submitted, [(callback, (inst,))])
+
     def test__process_finished_callbacks(self):
         inst = self._makeOne()
         def callback1(request):
@@ -293,6 +307,20 @@ class TestRequest(unittest.TestCase):
         request.registry.registerAdapter(adapter, (Foo,), IResponse)
         self.assertEqual(request.is_response(foo), True)
 
+    def test_render_cached(self):
+        from pyramid.interfaces import IFragmentCache
+        renderer = self.config.testing_add_renderer(
+            'pyramid.tests:abc/def.pt')
+        renderer.string_response = 'abc'
+        inst = self._makeOne()
+        inst.registry = self.config.registry
+        result = inst.render_cached('abc/def.pt', {'a':1}, 'k')
+        self.assertEqual(result, 'abc')
+        renderer.assert_(request=inst)
+        cache = self.config.registry.getUtility(IFragmentCache)
+        self.assertEqual(
+            cache.get(None, ('pyramid.tests', 'abc/def.pt', 'k')), 'abc')
+
     def test_json_body_invalid_json(self):
         request = self._makeOne({'REQUEST_METHOD':'POST'})
         request.body = b'{'
@@ -435,6 +463,84 @@ class Test_call_app_with_subpath_as_path_info(unittest.TestCase):
         self.assertEqual(request.environ['SCRIPT_NAME'], '/' + encoded)
         self.assertEqual(request.environ['PATH_INFO'], '/' + encoded)
 
+class TestRequestPropertyCache(unittest.TestCase):
+    def _makeOne(self, key=lambda r: r.key, maxsize=1000, timeout=None):
+        from pyramid.request import RequestPropertyCache
+        return RequestPropertyCache(key, maxsize, timeout)
+
+    def _makeRequest(self, key):
+        request = DummyRequest()
+        request.key = key
+        return request
+
+    def _makeFunction(self):
+        calls = []
+        def fn(request):
+            calls.append(request)
+            return request.key * 2
+        return fn, calls
+
+    def test_conforms_to_IRequestPropertyCache(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import IRequestPropertyCache
+        verifyObject(IRequestPropertyCache, self._makeOne())
+
+    def test_wrap_caches_by_key(self):
+        cache = self._makeOne()
+        fn, calls = self._makeFunction()
+        cached = cache.wrap(fn)
+        self.assertEqual(cached(self._makeRequest(1)), 2)
+        self.assertEqual(cached(self._makeRequest(1)), 2)
+        self.assertEqual(cached(self._makeRequest(2)), 4)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 2, 'size': 2})
+
+    def test_wrap_caches_None(self):
+        cache = self._makeOne()
+        calls = []
+        cached = cache.wrap(lambda r: calls.append(r))
+        cached(self._makeRequest(1))
+        cached(self._makeRequest(1))
+        self.assertEqual(len(calls), 1)
+
+    def test_bounded(self):
+        cache = self._makeOne(maxsize=1)
+        fn, calls = self._makeFunction()
+        cached = cache.wrap(fn)
+        cached(self._makeRequest(1))
+        cached(self._makeRequest(2))
+        cached(self._makeRequest(1))
+        self.assertEqual(len(calls), 3)
+
+    def test_timeout(self):
+        cache = self._makeOne(timeout=-1)
+        fn, calls = self._makeFunction()
+        cached = cache.wrap(fn)
+        cached(self._makeRequest(1))
+        cached(self._makeRequest(1))
+        self.assertEqual(len(calls), 2)
+
+    def test_invalidate(self):
+        cache = self._makeOne()
+        fn, calls = self._makeFunction()
+        cached = cache.wrap(fn)
+        cached(self._makeRequest(1))
+        cached(self._makeRequest(2))
+        cache.invalidate(1)
+        cached(self._makeRequest(1))
+        cached(self._makeRequest(2))
+        self.assertEqual(len(calls), 3)
+
+    def test_clear(self):
+        cache = self._makeOne()
+        fn, calls = self._makeFunction()
+        cached = cache.wrap(fn)
+        cached(self._makeRequest(1))
+        cache.clear()
+        self.assertEqual(cache.stats()['size'], 0)
+        cached(self._makeRequest(1))
+        self.assertEqual(len(calls), 2)
+
 class Test_apply_request_extensions(unittest.TestCase):
     def setUp(self):
         self.config = testing.setUp()
@@ -475,9 +581,85 @@ class Test_apply_request_extensions(unittest.TestCase):
         self.assertEqual(request.bar, 'bar')
         self.assertEqual(request.foo('abc'), 'abc')
 
+    def test_methods_bound_through_class(self):
+        extensions = self._makeExtensions()
+        request = DummyRequest()
+        self._callFUT(request, extensions=extensions)
+        self.assertEqual(request.foo('abc'), 'abc')
+        self.assertFalse('foo' in request.__dict__)
+        self.assertTrue(isinstance(request, DummyRequest))
+
+    def test_class_cached(self):
+        extensions = self._makeExtensions()
+        request1 = DummyRequest()
+        request2 = DummyRequest()
+        self._callFUT(request1, extensions=extensions)
+        self._callFUT(request2, extensions=extensions)
+        self.assertTrue(request1.__class__ is request2.__class__)
+        self.assertEqual(extensions.classes,
+                         {(DummyRequest, None): request1.__class__})
+
+    def test_reextended_after_version_change(self):
+        extensions = self._makeExtensions()
+        extensions.version = 0
+        request = DummyRequest()
+        self._callFUT(request, extensions=extensions)
+        extensions.methods = {'baz': lambda x: 'baz'}
+        extensions.version = 1
+        self._callFUT(request, extensions=extensions)
+        self.assertEqual(request.baz(), 'baz')
+        self.assertRaises(AttributeError, lambda: request.foo)
+        # the extended class is derived from the original one again
+        self.assertTrue(request.__class__.__bases__[0] is DummyRequest)
+        self.assertEqual(list(extensions.classes), [(DummyRequest, 0),
+                                                    (DummyRequest, 1)])
+
+    def test_already_extended(self):
+        extensions = self._makeExtensions()
+        request = DummyRequest()
+        self._callFUT(request, extensions=extensions)
+        cls = request.__class__
+        self._callFUT(request, extensions=extensions)
+        self.assertTrue(request.__class__ is cls)
+
+    def test_extensions_without_class_cache(self):
+        extensions = self._makeExtensions()
+        del extensions.classes
+        request1 = DummyRequest()
+        request2 = DummyRequest()
+        self._callFUT(request1, extensions=extensions)
+        self._callFUT(request2, extensions=extensions)
+        self.assertEqual(request1.bar, 'bar')
+        self.assertEqual(request2.foo('abc'), 'abc')
+
+    def test_request_interfaces_preserved(self):
+        from pyramid.interfaces import IRequest
+        from pyramid.request import Request
+        from zope.interface import implementedBy
+        extensions = self._makeExtensions()
+        request = Request.blank('/')
+        self._callFUT(request, extensions=extensions)
+        self.assertTrue(IRequest.providedBy(request))
+        self.assertTrue(implementedBy(request.__class__) is
+                        implementedBy(Request))
+
+    def _makeExtensions(self):
+        extensions = Dummy()
+        extensions.methods = {'foo': lambda x, y: y}
+        extensions.descriptors = {'bar': property(lambda x: 'bar')}
+        extensions.classes = {}
+        return extensions
+
 class Dummy(object):
     pass
 
+class DummyExecutor(object):
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
 class Test_subclassing_Request(unittest.TestCase):
     def test_subclass(self):
         from pyramid.interfaces import IRequest
@@ -80,6 +80,82 @@ class TestFileResponse(unittest.TestCase):
         finally:
             response.mimetypes = old_mimetypes
 
+    def _makeRequest(self, **environ):
+        from pyramid.request import Request
+        return Request.blank('/', environ=environ)
+
+    def _call(self, response, request):
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        return start_response, body
+
+    def test_range_request(self):
+        path = self._getPath()
+        request = self._makeRequest(HTTP_RANGE='bytes=1-3')
+        r = self._makeOne(path, request=request)
+        start_response, body = self._call(r, request)
+        self.assertEqual(start_response.status, '206 Partial Content')
+        self.assertEqual(body, b'ell')
+        headers = dict(start_response.headers)
+        self.assertEqual(headers['Content-Range'], 'bytes 1-3/7')
+        self.assertEqual(headers['Content-Length'], '3')
+
+    def test_range_request_open_ended(self):
+        path = self._getPath()
+        request = self._makeRequest(HTTP_RANGE='bytes=4-')
+        r = self._makeOne(path, request=request)
+        start_response, body = self._call(r, request)
+        self.assertEqual(start_response.status, '206 Partial Content')
+        self.assertEqual(body, b'o.\n')
+
+    def test_range_request_suffix(self):
+        path = self._getPath()
+        request = self._makeRequest(HTTP_RANGE='bytes=-2')
+        r = self._makeOne(path, request=request)
+        start_response, body = self._call(r, request)
+        self.assertEqual(body, b'.\n')
+
+    def test_range_request_unsatisfiable(self):
+        path = self._getPath()
+        request = self._makeRequest(HTTP_RANGE='bytes=100-200')
+        r = self._makeOne(path, request=request)
+        start_response, body = self._call(r, request)
+        self.assertEqual(start_response.status,
+                         '416 Requested Range Not Satisfiable')
+
+    def test_range_request_if_range_stale(self):
+        path = self._getPath()
+        request = self._makeRequest(
+            HTTP_RANGE='bytes=1-3',
+            HTTP_IF_RANGE='Thu, 01 Jan 1970 00:00:00 GMT')
+        r = self._makeOne(path, request=request)
+        start_response, body = self._call(r, request)
+        self.assertEqual(start_response.status, '200 OK')
+        self.assertEqual(body, b'Hello.\n')
+
+    def test_range_request_if_range_current(self):
+        path = self._getPath()
+        request = self._makeRequest(HTTP_RANGE='bytes=1-3')
+        r = self._makeOne(path, request=request)
+        request.if_range = r.last_modified
+        start_response, body = self._call(r, request)
+        self.assertEqual(start_response.status, '206 Partial Content')
+        self.assertEqual(body, b'ell')
+
+    def test_range_request_bypasses_file_wrapper(self):
+        from pyramid.response import FileIter
+        path = self._getPath()
+        request = self._makeRequest(HTTP_RANGE='bytes=1-3')
+        request.environ['wsgi.file_wrapper'] = lambda *arg: None
+        r = self._makeOne(path, request=request)
+        self.assertTrue(isinstance(r.app_iter, FileIter))
+        r.app_iter.close()
+
 class TestFileIter(unittest.TestCase):
     def _makeOne(self, file, block_size):
         from pyramid.response import FileIter
@@ -106,6 +182,43 @@ class TestFileIter(unittest.TestCase):
         inst.close()
         self.assertTrue(f.closed)
 
+    def test_app_iter_range(self):
+        f = io.BytesIO(b'abcdefgh')
+        inst = self._makeOne(f, 2)
+        result = inst.app_iter_range(1, 6)
+        self.assertTrue(result is inst)
+        self.assertEqual(list(result), [b'bc', b'de', b'f'])
+
+    def test_app_iter_range_stop_None(self):
+        f = io.BytesIO(b'abcdefgh')
+        inst = self._makeOne(f, 4)
+        self.assertEqual(list(inst.app_iter_range(5, None)), [b'fgh'])
+
+    def test_app_iter_range_no_seek(self):
+        class Unseekable(object):
+            def __init__(self, data):
+                self.f = io.BytesIO(data)
+            def read(self, size):
+                return self.f.read(size)
+        inst = self._makeOne(Unseekable(b'abcdefgh'), 2)
+        self.assertEqual(list(inst.app_iter_range(3, 6)), [b'de', b'f'])
+
+    def test_app_iter_range_no_seek_past_end(self):
+        class Unseekable(object):
+            def __init__(self, data):
+                self.f = io.BytesIO(data)
+            def read(self, size):
+                return self.f.read(size)
+        inst = self._makeOne(Unseekable(b'abc'), 2)
+        self.assertEqual(list(inst.app_iter_range(5, 6)), [])
+
+    def test_fileno(self):
+        class DummyFile(object):
+            def fileno(self):
+                return 42
+        inst = self._makeOne(DummyFile(), 1)
+        self.assertEqual(inst.fileno(), 42)
+
 class Test_patch_mimetypes(unittest.TestCase):
     def _callFUT(self, module):
         from pyramid.response import init_mimetypes
@@ -201,3 +314,10 @@ class DummyVenusian(object):
 
     def attach(self, wrapped, fn, category=None):
         self.attached.append((wrapped, fn, category))
+
+class DummyStartResponse(object):
+    status = None
+    headers = None
+    def __call__(self, status, headers):
+        self.status = status
+        self.headers = headers
@@ -119,6 +119,16 @@ class TestRouter(unittest.TestCase):
         self.assertFalse('debug_notfound' in router.__dict__)
         self.assertFalse('debug_routematch' in router.__dict__)
 
+    def test_ctor_debug_memory(self):
+        from pyramid.interfaces import IMemoryTracker
+        self._registerSettings(debug_memory=True)
+        tracker = DummyMemoryTracker()
+        self.registry.registerUtility(tracker, IMemoryTracker)
+        router = self._makeOne()
+        kind, handler = router.handle_request
+        self.assertEqual(kind, 'tracked')
+        self.assertEqual(handler.__name__, 'excview_tween')
+
     def test_root_policy(self):
         context = DummyContext()
         self._registerTraverserFactory(context)
@@ -134,6 +144,37 @@ class TestRouter(unittest.TestCase):
         router = self._makeOne()
         self.assertEqual(router.request_factory, DummyRequestFactory)
 
+    def test_request_factory_extended(self):
+        from pyramid.interfaces import IRequestFactory
+        from pyramid.interfaces import IRequestExtensions
+        class DummyRequestFactory(object):
+            pass
+        class Extensions(object):
+            def __init__(self):
+                self.methods = {'foo': lambda r: 'foo'}
+                self.descriptors = {}
+                self.classes = {}
+        extensions = Extensions()
+        self.registry.registerUtility(DummyRequestFactory, IRequestFactory)
+        self.registry.registerUtility(extensions, IRequestExtensions)
+        router = self._makeOne()
+        self.assertTrue(issubclass(router.request_factory, DummyRequestFactory))
+        self.assertEqual(router.request_factory().foo(), 'foo')
+        self.assertEqual(extensions.classes,
+                         {(DummyRequestFactory, None): router.request_factory})
+
+    def test_request_factory_function_not_extended(self):
+        from pyramid.interfaces import IRequestFactory
+        from pyramid.interfaces import IRequestExtensions
+        def request_factory(environ): pass
+        class Extensions(object):
+            methods = {}
+            descriptors = {}
+        self.registry.registerUtility(request_factory, IRequestFactory)
+        self.registry.registerUtility(Extensions(), IRequestExtensions)
+        router = self._makeOne()
+        self.assertEqual(router.request_factory, request_factory)
+
     def test_tween_factories(self):
         from pyramid.interfaces import ITweens
         from pyramid.config.tweens import Tweens
@@ -346,6 +387,51 @@ class TestRouter(unittest.TestCase):
         router(environ, start_response)
         self.assertEqual(view.request.foo, 'bar')
 
+    def test_call_with_request_extensions_precomputed_class(self):
+        from pyramid.interfaces import IViewClassifier
+        from pyramid.interfaces import IRequestExtensions
+        context = DummyContext()
+        self._registerTraverserFactory(context)
+        class Extensions(object):
+            def __init__(self):
+                self.methods = {'foo': lambda r: 'bar'}
+                self.descriptors = {}
+                self.classes = {}
+        extensions = Extensions()
+        self.registry.registerUtility(extensions, IRequestExtensions)
+        environ = self._makeEnviron()
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        self._registerView(self.config.derive_view(view), '',
+                           IViewClassifier, None, None)
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        router(environ, start_response)
+        self.assertEqual(view.request.foo(), 'bar')
+        self.assertTrue(view.request.__class__ is router.request_factory)
+        self.assertFalse('foo' in view.request.__dict__)
+
+    def test_call_with_request_method_added_after_router_created(self):
+        from pyramid.interfaces import IViewClassifier
+        context = DummyContext()
+        self._registerTraverserFactory(context)
+        self.config.add_request_method(lambda r: 'foo', 'foo')
+        environ = self._makeEnviron()
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        self._registerView(self.config.derive_view(view), '',
+                           IViewClassifier, None, None)
+        router = self._makeOne()
+        self.config.add_request_method(lambda r: 'bar', 'bar')
+        start_response = DummyStartResponse()
+        router(environ, start_response)
+        self.assertEqual(view.request.foo(), 'foo')
+        self.assertEqual(view.request.bar(), 'bar')
+        base = view.request.__class__._request_extensions_base
+        self.assertTrue(base is router.request_factory._request_extensions_base)
+
     def test_call_view_registered_nonspecific_default_path(self):
         from pyramid.interfaces import IViewClassifier
         context = DummyContext()
@@ -616,6 +702,26 @@ class TestRouter(unittest.TestCase):
         self.assertEqual(response_events[0].request.context, context)
         self.assertEqual(result, response.app_iter)
 
+    def test_call_only_sends_events_with_listeners(self):
+        from pyramid.interfaces import INewRequest
+        from pyramid.interfaces import IViewClassifier
+        from pyramid.events import NewRequest
+        context = DummyContext()
+        self._registerTraverserFactory(context)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        environ = self._makeEnviron()
+        self._registerView(view, '', IViewClassifier, None, None)
+        request_events = self._registerEventListener(INewRequest)
+        notified = []
+        self.registry.notify = lambda *events: notified.extend(events)
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        router(environ, start_response)
+        self.assertEqual([e.__class__ for e in notified], [NewRequest])
+        self.assertEqual(request_events, [])
+
     def test_call_newrequest_evllist_exc_can_be_caught_by_exceptionview(self):
         from pyramid.interfaces import INewRequest
         from pyramid.interfaces import IExceptionViewClassifier
@@ -653,6 +759,49 @@ class TestRouter(unittest.TestCase):
         self.assertEqual(len(router.threadlocal_manager.pushed), 1)
         self.assertEqual(len(router.threadlocal_manager.popped), 1)
 
+    def test_call_with_request_profiler(self):
+        from pyramid.interfaces import IRequestProfiler
+        from pyramid.interfaces import IViewClassifier
+        profiler = DummyProfiler()
+        self.registry.registerUtility(profiler, IRequestProfiler)
+        self._registerRouteRequest('foo')
+        self._connectRoute('foo', 'archives/:action/:article')
+        context = DummyContext()
+        self._registerTraverserFactory(context)
+        response = DummyResponse()
+        response.app_iter = ['Hello world']
+        view = DummyView(response)
+        environ = self._makeEnviron(PATH_INFO='/archives/action1/article1')
+        self._registerView(view, '', IViewClassifier, None, None)
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        result = router(environ, start_response)
+        self.assertEqual(result, ['Hello world'])
+        self.assertEqual(
+            [phase for request, phase, start, stop, view_ in profiler.records],
+            ['route_match', 'root_factory', 'traversal', 'view_lookup',
+             'view_call'])
+        for request, phase, start, stop, view_ in profiler.records:
+            self.assertTrue(request is view.request)
+            self.assertTrue(start <= stop)
+        self.assertEqual(profiler.records[-1][-1], view)
+
+    def test_call_with_request_profiler_no_routes(self):
+        from pyramid.interfaces import IRequestProfiler
+        profiler = DummyProfiler()
+        self.registry.registerUtility(profiler, IRequestProfiler)
+        context = DummyContext()
+        self._registerTraverserFactory(context)
+        router = self._makeOne()
+        start_response = DummyStartResponse()
+        from pyramid.httpexceptions import HTTPNotFound
+        self.assertRaises(HTTPNotFound, router, self._makeEnviron(),
+                          start_response)
+        # the second view lookup is the one of the exception view tween
+        self.assertEqual(
+            [record[1] for record in profiler.records],
+            ['root_factory', 'traversal', 'view_lookup', 'view_lookup'])
+
     def test_call_route_matches_and_has_factory(self):
         from pyramid.interfaces import IViewClassifier
         logger = self._registerLogger()
@@ -1349,3 +1498,15 @@ def exc_raised(exc, func, *arg, **kw):
         raise AssertionError('%s not raised' % exc) # pragma: no cover
 
     
+
+class DummyProfiler(object):
+    def __init__(self):
+        self.records = []
+
+    def record(self, request, phase, start, stop, view=None):
+        self.records.append((request, phase, start, stop, view))
+
+class DummyMemoryTracker(object):
+    def wrap(self, handler):
+        return ('tracked', handler)
+
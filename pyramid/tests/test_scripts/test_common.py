@@ -30,6 +30,23 @@ class TestParseVars(unittest.TestCase):
         self.assertRaises(ValueError, parse_vars, vars)
 
 
+class TestParallelMap(unittest.TestCase):
+    def _callFUT(self, func, items, jobs=None):
+        from pyramid.scripts.common import parallel_map
+        return parallel_map(func, items, jobs)
+
+    def test_single_job(self):
+        result = self._callFUT(abs, iter([-1, 2, -3]), jobs=1)
+        self.assertEqual(result, [1, 2, 3])
+
+    def test_single_item(self):
+        result = self._callFUT(abs, [-1])
+        self.assertEqual(result, [1])
+
+    def test_pool(self):
+        result = self._callFUT(abs, [-1, 2, -3], jobs=2)
+        self.assertEqual(result, [1, 2, 3])
+
 class DummyConfigParser(object):
     def read(self, x):
         pass
@@ -40,4 +57,3 @@ class DummyConfigParser(object):
 class DummyConfigParserModule(object):
     ConfigParser = DummyConfigParser
 
-
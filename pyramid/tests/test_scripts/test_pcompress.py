@@ -0,0 +1,112 @@
+import os
+import unittest
+
+class TestPCompressCommand(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _getTargetClass(self):
+        from pyramid.scripts.pcompress import PCompressCommand
+        return PCompressCommand
+
+    def _makeOne(self, *args):
+        cmd = self._getTargetClass()(['pcompress', '-j', '1'] + list(args))
+        self.out = []
+        cmd.out = self.out.append
+        return cmd
+
+    def _writeFile(self, name, body):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'wb') as f:
+            f.write(body)
+        return path
+
+    def _read(self, path):
+        import gzip
+        f = gzip.open(path, 'rb')
+        try:
+            return f.read()
+        finally:
+            f.close()
+
+    def test_no_args(self):
+        command = self._makeOne()
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(self.out, ['Requires at least one directory argument'])
+
+    def test_not_a_directory(self):
+        path = self._writeFile('a.js', b'')
+        command = self._makeOne(path)
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(self.out, ['Not a directory: %s' % path])
+
+    def test_brotli_unavailable(self):
+        from pyramid.scripts import pcompress
+        command = self._makeOne('-e', 'br', self.tmp)
+        saved = pcompress.brotli
+        pcompress.brotli = None
+        try:
+            result = command.run()
+        finally:
+            pcompress.brotli = saved
+        self.assertEqual(result, 2)
+
+    def test_compresses_matching_files(self):
+        body = b'var a = 1;\n' * 100
+        path = self._writeFile('app.js', body)
+        self._writeFile('image.png', body)
+        self._writeFile('small.css', b'a{}')
+        os.utime(path, (1000, 1000))
+        command = self._makeOne('-e', 'gzip', self.tmp)
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertEqual(self._read(path + '.gz'), body)
+        self.assertEqual(os.stat(path + '.gz').st_mtime, 1000)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.tmp, 'image.png.gz')))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.tmp, 'small.css.gz')))
+        self.assertEqual(self.out[-1], '1 file(s) written')
+
+    def test_up_to_date_siblings_skipped(self):
+        path = self._writeFile('app.js', b'var a = 1;\n' * 100)
+        self._makeOne('-e', 'gzip', self.tmp).run()
+        command = self._makeOne('-e', 'gzip', self.tmp)
+        command.run()
+        self.assertEqual(self.out, ['0 file(s) written'])
+        command = self._makeOne('-e', 'gzip', '--force', self.tmp)
+        command.run()
+        self.assertEqual(self.out[-1], '1 file(s) written')
+        self.assertTrue(os.path.exists(path + '.gz'))
+
+    def test_incompressible_not_written(self):
+        body = os.urandom(1024)
+        self._writeFile('noise.txt', body)
+        command = self._makeOne('-e', 'gzip', self.tmp)
+        command.run()
+        self.assertFalse(os.path.exists(
+            os.path.join(self.tmp, 'noise.txt.gz')))
+        self.assertEqual(self.out[-1], '0 file(s) written')
+
+    def test_extension_option(self):
+        self._writeFile('data.csv', b'a,b,c\n' * 100)
+        command = self._makeOne('-e', 'gzip', '-x', '.csv', self.tmp)
+        command.run()
+        self.assertTrue(os.path.exists(
+            os.path.join(self.tmp, 'data.csv.gz')))
+
+class Test_main(unittest.TestCase):
+    def _callFUT(self, argv):
+        from pyramid.scripts.pcompress import main
+        return main(argv, quiet=True)
+
+    def test_it(self):
+        result = self._callFUT(['pcompress'])
+        self.assertEqual(result, 2)
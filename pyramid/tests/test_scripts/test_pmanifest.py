@@ -0,0 +1,112 @@
+import os
+import unittest
+
+class TestPManifestCommand(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _getTargetClass(self):
+        from pyramid.scripts.pmanifest import PManifestCommand
+        return PManifestCommand
+
+    def _makeOne(self, *args):
+        cmd = self._getTargetClass()(['pmanifest', '-j', '1'] + list(args))
+        self.out = []
+        cmd.out = self.out.append
+        return cmd
+
+    def _writeFile(self, name, body):
+        path = os.path.join(self.tmp, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(body)
+        return path
+
+    def _readManifest(self, path=None):
+        import json
+        if path is None:
+            path = os.path.join(self.tmp, 'manifest.json')
+        with open(path) as f:
+            return json.load(f)
+
+    def test_no_args(self):
+        command = self._makeOne()
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(self.out, ['Requires exactly one directory argument'])
+
+    def test_not_a_directory(self):
+        path = self._writeFile('a.js', b'')
+        command = self._makeOne(path)
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertEqual(self.out, ['Not a directory: %s' % path])
+
+    def test_it(self):
+        import hashlib
+        self._writeFile('css/main.css', b'body {}')
+        self._writeFile('app.js', b'alert(1)')
+        command = self._makeOne(self.tmp)
+        result = command.run()
+        self.assertEqual(result, 0)
+        css = hashlib.md5(b'body {}').hexdigest()[:12]
+        js = hashlib.md5(b'alert(1)').hexdigest()[:12]
+        self.assertEqual(self._readManifest(), {
+            'css/main.css': 'css/main.%s.css' % css,
+            'app.js': 'app.%s.js' % js,
+            })
+
+    def test_skips_existing_manifest(self):
+        self._writeFile('manifest.json', b'{}')
+        self._writeFile('app.js', b'alert(1)')
+        command = self._makeOne(self.tmp)
+        command.run()
+        self.assertEqual(list(self._readManifest()), ['app.js'])
+
+    def test_output_and_token_length(self):
+        import hashlib
+        import tempfile
+        self._writeFile('app.js', b'alert(1)')
+        outdir = tempfile.mkdtemp()
+        try:
+            output = os.path.join(outdir, 'assets.json')
+            command = self._makeOne('-o', output, '-l', '4', self.tmp)
+            result = command.run()
+            self.assertEqual(result, 0)
+            token = hashlib.md5(b'alert(1)').hexdigest()[:4]
+            self.assertEqual(self._readManifest(output),
+                             {'app.js': 'app.%s.js' % token})
+        finally:
+            import shutil
+            shutil.rmtree(outdir)
+
+class Test_busted_path(unittest.TestCase):
+    def _callFUT(self, relpath, token):
+        from pyramid.scripts.pmanifest import busted_path
+        return busted_path(relpath, token)
+
+    def test_with_extension(self):
+        self.assertEqual(self._callFUT('css/main.css', 'abc'),
+                         'css/main.abc.css')
+
+    def test_without_extension(self):
+        self.assertEqual(self._callFUT('LICENSE', 'abc'), 'LICENSE.abc')
+
+    def test_dotfile(self):
+        self.assertEqual(self._callFUT('a/.htaccess', 'abc'),
+                         'a/.htaccess.abc')
+
+class Test_main(unittest.TestCase):
+    def _callFUT(self, argv):
+        from pyramid.scripts.pmanifest import main
+        return main(argv, quiet=True)
+
+    def test_it(self):
+        result = self._callFUT(['pmanifest'])
+        self.assertEqual(result, 2)
@@ -0,0 +1,158 @@
+import unittest
+from pyramid.tests.test_scripts import dummy
+
+class TestPMemoryCommand(unittest.TestCase):
+    def _getTargetClass(self):
+        from pyramid.scripts.pmemory import PMemoryCommand
+        return PMemoryCommand
+
+    def _makeOne(self, *args, **settings):
+        cmd = self._getTargetClass()(['pmemory'] + list(args))
+        registry = dummy.DummyRegistry()
+        registry.settings = settings
+        cmd.bootstrap = (dummy.DummyBootstrap(registry=registry),)
+        cmd.args = ('/foo/bar/myapp.ini#myapp',)
+        return cmd
+
+    def _writeReport(self, data, name='memory.json'):
+        import json
+        import os
+        import shutil
+        import tempfile
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, name)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def _report(self, count=2, retained=4096, max_retained=3072):
+        return [{
+            'route': 'home', 'view': '', 'count': count,
+            'retained': retained, 'max_retained': max_retained,
+            'top': [{'site': 'app.py:10', 'size': retained, 'count': 3}],
+            }]
+
+    def test_command_no_args(self):
+        command = self._makeOne()
+        command.args = ()
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 2)
+        self.assertEqual(L, ['Requires a config file argument'])
+
+    def test_command_no_setting(self):
+        command = self._makeOne()
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 2)
+        self.assertTrue('pyramid.debug_memory_file' in L[0])
+
+    def test_command_unreadable(self):
+        command = self._makeOne(
+            **{'pyramid.debug_memory_file': '/nonexistent/x'})
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 2)
+        self.assertTrue(L[0].startswith(
+            'Could not read memory statistics from /nonexistent/x'))
+
+    def test_command_empty(self):
+        path = self._writeReport([])
+        command = self._makeOne(**{'pyramid.debug_memory_file': path})
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 0)
+        self.assertEqual(L, ['No requests have been tracked'])
+
+    def test_command(self):
+        path = self._writeReport(self._report())
+        command = self._makeOne(**{'pyramid.debug_memory_file': path})
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 0)
+        self.assertEqual(len(L), 3)
+        self.assertEqual(L[2].split(),
+                         ['home', "''", '2', '4.0', '2.0', '3.0'])
+
+    def test_command_sites(self):
+        path = self._writeReport(self._report())
+        command = self._makeOne('--sites',
+                                **{'pyramid.debug_memory_file': path})
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 0)
+        self.assertEqual(L[3].split(),
+                         ['4.0', 'KB', '3', 'blocks', 'app.py:10'])
+
+    def test_command_per_process(self):
+        import os
+        path = self._writeReport(self._report(), 'memory-1.json')
+        with open(path.replace('-1', '-2'), 'w') as f:
+            f.write('[{"route": "home", "view": "", "count": 1, '
+                    '"retained": 2048, "max_retained": 2048, "top": []}]')
+        command = self._makeOne(**{
+            'pyramid.debug_memory_file': os.path.join(
+                os.path.dirname(path), 'memory-{pid}.json')})
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 0)
+        self.assertEqual(L[2].split(),
+                         ['home', "''", '3', '6.0', '2.0', '3.0'])
+
+    def test_command_per_process_none_found(self):
+        command = self._makeOne(
+            **{'pyramid.debug_memory_file': '/nonexistent/memory-{pid}.json'})
+        L = []
+        command.out = L.append
+        self.assertEqual(command.run(), 2)
+        self.assertTrue(L[0].startswith('No memory statistics found'))
+
+class Test_merge_reports(unittest.TestCase):
+    def _callFUT(self, reports, top=None):
+        from pyramid.scripts.pmemory import merge_reports
+        return merge_reports(reports, top)
+
+    def test_it(self):
+        first = [{
+            'route': 'a', 'view': None, 'count': 1, 'retained': 10,
+            'max_retained': 10,
+            'top': [{'site': 'x.py:1', 'size': 10, 'count': 1}],
+            }]
+        second = [
+            {'route': 'a', 'view': None, 'count': 2, 'retained': 30,
+             'max_retained': 20,
+             'top': [{'site': 'x.py:1', 'size': 5, 'count': 1},
+                     {'site': 'y.py:2', 'size': 25, 'count': 2}]},
+            {'route': None, 'view': 'v', 'count': 1, 'retained': -5,
+             'max_retained': -5, 'top': []},
+            ]
+        merged = self._callFUT([first, second])
+        self.assertEqual(merged, [
+            {'route': 'a', 'view': None, 'count': 3, 'retained': 40,
+             'max_retained': 20,
+             'top': [{'site': 'y.py:2', 'size': 25, 'count': 2},
+                     {'site': 'x.py:1', 'size': 15, 'count': 2}]},
+            {'route': None, 'view': 'v', 'count': 1, 'retained': -5,
+             'max_retained': -5, 'top': []},
+            ])
+
+    def test_top(self):
+        report = [{
+            'route': 'a', 'view': None, 'count': 1, 'retained': 10,
+            'max_retained': 10,
+            'top': [{'site': 'x.py:1', 'size': 4, 'count': 1},
+                    {'site': 'y.py:2', 'size': 6, 'count': 1}],
+            }]
+        merged = self._callFUT([report], top=1)
+        self.assertEqual(merged[0]['top'],
+                         [{'site': 'y.py:2', 'size': 6, 'count': 1}])
+
+class Test_main(unittest.TestCase):
+    def _callFUT(self, argv):
+        from pyramid.scripts.pmemory import main
+        return main(argv, quiet=True)
+
+    def test_it(self):
+        result = self._callFUT(['pmemory'])
+        self.assertEqual(result, 2)
@@ -6,8 +6,8 @@ class TestPTweensCommand(unittest.TestCase):
         from pyramid.scripts.ptweens import PTweensCommand
         return PTweensCommand
 
-    def _makeOne(self):
-        cmd = self._getTargetClass()([])
+    def _makeOne(self, *args):
+        cmd = self._getTargetClass()(['ptweens'] + list(args))
         cmd.bootstrap = (dummy.DummyBootstrap(),)
         cmd.args = ('/foo/bar/myapp.ini#myapp',)
         return cmd
@@ -51,6 +51,149 @@ class TestPTweensCommand(unittest.TestCase):
         registry = dummy.DummyRegistry()
         self.assertEqual(command._get_tweens(registry), None)
 
+    def _writeStats(self, data):
+        import json
+        import os
+        import shutil
+        import tempfile
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, 'stats.json')
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        return path
+
+    def test_command_stats(self):
+        registry = dummy.DummyRegistry()
+        registry.settings = {'pyramid.tween_stats_file': self._writeStats({
+            'bounds': [0.001, 0.01],
+            'tweens': {
+                'name': {'count': 4, 'total': 0.004, 'max': 0.002,
+                         'histogram': [3, 1, 0]},
+                },
+            })}
+        command = self._makeOne('--stats')
+        command.bootstrap = (dummy.DummyBootstrap(registry=registry),)
+        command.args = ('/foo/bar/myapp.ini#myapp',)
+        tweens = dummy.DummyTweens([('name', 'item')], None)
+        command._get_tweens = lambda *arg: tweens
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertEqual(L[7].split(), ['0', 'name', '4', '1.000', '1.000',
+                                        '2.000', '2.000'])
+        self.assertEqual(L[8].split(), ['-', 'MAIN', '0', '-', '-', '-',
+                                        '-'])
+
+    def test_command_stats_per_process(self):
+        import os
+        path = self._writeStats({
+            'bounds': [0.001, 0.01],
+            'tweens': {
+                'name': {'count': 1, 'total': 0.002, 'max': 0.002,
+                         'histogram': [0, 1, 0]},
+                },
+            })
+        os.rename(path, path.replace('stats.json', 'stats-1.json'))
+        with open(path.replace('stats.json', 'stats-2.json'), 'w') as f:
+            f.write('{"bounds": [0.001, 0.01], "tweens": {"name": '
+                    '{"count": 3, "total": 0.002, "max": 0.001, '
+                    '"histogram": [3, 0, 0]}}}')
+        registry = dummy.DummyRegistry()
+        registry.settings = {
+            'pyramid.tween_stats_file': path.replace('stats.json',
+                                                     'stats-{pid}.json')}
+        command = self._makeOne('--stats')
+        command.bootstrap = (dummy.DummyBootstrap(registry=registry),)
+        command.args = ('/foo/bar/myapp.ini#myapp',)
+        tweens = dummy.DummyTweens([('name', 'item')], None)
+        command._get_tweens = lambda *arg: tweens
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 0)
+        self.assertEqual(L[7].split(), ['0', 'name', '4', '1.000', '1.000',
+                                        '2.000', '2.000'])
+
+    def test_command_stats_per_process_none_found(self):
+        registry = dummy.DummyRegistry()
+        registry.settings = {
+            'pyramid.tween_stats_file': '/nonexistent/stats-{pid}.json'}
+        command = self._makeOne('--stats')
+        command.bootstrap = (dummy.DummyBootstrap(registry=registry),)
+        command.args = ('/foo/bar/myapp.ini#myapp',)
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertTrue(L[0].startswith('No tween statistics found'))
+
+    def test_command_stats_no_setting(self):
+        command = self._makeOne('--stats')
+        command.args = ('/foo/bar/myapp.ini#myapp',)
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertTrue('pyramid.tween_stats_file' in L[0])
+
+    def test_command_stats_unreadable(self):
+        registry = dummy.DummyRegistry()
+        registry.settings = {'pyramid.tween_stats_file': '/nonexistent/x'}
+        command = self._makeOne('--stats')
+        command.bootstrap = (dummy.DummyBootstrap(registry=registry),)
+        command.args = ('/foo/bar/myapp.ini#myapp',)
+        L = []
+        command.out = L.append
+        result = command.run()
+        self.assertEqual(result, 2)
+        self.assertTrue(L[0].startswith(
+            'Could not read tween statistics from /nonexistent/x'))
+
+class Test_percentile(unittest.TestCase):
+    def _callFUT(self, bounds, stat, fraction):
+        from pyramid.scripts.ptweens import percentile
+        return percentile(bounds, stat, fraction)
+
+    def test_within_bounds(self):
+        stat = {'count': 4, 'max': 0.5, 'histogram': [1, 0, 3, 0]}
+        self.assertEqual(self._callFUT([0.1, 0.2, 0.3], stat, 0.25), 0.1)
+        self.assertEqual(self._callFUT([0.1, 0.2, 0.3], stat, 0.5), 0.3)
+
+    def test_capped_by_max(self):
+        stat = {'count': 1, 'max': 0.15, 'histogram': [0, 1, 0, 0]}
+        self.assertEqual(self._callFUT([0.1, 0.2, 0.3], stat, 0.5), 0.15)
+
+    def test_overflow(self):
+        stat = {'count': 2, 'max': 7.0, 'histogram': [1, 0, 0, 1]}
+        self.assertEqual(self._callFUT([0.1, 0.2, 0.3], stat, 0.95), 7.0)
+
+class Test_merge_stats(unittest.TestCase):
+    def _callFUT(self, dumps):
+        from pyramid.scripts.ptweens import merge_stats
+        return merge_stats(dumps)
+
+    def test_it(self):
+        first = {'bounds': [0.1], 'tweens': {
+            'a': {'count': 1, 'total': 0.05, 'max': 0.05,
+                  'histogram': [1, 0]},
+            }}
+        second = {'bounds': [0.1], 'tweens': {
+            'a': {'count': 2, 'total': 0.5, 'max': 0.3,
+                  'histogram': [0, 2]},
+            'b': {'count': 1, 'total': 0.01, 'max': 0.01,
+                  'histogram': [1, 0]},
+            }}
+        merged = self._callFUT([first, second])
+        self.assertEqual(merged, {'bounds': [0.1], 'tweens': {
+            'a': {'count': 3, 'total': 0.55, 'max': 0.3,
+                  'histogram': [1, 2]},
+            'b': {'count': 1, 'total': 0.01, 'max': 0.01,
+                  'histogram': [1, 0]},
+            }})
+        self.assertEqual(first['tweens']['a']['count'], 1)
+
 class Test_main(unittest.TestCase):
     def _callFUT(self, argv):
         from pyramid.scripts.ptweens import main
@@ -1,4 +1,5 @@
 import datetime
+import os
 import unittest
 
 # 5 years from now (more or less)
@@ -368,6 +369,586 @@ class Test_static_view_use_subpath_True(unittest.TestCase):
         from pyramid.httpexceptions import HTTPNotFound
         self.assertRaises(HTTPNotFound, inst, context, request)
 
+class Test_static_view_resolution_cache(unittest.TestCase):
+    def setUp(self):
+        from pyramid import testing
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        from pyramid import testing
+        testing.tearDown()
+
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(*arg, use_subpath=True, **kw)
+
+    def _makeRequest(self, *subpath):
+        from pyramid.request import Request
+        request = Request.blank('/' + '/'.join(subpath))
+        request.subpath = subpath
+        return request
+
+    def _patchResolution(self):
+        from pyramid import static
+        calls = []
+        saved = static.resource_isdir
+        def resource_isdir(package_name, path):
+            calls.append(path)
+            return saved(package_name, path)
+        static.resource_isdir = resource_isdir
+        self.addCleanup(setattr, static, 'resource_isdir', saved)
+        return calls
+
+    def test_resolution_reused(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        calls = self._patchResolution()
+        for i in range(2):
+            response = inst(None, self._makeRequest('index.html'))
+            self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(calls, ['fixtures/static/index.html'])
+
+    def test_not_found_not_reused(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        calls = self._patchResolution()
+        for i in range(2):
+            self.assertRaises(HTTPNotFound, inst, None,
+                              self._makeRequest('notthere.html'))
+        self.assertEqual(len(calls), 2)
+
+    def test_not_found_reused_with_interval(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        inst.resolution_recheck_interval = 60
+        calls = self._patchResolution()
+        for i in range(2):
+            self.assertRaises(HTTPNotFound, inst, None,
+                              self._makeRequest('notthere.html'))
+        self.assertEqual(calls, ['fixtures/static/notthere.html'])
+
+    def test_uses_request_registry(self):
+        from pyramid.interfaces import IPackageOverrides
+        from pyramid.registry import Registry
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        calls = self._patchResolution()
+        request = self._makeRequest('index.html')
+        request.registry = Registry()
+        overrides = DummyOverrides()
+        request.registry.registerUtility(
+            overrides, IPackageOverrides, name='pyramid.tests')
+        inst(None, request)
+        overrides.generation += 1
+        request = self._makeRequest('index.html')
+        request.registry = Registry()
+        request.registry.registerUtility(
+            overrides, IPackageOverrides, name='pyramid.tests')
+        inst(None, request)
+        # the current registry has no overrides; the request's is used
+        self.assertEqual(len(calls), 2)
+
+    def test_directory_redirect_still_issued(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        request = self._makeRequest('subdir')
+        self.assertRaises(HTTPMovedPermanently, inst, None, request)
+        self.assertRaises(HTTPMovedPermanently, inst, None, request)
+        request = self._makeRequest('subdir')
+        request.environ['PATH_INFO'] = '/subdir/'
+        response = inst(None, request)
+        self.assertTrue(b'<html>subdir</html>' in response.body)
+
+    def test_invalidated_by_override(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        calls = self._patchResolution()
+        inst(None, self._makeRequest('index.html'))
+        from pyramid.interfaces import IPackageOverrides
+        overrides = DummyOverrides()
+        self.config.registry.registerUtility(
+            overrides, IPackageOverrides, name='pyramid.tests')
+        inst(None, self._makeRequest('index.html'))
+        overrides.generation += 1
+        inst(None, self._makeRequest('index.html'))
+        inst(None, self._makeRequest('index.html'))
+        self.assertEqual(len(calls), 3)
+
+    def test_rechecked_after_interval(self):
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        inst.resolution_recheck_interval = 0
+        calls = self._patchResolution()
+        inst(None, self._makeRequest('index.html'))
+        inst(None, self._makeRequest('index.html'))
+        self.assertEqual(len(calls), 2)
+
+    def test_remembered_file_gone(self):
+        from pyramid.httpexceptions import HTTPNotFound
+        inst = self._makeOne('pyramid.tests:fixtures/static')
+        calls = self._patchResolution()
+        inst._resolutions.put(
+            'fixtures/static/index.html',
+            ((None, None), 0, False, '/nonexistent/index.html', {}))
+        inst(None, self._makeRequest('subdir', 'index.html'))
+        self.assertEqual(len(calls), 1)
+        self.assertRaises(HTTPNotFound, inst, None,
+                          self._makeRequest('index.html'))
+        self.assertEqual(len(calls), 1)
+        # the other resolutions are kept
+        inst(None, self._makeRequest('subdir', 'index.html'))
+        self.assertEqual(len(calls), 1)
+        response = inst(None, self._makeRequest('index.html'))
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(len(calls), 2)
+
+class Test_static_view_file_cache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(*arg, **kw)
+
+    def _makeCache(self, **kw):
+        from pyramid.static import FileCache
+        return FileCache(**kw)
+
+    def _makeRequest(self, path_info):
+        from pyramid.request import Request
+        return Request.blank(path_info)
+
+    def _writeFile(self, name, body):
+        import os
+        path = os.path.join(self.tmp, name)
+        with open(path, 'wb') as f:
+            f.write(body)
+        return path
+
+    def test_ctor_file_cache_True(self):
+        from pyramid.static import FileCache
+        inst = self._makeOne(self.tmp, file_cache=True)
+        self.assertEqual(inst.file_cache.__class__, FileCache)
+
+    def test_ctor_file_cache_default(self):
+        inst = self._makeOne(self.tmp)
+        self.assertEqual(inst.file_cache, None)
+
+    def test_small_file_served_from_cache(self):
+        import os
+        path = self._writeFile('a.css', b'body {}')
+        cache = self._makeCache(recheck_interval=3600)
+        inst = self._makeOne(self.tmp, file_cache=cache)
+        response = inst(DummyContext(), self._makeRequest('/a.css'))
+        self.assertEqual(response.body, b'body {}')
+        self.assertEqual(response.content_type, 'text/css')
+        self.assertEqual(response.etag, 'fcdce6b6d6e2175f6406869882f6f1ce')
+        self.assertEqual(len(cache), 1)
+        os.remove(path)
+        response = inst(DummyContext(), self._makeRequest('/a.css'))
+        self.assertEqual(response.body, b'body {}')
+
+    def test_cached_response_headers(self):
+        self._writeFile('a.css', b'body {}')
+        inst = self._makeOne(self.tmp, cache_max_age=600, file_cache=True)
+        inst(DummyContext(), self._makeRequest('/a.css'))
+        response = inst(DummyContext(), self._makeRequest('/a.css'))
+        header_names = sorted([ x[0] for x in response.headerlist ])
+        self.assertEqual(header_names,
+                         ['Cache-Control', 'Content-Length', 'Content-Type',
+                          'ETag', 'Expires', 'Last-Modified'])
+
+    def test_cached_response_notmodified(self):
+        self._writeFile('a.css', b'body {}')
+        inst = self._makeOne(self.tmp, file_cache=True)
+        response = inst(DummyContext(), self._makeRequest('/a.css'))
+        request = self._makeRequest('/a.css')
+        request.if_none_match = response.etag
+        response = inst(DummyContext(), request)
+        start_response = DummyStartResponse()
+        app_iter = response(request.environ, start_response)
+        self.assertEqual(start_response.status, '304 Not Modified')
+        self.assertEqual(list(app_iter), [])
+
+    def test_modified_file_is_reloaded(self):
+        import os
+        path = self._writeFile('a.css', b'body {}')
+        inst = self._makeOne(self.tmp,
+                             file_cache=self._makeCache(recheck_interval=0))
+        inst(DummyContext(), self._makeRequest('/a.css'))
+        self._writeFile('a.css', b'body { color: red }')
+        os.utime(path, (0, 0))
+        response = inst(DummyContext(), self._makeRequest('/a.css'))
+        self.assertEqual(response.body, b'body { color: red }')
+
+    def test_removed_file_not_found(self):
+        import os
+        from pyramid.httpexceptions import HTTPNotFound
+        path = self._writeFile('a.css', b'body {}')
+        cache = self._makeCache(recheck_interval=0)
+        inst = self._makeOne(self.tmp, file_cache=cache)
+        inst(DummyContext(), self._makeRequest('/a.css'))
+        os.remove(path)
+        self.assertRaises(HTTPNotFound, inst, DummyContext(),
+                          self._makeRequest('/a.css'))
+        self.assertEqual(len(cache), 0)
+
+    def test_large_file_not_cached(self):
+        from pyramid.response import FileResponse
+        self._writeFile('a.js', b'x' * 11)
+        cache = self._makeCache(max_file_size=10)
+        inst = self._makeOne(self.tmp, file_cache=cache)
+        response = inst(DummyContext(), self._makeRequest('/a.js'))
+        self.assertTrue(isinstance(response, FileResponse))
+        response.app_iter.close()
+        self.assertEqual(len(cache), 0)
+
+    def test_index_not_cached(self):
+        from pyramid.httpexceptions import HTTPMovedPermanently
+        import os
+        os.mkdir(os.path.join(self.tmp, 'sub'))
+        self._writeFile(os.path.join('sub', 'index.html'), b'<html/>')
+        cache = self._makeCache()
+        inst = self._makeOne(self.tmp, file_cache=cache)
+        response = inst(DummyContext(), self._makeRequest('/sub/'))
+        self.assertEqual(response.body, b'<html/>')
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(HTTPMovedPermanently, inst, DummyContext(),
+                          self._makeRequest('/sub'))
+
+    def test_package_resource_cached(self):
+        cache = self._makeCache()
+        inst = self._makeOne('pyramid.tests:fixtures/static', file_cache=cache)
+        response = inst(DummyContext(), self._makeRequest('/index.html'))
+        self.assertTrue(b'<html>static</html>' in response.body)
+        self.assertEqual(len(cache), 1)
+
+class Test_static_view_precompressed(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+        self._writeFile('app.js', b'identity')
+        self._writeFile('app.js.gz', b'gzipped')
+        self._writeFile('app.js.br', b'brotli')
+        self._writeFile('other.js', b'other')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _makeOne(self, *arg, **kw):
+        from pyramid.static import static_view
+        return static_view(self.tmp, *arg, **kw)
+
+    def _makeRequest(self, path_info, accept_encoding=None):
+        from pyramid.request import Request
+        request = Request.blank(path_info)
+        if accept_encoding is not None:
+            request.headers['Accept-Encoding'] = accept_encoding
+        return request
+
+    def _writeFile(self, name, body):
+        import os
+        path = os.path.join(self.tmp, name)
+        with open(path, 'wb') as f:
+            f.write(body)
+        return path
+
+    def _call(self, inst, path_info, accept_encoding=None):
+        response = inst(DummyContext(),
+                        self._makeRequest(path_info, accept_encoding))
+        body = response.body
+        return response, body
+
+    def test_ctor_precompressed_True(self):
+        inst = self._makeOne(precompressed=True)
+        self.assertEqual(inst.precompressed, (('br', '.br'), ('gzip', '.gz')))
+
+    def test_ctor_precompressed_unknown_encoding(self):
+        self.assertRaises(ValueError, self._makeOne,
+                          precompressed=('deflate',))
+
+    def test_ctor_precompressed_default(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.precompressed, ())
+
+    def test_no_accept_encoding(self):
+        inst = self._makeOne(precompressed=True)
+        response, body = self._call(inst, '/app.js')
+        self.assertEqual(body, b'identity')
+        self.assertEqual(response.content_encoding, None)
+        self.assertEqual(list(response.vary), ['Accept-Encoding'])
+
+    def test_gzip(self):
+        import mimetypes
+        inst = self._makeOne(precompressed=True)
+        response, body = self._call(inst, '/app.js', 'gzip, deflate')
+        self.assertEqual(body, b'gzipped')
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.content_type,
+                         mimetypes.guess_type('app.js')[0])
+        self.assertEqual(list(response.vary), ['Accept-Encoding'])
+
+    def test_preference_order(self):
+        inst = self._makeOne(precompressed=True)
+        response, body = self._call(inst, '/app.js', 'gzip, br')
+        self.assertEqual(body, b'brotli')
+        self.assertEqual(response.content_encoding, 'br')
+        inst = self._makeOne(precompressed=('gzip', 'br'))
+        response, body = self._call(inst, '/app.js', 'gzip, br')
+        self.assertEqual(body, b'gzipped')
+
+    def test_q_zero_refuses(self):
+        inst = self._makeOne(precompressed=True)
+        response, body = self._call(inst, '/app.js', 'br;q=0, gzip;q=0.5')
+        self.assertEqual(body, b'gzipped')
+
+    def test_wildcard(self):
+        inst = self._makeOne(precompressed=('gzip',))
+        response, body = self._call(inst, '/app.js', '*')
+        self.assertEqual(body, b'gzipped')
+
+    def test_no_sibling(self):
+        inst = self._makeOne(precompressed=True)
+        response, body = self._call(inst, '/other.js', 'gzip, br')
+        self.assertEqual(body, b'other')
+        self.assertEqual(response.content_encoding, None)
+
+    def test_disabled(self):
+        inst = self._makeOne()
+        response, body = self._call(inst, '/app.js', 'gzip, br')
+        self.assertEqual(body, b'identity')
+        self.assertEqual(response.vary, None)
+
+    def test_etag_per_variant(self):
+        inst = self._makeOne(precompressed=True)
+        response, body = self._call(inst, '/app.js')
+        identity_etag = response.etag
+        self.assertTrue(identity_etag)
+        response, body = self._call(inst, '/app.js', 'gzip')
+        self.assertEqual(body, b'gzipped')
+        self.assertTrue(response.etag)
+        self.assertNotEqual(response.etag, identity_etag)
+        self.assertEqual(list(response.vary), ['Accept-Encoding'])
+
+    def _patchPackage(self, resolved):
+        # stands in for the package's resources, asset overrides included:
+        # ``resolved`` maps resource paths to filesystem paths
+        from pyramid import static
+        calls = []
+        def resource_isdir(package_name, path):
+            calls.append(path)
+            return False
+        def resource_exists(package_name, path):
+            calls.append(path)
+            return path in resolved
+        def resource_filename(package_name, path):
+            return resolved[path]
+        for func in (resource_isdir, resource_exists, resource_filename):
+            name = func.__name__
+            self.addCleanup(setattr, static, name, getattr(static, name))
+            setattr(static, name, func)
+        return calls
+
+    def test_package_sibling_resolved_like_resource(self):
+        import os
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static', precompressed=True)
+        calls = self._patchPackage({
+            'fixtures/static/app.js': os.path.join(self.tmp, 'app.js'),
+            # stands in for an asset override of the sibling
+            'fixtures/static/app.js.br': os.path.join(self.tmp, 'other.js'),
+            })
+        for i in range(3):
+            response, body = self._call(inst, '/app.js', 'br, gzip')
+            self.assertEqual(body, b'other')
+            self.assertEqual(response.content_encoding, 'br')
+        self.assertEqual(calls, ['fixtures/static/app.js',
+                                 'fixtures/static/app.js',
+                                 'fixtures/static/app.js.br',
+                                 'fixtures/static/app.js.br'])
+
+    def test_package_missing_siblings_remembered(self):
+        import os
+        from pyramid.static import static_view
+        inst = static_view('pyramid.tests:fixtures/static', precompressed=True)
+        calls = self._patchPackage({
+            'fixtures/static/app.js': os.path.join(self.tmp, 'app.js'),
+            })
+        for i in range(3):
+            response, body = self._call(inst, '/app.js', 'br, gzip')
+            self.assertEqual(body, b'identity')
+            self.assertEqual(response.content_encoding, None)
+        # the siblings are looked up by the first request only
+        self.assertEqual(calls, ['fixtures/static/app.js',
+                                 'fixtures/static/app.js',
+                                 'fixtures/static/app.js.br',
+                                 'fixtures/static/app.js.gz'])
+        # a request accepting no encoding reuses the resolution too
+        self._call(inst, '/app.js')
+        self.assertEqual(len(calls), 4)
+
+    def test_with_file_cache(self):
+        inst = self._makeOne(precompressed=True, file_cache=True)
+        self._call(inst, '/app.js', 'gzip')
+        self._call(inst, '/app.js')
+        response, body = self._call(inst, '/app.js', 'gzip')
+        self.assertEqual(body, b'gzipped')
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(list(response.vary), ['Accept-Encoding'])
+        gzip_etag = response.etag
+        response, body = self._call(inst, '/app.js')
+        self.assertEqual(body, b'identity')
+        self.assertEqual(response.content_encoding, None)
+        self.assertNotEqual(response.etag, gzip_etag)
+        self.assertEqual(len(inst.file_cache), 2)
+
+class Test__parse_accept_encoding(unittest.TestCase):
+    def _callFUT(self, value):
+        from pyramid.static import _parse_accept_encoding
+        return _parse_accept_encoding(value)
+
+    def test_it(self):
+        self.assertEqual(
+            self._callFUT('gzip, BR;q=0.5, identity; q=0, x;q=bad,,'),
+            {'gzip':1.0, 'br':0.5, 'identity':0.0, 'x':0.0})
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _makeOne(self, **kw):
+        from pyramid.static import FileCache
+        return FileCache(**kw)
+
+    def _writeFile(self, name, body):
+        import os
+        path = os.path.join(self.tmp, name)
+        with open(path, 'wb') as f:
+            f.write(body)
+        return path
+
+    def test_get_missing(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.get('a'), None)
+
+    def test_add_and_get(self):
+        path = self._writeFile('a.txt', b'abc')
+        inst = self._makeOne()
+        entry = inst.add('a', path)
+        self.assertEqual(entry.body, b'abc')
+        self.assertEqual(entry.content_type, 'text/plain')
+        self.assertTrue(inst.get('a') is entry)
+        self.assertEqual(inst.total_size, 3)
+
+    def test_add_missing_file(self):
+        import os
+        inst = self._makeOne()
+        self.assertEqual(inst.add('a', os.path.join(self.tmp, 'x')), None)
+
+    def test_add_directory(self):
+        inst = self._makeOne()
+        self.assertEqual(inst.add('a', self.tmp), None)
+
+    def test_add_replaces(self):
+        path = self._writeFile('a.txt', b'abc')
+        inst = self._makeOne()
+        inst.add('a', path)
+        inst.add('a', path)
+        self.assertEqual(len(inst), 1)
+        self.assertEqual(inst.total_size, 3)
+
+    def test_max_entries_evicts_least_recently_used(self):
+        a = self._writeFile('a.txt', b'a')
+        b = self._writeFile('b.txt', b'b')
+        c = self._writeFile('c.txt', b'c')
+        inst = self._makeOne(max_entries=2)
+        inst.add('a', a)
+        inst.add('b', b)
+        inst.get('a')
+        inst.add('c', c)
+        self.assertEqual(sorted(inst._entries.keys()), ['a', 'c'])
+
+    def test_max_total_size(self):
+        a = self._writeFile('a.txt', b'aaa')
+        b = self._writeFile('b.txt', b'bbb')
+        inst = self._makeOne(max_total_size=5)
+        inst.add('a', a)
+        inst.add('b', b)
+        self.assertEqual(list(inst._entries.keys()), ['b'])
+        self.assertEqual(inst.total_size, 3)
+
+    def test_file_larger_than_max_total_size(self):
+        a = self._writeFile('a.txt', b'aaa')
+        inst = self._makeOne(max_total_size=2)
+        self.assertEqual(inst.add('a', a), None)
+
+    def _patchStat(self):
+        from pyramid import static
+        calls = []
+        saved = static.os.stat
+        def stat(path):
+            calls.append(path)
+            return saved(path)
+        static.os.stat = stat
+        self.addCleanup(setattr, static.os, 'stat', saved)
+        return calls
+
+    def test_uncacheable_remembered(self):
+        a = self._writeFile('a.txt', b'aaa')
+        inst = self._makeOne(max_file_size=2, recheck_interval=60)
+        calls = self._patchStat()
+        for i in range(3):
+            self.assertEqual(inst.add('a', a), None)
+        self.assertEqual(calls, [a])
+        self.assertEqual(len(inst), 0)
+
+    def test_uncacheable_rechecked_after_interval(self):
+        a = self._writeFile('a.txt', b'aaa')
+        inst = self._makeOne(max_file_size=2, recheck_interval=0)
+        calls = self._patchStat()
+        self.assertEqual(inst.add('a', a), None)
+        self._writeFile('a.txt', b'a')
+        entry = inst.add('a', a)
+        self.assertEqual(entry.body, b'a')
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(inst._uncacheable, {})
+
+    def test_uncacheable_other_file(self):
+        a = self._writeFile('a.txt', b'aaa')
+        b = self._writeFile('b.txt', b'b')
+        inst = self._makeOne(max_file_size=2, recheck_interval=60)
+        inst.add('a', a)
+        # the key now resolves to another file, e.g. an asset override
+        self.assertEqual(inst.add('a', b).body, b'b')
+
+    def test_uncacheable_bounded(self):
+        a = self._writeFile('a.txt', b'aaa')
+        inst = self._makeOne(max_file_size=2, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            inst.add(key, a)
+        self.assertEqual(list(inst._uncacheable.keys()), ['c'])
+
+    def test_discard_and_clear(self):
+        a = self._writeFile('a.txt', b'aaa')
+        inst = self._makeOne()
+        inst.add('a', a)
+        inst.discard('a')
+        inst.discard('a')
+        self.assertEqual(inst.total_size, 0)
+        inst.add('a', a)
+        inst.add('b', self.tmp)
+        inst.clear()
+        self.assertEqual(len(inst), 0)
+        self.assertEqual(inst.total_size, 0)
+        self.assertEqual(inst._uncacheable, {})
+
 class TestMd5AssetTokenGenerator(unittest.TestCase):
     _fspath = None
     _tmp = None
@@ -517,6 +1098,105 @@ class TestQueryStringConstantCacheBuster(TestQueryStringMd5CacheBuster):
             fut('foo', ('bar',), {'_query': (('a', 'b'),)}),
             (('bar',), {'_query': (('a', 'b'), ('x', 'foo'))}))
 
+class TestManifestCacheBuster(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.tmp, 'manifest.json')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp)
+
+    def _makeOne(self, path, **kw):
+        from pyramid.static import ManifestCacheBuster as cls
+        return cls(path, **kw)
+
+    def _writeManifest(self, manifest, mtime=None):
+        import json
+        with open(self.manifest_path, 'w') as f:
+            f.write(json.dumps(manifest))
+        if mtime is not None:
+            os.utime(self.manifest_path, (mtime, mtime))
+
+    def test_it(self):
+        self._writeManifest({'css/main.css': 'css/main-test.css'})
+        fut = self._makeOne(self.manifest_path).pregenerate
+        self.assertEqual(fut('foo', ('bar',), {}), (('bar',), {}))
+        self.assertEqual(
+            fut('foo', ('css', 'main.css'), {}),
+            (('css', 'main-test.css'), {}))
+
+    def test_match(self):
+        self._writeManifest({'css/main.css': 'css/main-test.css'})
+        fut = self._makeOne(self.manifest_path).match
+        self.assertEqual(fut(('css', 'main-test.css')), ('css', 'main.css'))
+        self.assertEqual(fut(('css', 'other.css')), ('css', 'other.css'))
+
+    def test_it_with_relspec(self):
+        fut = self._makeOne('fixtures/manifest.json').pregenerate
+        self.assertEqual(fut('foo', ('bar',), {}), (('bar',), {}))
+        self.assertEqual(
+            fut('foo', ('css', 'main.css'), {}),
+            (('css', 'main-test.css'), {}))
+
+    def test_it_with_absspec(self):
+        fut = self._makeOne('pyramid.tests:fixtures/manifest.json').pregenerate
+        self.assertEqual(
+            fut('foo', ('css', 'main.css'), {}),
+            (('css', 'main-test.css'), {}))
+
+    def test_missing_manifest(self):
+        inst = self._makeOne(self.manifest_path)
+        self.assertEqual(inst.manifest, {})
+        self.assertEqual(
+            inst.pregenerate('foo', ('css', 'main.css'), {}),
+            (('css', 'main.css'), {}))
+
+    def test_no_reload_loads_once(self):
+        self._writeManifest({'css/main.css': 'css/main-test.css'}, 1000)
+        inst = self._makeOne(self.manifest_path)
+        self.assertEqual(inst.manifest, {'css/main.css': 'css/main-test.css'})
+        self._writeManifest({'css/main.css': 'css/main-678b7c80.css'}, 2000)
+        self.assertEqual(inst.manifest, {'css/main.css': 'css/main-test.css'})
+
+    def test_reload(self):
+        self._writeManifest({'css/main.css': 'css/main-test.css'}, 1000)
+        inst = self._makeOne(self.manifest_path, reload=True)
+        fut = inst.pregenerate
+        self.assertEqual(
+            fut('foo', ('css', 'main.css'), {}),
+            (('css', 'main-test.css'), {}))
+        self._writeManifest({'css/main.css': 'css/main-678b7c80.css'}, 2000)
+        self.assertEqual(
+            fut('foo', ('css', 'main.css'), {}),
+            (('css', 'main-678b7c80.css'), {}))
+        self.assertEqual(
+            inst.match(('css', 'main-678b7c80.css')), ('css', 'main.css'))
+
+    def test_reload_unchanged_mtime_does_not_reparse(self):
+        self._writeManifest({'css/main.css': 'css/main-test.css'}, 1000)
+        inst = self._makeOne(self.manifest_path, reload=True)
+        calls = []
+        parse = inst.parse_manifest
+        def parse_manifest(content):
+            calls.append(content)
+            return parse(content)
+        inst.parse_manifest = parse_manifest
+        inst.manifest
+        inst.manifest
+        self.assertEqual(len(calls), 1)
+
+    def test_parse_manifest_override(self):
+        self._writeManifest({})
+        inst = self._makeOne(self.manifest_path)
+        inst.parse_manifest = lambda content: {'a.css': 'a-1.css'}
+        self.assertEqual(
+            inst.pregenerate('foo', ('a.css',), {}), (('a-1.css',), {}))
+
+class DummyOverrides(object):
+    generation = 0
+
 class DummyContext:
     pass
 
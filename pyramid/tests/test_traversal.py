@@ -472,7 +472,102 @@ class ResourceTreeTraverserTests(unittest.TestCase):
         self.assertEqual(result['root'], resource)
         self.assertEqual(result['virtual_root'], abc)
         self.assertEqual(result['virtual_root_path'], ('abc',))
-        
+
+    def _makeBatchTree(self):
+        baz = DummyContext(None, 'baz')
+        bar = DummyContext(baz, 'bar')
+        foo = DummyContext(bar, 'foo')
+        root = DummyBatchContext(
+            {'foo': foo, 'bar': bar, 'baz': baz}, 'root')
+        return root, foo, bar, baz
+
+    def test_call_with_traverse_path(self):
+        root, foo, bar, baz = self._makeBatchTree()
+        policy = self._makeOne(root)
+        request = DummyRequest(self._getEnviron(),
+                               path_info=text_('/foo/bar/baz'))
+        result = policy(request)
+        self.assertEqual(root.calls, [('foo', 'bar', 'baz')])
+        self.assertEqual(result['context'], baz)
+        self.assertEqual(result['view_name'], '')
+        self.assertEqual(result['subpath'], ())
+        self.assertEqual(result['traversed'], ('foo', 'bar', 'baz'))
+        self.assertEqual(result['root'], root)
+        self.assertEqual(result['virtual_root'], root)
+        self.assertEqual(result['virtual_root_path'], ())
+
+    def test_call_with_traverse_path_stops(self):
+        root, foo, bar, baz = self._makeBatchTree()
+        policy = self._makeOne(root)
+        request = DummyRequest(self._getEnviron(),
+                               path_info=text_('/foo/bar/nope/x'))
+        result = policy(request)
+        self.assertEqual(root.calls, [('foo', 'bar', 'nope', 'x')])
+        self.assertEqual(result['context'], bar)
+        self.assertEqual(result['view_name'], 'nope')
+        self.assertEqual(result['subpath'], ('x',))
+        self.assertEqual(result['traversed'], ('foo', 'bar'))
+
+    def test_call_with_traverse_path_nothing_found(self):
+        root, foo, bar, baz = self._makeBatchTree()
+        policy = self._makeOne(root)
+        request = DummyRequest(self._getEnviron(),
+                               path_info=text_('/nope/x'))
+        result = policy(request)
+        self.assertEqual(result['context'], root)
+        self.assertEqual(result['view_name'], 'nope')
+        self.assertEqual(result['subpath'], ('x',))
+        self.assertEqual(result['traversed'], ())
+
+    def test_call_with_traverse_path_stops_at_view_selector(self):
+        root, foo, bar, baz = self._makeBatchTree()
+        policy = self._makeOne(root)
+        request = DummyRequest(self._getEnviron(),
+                               path_info=text_('/foo/bar/@@view/baz'))
+        result = policy(request)
+        self.assertEqual(root.calls, [('foo', 'bar')])
+        self.assertEqual(result['context'], bar)
+        self.assertEqual(result['view_name'], 'view')
+        self.assertEqual(result['subpath'], ('baz',))
+        self.assertEqual(result['traversed'], ('foo', 'bar'))
+
+    def test_call_with_traverse_path_then_getitem(self):
+        baz = DummyContext(None, 'baz')
+        bar = DummyContext(baz, 'bar')
+        foo = DummyBatchContext({'bar': bar}, 'foo')
+        root = DummyContext(foo, 'root')
+        policy = self._makeOne(root)
+        request = DummyRequest(self._getEnviron(),
+                               path_info=text_('/foo/bar/baz'))
+        result = policy(request)
+        self.assertEqual(foo.calls, [('bar', 'baz')])
+        self.assertEqual(result['context'], bar)
+        self.assertEqual(result['view_name'], 'baz')
+        self.assertEqual(result['traversed'], ('foo', 'bar'))
+
+    def test_call_with_traverse_path_extra_results_ignored(self):
+        root, foo, bar, baz = self._makeBatchTree()
+        root.extra = [object()]
+        policy = self._makeOne(root)
+        request = DummyRequest(self._getEnviron(),
+                               path_info=text_('/foo/@@view'))
+        result = policy(request)
+        self.assertEqual(result['context'], foo)
+        self.assertEqual(result['view_name'], 'view')
+
+    def test_call_with_traverse_path_and_vh_root(self):
+        root, foo, bar, baz = self._makeBatchTree()
+        environ = self._getEnviron(HTTP_X_VHM_ROOT='/foo/bar')
+        policy = self._makeOne(root)
+        request = DummyRequest(environ, path_info=text_('/baz'))
+        result = policy(request)
+        self.assertEqual(root.calls, [('foo', 'bar', 'baz')])
+        self.assertEqual(result['context'], baz)
+        self.assertEqual(result['view_name'], '')
+        self.assertEqual(result['traversed'], ('foo', 'bar', 'baz'))
+        self.assertEqual(result['virtual_root'], bar)
+        self.assertEqual(result['virtual_root_path'], ('foo', 'bar'))
+
 class FindInterfaceTests(unittest.TestCase):
     def _callFUT(self, context, iface):
         from pyramid.traversal import find_interface
@@ -826,6 +921,83 @@ class ResourcePathTupleTests(unittest.TestCase):
         result = self._callFUT(other2)
         self.assertEqual(result, ('', '', 'other2'))
 
+class ResourcePathCacheTests(unittest.TestCase):
+    def _makeOne(self):
+        from pyramid.traversal import ResourcePathCache
+        return ResourcePathCache()
+
+    def _makeTree(self):
+        root = DummyContext()
+        root.__name__ = None
+        foo = DummyContext()
+        foo.__parent__ = root
+        foo.__name__ = 'foo bar'
+        baz = DummyContext()
+        baz.__parent__ = foo
+        baz.__name__ = 'baz'
+        return root, foo, baz
+
+    def test_root(self):
+        root, foo, baz = self._makeTree()
+        inst = self._makeOne()
+        self.assertEqual(inst.path(root), (('',), '/'))
+        self.assertEqual(inst.path(root), (('',), '/'))
+
+    def test_root_with_name(self):
+        root = DummyContext()
+        root.__name__ = 'flubadub'
+        inst = self._makeOne()
+        self.assertEqual(inst.path(root), (('flubadub',), 'flubadub'))
+
+    def test_same_as_resource_path(self):
+        from pyramid.traversal import resource_path
+        from pyramid.traversal import resource_path_tuple
+        root, foo, baz = self._makeTree()
+        inst = self._makeOne()
+        for resource in (baz, foo, root, baz):
+            self.assertEqual(
+                inst.path(resource),
+                (resource_path_tuple(resource), resource_path(resource)))
+
+    def test_siblings_reuse_parent(self):
+        root, foo, baz = self._makeTree()
+        inst = self._makeOne()
+        inst.path(baz)
+        self.assertEqual(inst.stats(),
+                         {'hits':0, 'partial_hits':0, 'misses':1, 'size':3})
+        sibling = DummyContext()
+        sibling.__parent__ = foo
+        sibling.__name__ = 'sib'
+        root.__name__ = 'x' # would change the path if it were walked
+        self.assertEqual(inst.path(sibling)[0], ('', 'foo bar', 'sib'))
+        self.assertEqual(inst.path(baz)[1], '/foo%20bar/baz')
+        self.assertEqual(inst.stats(),
+                         {'hits':1, 'partial_hits':1, 'misses':1, 'size':4})
+
+    def test_renamed_resource_recomputed(self):
+        root, foo, baz = self._makeTree()
+        inst = self._makeOne()
+        inst.path(baz)
+        baz.__name__ = 'qux'
+        self.assertEqual(inst.path(baz), (('', 'foo bar', 'qux'),
+                                          '/foo%20bar/qux'))
+
+    def test_moved_resource_recomputed(self):
+        root, foo, baz = self._makeTree()
+        inst = self._makeOne()
+        inst.path(baz)
+        baz.__parent__ = root
+        self.assertEqual(inst.path(baz), (('', 'baz'), '/baz'))
+
+    def test_clear(self):
+        root, foo, baz = self._makeTree()
+        inst = self._makeOne()
+        inst.path(baz)
+        foo.__name__ = 'other'
+        inst.clear()
+        self.assertEqual(inst.path(baz)[1], '/other/baz')
+        self.assertEqual(inst.stats()['size'], 3)
+
 class QuotePathSegmentTests(unittest.TestCase):
     def _callFUT(self, s):
         from pyramid.traversal import quote_path_segment
@@ -862,6 +1034,169 @@ class QuotePathSegmentTests(unittest.TestCase):
         result = self._callFUT(s)
         self.assertEqual(result, 'abc')
 
+    def test_safe_native_returned_unchanged(self):
+        s = 'hello-world.html'
+        self.assertTrue(self._callFUT(s) is s)
+
+    def test_cached(self):
+        from pyramid.traversal import _segment_cache
+        s = '/ cached'
+        result = self._callFUT(s)
+        self.assertEqual(_segment_cache.get((s, '')), result)
+
+    def test_cache_emptied_when_full(self):
+        from pyramid import traversal
+        saved = traversal._segment_cache.copy()
+        traversal._segment_cache.clear()
+        try:
+            for i in range(traversal._CACHE_SIZE):
+                traversal._segment_cache[(str(i), '')] = str(i)
+            result = self._callFUT('/ overflow')
+            self.assertEqual(traversal._segment_cache,
+                             {('/ overflow', ''): result})
+        finally:
+            traversal._segment_cache.clear()
+            traversal._segment_cache.update(saved)
+
+class CachingTraverserFactoryTests(unittest.TestCase):
+    def _makeOne(self, maxsize=1000):
+        from pyramid.traversal import CachingTraverserFactory
+        return CachingTraverserFactory(maxsize)
+
+    def _makeTree(self):
+        bar = DummyCountingContext(None, 'bar')
+        foo = DummyCountingContext(bar, 'foo')
+        root = DummyCountingContext(foo, 'root')
+        root.__version__ = 1
+        return root, foo, bar
+
+    def _traverse(self, factory, root, path_info, environ=None):
+        request = DummyRequest(environ, path_info=text_(path_info))
+        return factory(root)(request)
+
+    def test_traverser_conforms_to_ITraverser(self):
+        from zope.interface.verify import verifyObject
+        from pyramid.interfaces import ITraverser
+        factory = self._makeOne()
+        verifyObject(ITraverser, factory(DummyContext()))
+
+    def test_result_same_as_default_traverser(self):
+        from pyramid.traversal import ResourceTreeTraverser
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        for path in ('/', '/foo', '/foo/bar/baz/x', '/foo/@@view/a'):
+            expected = ResourceTreeTraverser(root)(
+                DummyRequest(path_info=text_(path)))
+            self.assertEqual(self._traverse(factory, root, path), expected)
+            self.assertEqual(self._traverse(factory, root, path), expected)
+
+    def test_cached(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        result = self._traverse(factory, root, '/foo/bar')
+        self.assertEqual(result['context'], bar)
+        self.assertEqual(root.calls, 1)
+        result['context'] = None # callers may mutate the result
+        result = self._traverse(factory, root, '/foo/bar')
+        self.assertEqual(result['context'], bar)
+        self.assertEqual(root.calls, 1)
+        self.assertEqual(foo.calls, 1)
+        self.assertEqual(factory.stats(),
+                         {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_shared_by_traversers_of_a_factory_only(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        self._traverse(factory, root, '/foo')
+        self._traverse(factory, root, '/foo')
+        self._traverse(self._makeOne(), root, '/foo')
+        self.assertEqual(root.calls, 2)
+
+    def test_keyed_on_root_class(self):
+        root, foo, bar = self._makeTree()
+        other = DummyBatchContext({'foo': bar})
+        other.__version__ = 1
+        factory = self._makeOne()
+        self.assertEqual(self._traverse(factory, root, '/foo')['context'], foo)
+        self.assertEqual(self._traverse(factory, other, '/foo')['context'],
+                         bar)
+        self.assertEqual(factory.stats()['size'], 2)
+
+    def test_no_version_not_cached(self):
+        root, foo, bar = self._makeTree()
+        del root.__version__
+        factory = self._makeOne()
+        self._traverse(factory, root, '/foo')
+        self._traverse(factory, root, '/foo')
+        self.assertEqual(root.calls, 2)
+        self.assertEqual(factory.stats()['size'], 0)
+
+    def test_root_per_request_not_cached(self):
+        root, foo, bar = self._makeTree()
+        other = DummyCountingContext(bar, 'other')
+        other.__version__ = 1
+        factory = self._makeOne()
+        self.assertEqual(self._traverse(factory, root, '/foo')['context'], foo)
+        result = self._traverse(factory, other, '/foo')
+        self.assertEqual(result['context'], bar)
+        self.assertTrue(result['root'] is other)
+        self.assertEqual(factory.stats()['size'], 0)
+        self._traverse(factory, root, '/foo')
+        self._traverse(factory, root, '/foo')
+        self.assertEqual(root.calls, 3)
+        self.assertEqual(factory.stats()['size'], 0)
+        factory.clear()
+        self._traverse(factory, root, '/foo')
+        self._traverse(factory, root, '/foo')
+        self.assertEqual(root.calls, 4)
+
+    def test_keyed_on_vroot(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        result = self._traverse(factory, root, '/bar')
+        self.assertEqual(result['context'], foo)
+        result = self._traverse(factory, root, '/bar',
+                                {'HTTP_X_VHM_ROOT': '/foo'})
+        self.assertEqual(result['context'], bar)
+        self.assertEqual(result['virtual_root'], foo)
+
+    def test_keyed_on_route_subpath(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        traverser = factory(root)
+        request = DummyRequest()
+        request.matchdict = {'traverse': ('foo',), 'subpath': ('a',)}
+        self.assertEqual(traverser(request)['subpath'], ('a',))
+        request.matchdict = {'traverse': ('foo',), 'subpath': ('b',)}
+        self.assertEqual(traverser(request)['subpath'], ('b',))
+
+    def test_version_change_invalidates(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        self._traverse(factory, root, '/foo')
+        root.next = bar
+        self.assertEqual(self._traverse(factory, root, '/foo')['context'], foo)
+        root.__version__ = 2
+        self.assertEqual(self._traverse(factory, root, '/foo')['context'], bar)
+
+    def test_clear(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne()
+        self._traverse(factory, root, '/foo')
+        factory.clear()
+        self.assertEqual(factory.stats()['size'], 0)
+        self._traverse(factory, root, '/foo')
+        self.assertEqual(root.calls, 2)
+
+    def test_bounded(self):
+        root, foo, bar = self._makeTree()
+        factory = self._makeOne(maxsize=1)
+        self._traverse(factory, root, '/foo')
+        self._traverse(factory, root, '/foo/bar')
+        self.assertEqual(factory.stats()['size'], 1)
+        self._traverse(factory, root, '/foo')
+        self.assertEqual(root.calls, 3)
+
 class ResourceURLTests(unittest.TestCase):
     def _makeOne(self, context, url):
         return self._getTargetClass()(context, url)
@@ -895,6 +1230,22 @@ class ResourceURLTests(unittest.TestCase):
         request = DummyRequest()
         verifyObject(IResourceURL, self._makeOne(context, request))
         
+    def test_uses_request_resource_path_cache(self):
+        from pyramid.traversal import ResourcePathCache
+        root = DummyContext()
+        root.__name__ = None
+        foo = DummyContext()
+        foo.__parent__ = root
+        foo.__name__ = 'foo'
+        request = DummyRequest()
+        request.resource_path_cache = ResourcePathCache()
+        context_url = self._makeOne(foo, request)
+        self.assertEqual(context_url.physical_path, '/foo/')
+        self.assertEqual(context_url.physical_path_tuple, ('', 'foo', ''))
+        self.assertEqual(context_url.virtual_path, '/foo/')
+        self._makeOne(foo, request)
+        self.assertEqual(request.resource_path_cache.stats()['hits'], 1)
+
     def test_call_withlineage(self):
         baz = DummyContext()
         bar = DummyContext(baz)
@@ -1323,6 +1674,32 @@ class DummyContext(object):
     def __repr__(self):
         return '<DummyContext with name %s at id %s>'%(self.__name__, id(self))
 
+class DummyCountingContext(DummyContext):
+    calls = 0
+    def __getitem__(self, name):
+        self.calls += 1
+        return DummyContext.__getitem__(self, name)
+
+class DummyBatchContext(object):
+    __parent__ = None
+    extra = ()
+    def __init__(self, resources, name=None):
+        self.resources = resources
+        self.__name__ = name
+        self.calls = []
+
+    def __getitem__(self, name): # pragma: no cover
+        raise AssertionError('__traverse_path__ should have been used')
+
+    def __traverse_path__(self, segments):
+        self.calls.append(segments)
+        found = []
+        for segment in segments:
+            if segment not in self.resources:
+                return found
+            found.append(self.resources[segment])
+        return found + list(self.extra)
+
 class DummyRequest:
 
     application_url = 'http://example.com:5432' # app_url never ends with slash
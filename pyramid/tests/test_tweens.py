@@ -0,0 +1,175 @@
+import os
+import unittest
+
+class TestTweenStats(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from pyramid.tweens import TweenStats
+        return TweenStats(*arg, **kw)
+
+    def test_record_and_snapshot(self):
+        stats = self._makeOne()
+        stats.record('a', 0.00005)
+        stats.record('a', 0.003)
+        stats.record('a', 20.0)
+        snapshot = stats.snapshot()
+        self.assertEqual(list(snapshot), ['a'])
+        stat = snapshot['a']
+        self.assertEqual(stat['count'], 3)
+        self.assertAlmostEqual(stat['total'], 20.00305)
+        self.assertEqual(stat['max'], 20.0)
+        histogram = stat['histogram']
+        self.assertEqual(len(histogram), len(stats.bounds) + 1)
+        self.assertEqual(histogram[0], 1)
+        self.assertEqual(histogram[stats.bounds.index(0.005)], 1)
+        self.assertEqual(histogram[-1], 1)
+        self.assertEqual(sum(histogram), 3)
+
+    def test_record_on_bound(self):
+        stats = self._makeOne()
+        stats.record('a', 0.001)
+        histogram = stats.snapshot()['a']['histogram']
+        self.assertEqual(histogram[stats.bounds.index(0.001)], 1)
+
+    def test_snapshot_is_a_copy(self):
+        stats = self._makeOne()
+        stats.record('a', 0.001)
+        snapshot = stats.snapshot()
+        stats.record('a', 0.001)
+        self.assertEqual(snapshot['a']['count'], 1)
+        self.assertEqual(sum(snapshot['a']['histogram']), 1)
+
+    def test_reset(self):
+        stats = self._makeOne()
+        stats.record('a', 0.001)
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+    def test_dump(self):
+        import json
+        import shutil
+        import tempfile
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'stats.json')
+            stats = self._makeOne(path)
+            stats.record('a', 0.001)
+            stats.dump()
+            stats.record('a', 0.001)
+            stats.dump() # overwrites
+            with open(path) as f:
+                data = json.load(f)
+            self.assertEqual(data['bounds'], list(stats.bounds))
+            self.assertEqual(data['tweens']['a']['count'], 2)
+            self.assertEqual(os.listdir(tmp), ['stats.json'])
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_dump_per_process(self):
+        import shutil
+        import tempfile
+        tmp = tempfile.mkdtemp()
+        try:
+            stats = self._makeOne(os.path.join(tmp, 'stats-{pid}.json'))
+            stats.dump()
+            self.assertEqual(os.listdir(tmp),
+                             ['stats-%d.json' % os.getpid()])
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_maybe_dump_without_path(self):
+        stats = self._makeOne(interval=0)
+        dumped = []
+        stats.dump = lambda: dumped.append(True)
+        stats.maybe_dump()
+        self.assertEqual(dumped, [])
+
+    def test_maybe_dump_interval(self):
+        stats = self._makeOne('/tmp/stats.json', interval=3600)
+        dumped = []
+        stats.dump = lambda: dumped.append(True)
+        stats.maybe_dump()
+        self.assertEqual(dumped, [])
+        stats.last_dump -= 3600
+        stats.maybe_dump()
+        self.assertEqual(dumped, [True])
+        stats.maybe_dump()
+        self.assertEqual(dumped, [True])
+
+class Test_timed_tween(unittest.TestCase):
+    def _callFUT(self, name, handler, stats, outermost=False):
+        from pyramid.tweens import timed_tween
+        return timed_tween(name, handler, stats, outermost)
+
+    def test_excludes_time_below(self):
+        stats = DummyStats()
+        inner = self._callFUT('inner', lambda request: 'response', stats)
+        def handler(request):
+            response = inner(request)
+            request.__dict__['_tween_time'] = 10.0 # pretend inner was slow
+            return response
+        outer = self._callFUT('outer', handler, stats, outermost=True)
+        request = DummyRequest()
+        self.assertEqual(outer(request), 'response')
+        self.assertEqual([name for name, _ in stats.recorded],
+                         ['inner', 'outer'])
+        self.assertTrue(stats.recorded[1][1] < 0)
+        self.assertEqual(request.__dict__, {})
+        self.assertEqual(stats.dumps, 1)
+
+    def test_handler_called_twice(self):
+        stats = DummyStats()
+        clock = DummyClock()
+        def main(request):
+            clock.now += 1.0
+        inner = self._callFUT('inner', main, stats)
+        def retry(request):
+            clock.now += 0.5
+            inner(request)
+            inner(request)
+        outer = self._callFUT('outer', retry, stats, outermost=True)
+        from pyramid import tweens
+        saved = tweens.perf_counter
+        tweens.perf_counter = clock
+        try:
+            request = DummyRequest()
+            outer(request)
+        finally:
+            tweens.perf_counter = saved
+        self.assertEqual(stats.recorded,
+                         [('inner', 1.0), ('inner', 1.0), ('outer', 0.5)])
+        self.assertEqual(request.__dict__, {})
+
+    def test_not_outermost_leaves_total(self):
+        stats = DummyStats()
+        tween = self._callFUT('tween', lambda request: 'response', stats)
+        request = DummyRequest()
+        tween(request)
+        self.assertEqual(request._tween_time, stats.recorded[0][1])
+        self.assertEqual(stats.dumps, 0)
+
+    def test_records_on_exception(self):
+        stats = DummyStats()
+        def handler(request):
+            raise ValueError
+        tween = self._callFUT('tween', handler, stats, outermost=True)
+        self.assertRaises(ValueError, tween, DummyRequest())
+        self.assertEqual(len(stats.recorded), 1)
+
+class DummyStats(object):
+    def __init__(self):
+        self.recorded = []
+        self.dumps = 0
+
+    def record(self, name, duration):
+        self.recorded.append((name, duration))
+
+    def maybe_dump(self):
+        self.dumps += 1
+
+class DummyRequest(object):
+    pass
+
+class DummyClock(object):
+    now = 0.0
+    def __call__(self):
+        return self.now
@@ -705,6 +705,93 @@ class TestURLMethodsMixin(unittest.TestCase):
                                     _anchor=text_(b"foo"))
         self.assertEqual(result, '/foo/1/2/3/extra1/extra2?a=1#foo')
         
+    def test_route_url_factory_no_such_route(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        mapper = DummyRoutesMapper(route=None)
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        self.assertRaises(KeyError, request.route_url_factory, 'flub')
+
+    def test_route_url_factory(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        route = DummyRoute('/1/2/3')
+        mapper = DummyRoutesMapper(route=route)
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        route_url = request.route_url_factory('flub', 'extra1', b=2,
+                                              _query={'a': 1})
+        result = route_url(c=3)
+        self.assertEqual(result,
+                         'http://example.com:5432/1/2/3/extra1?a=1')
+        self.assertEqual(route.kw, {'b': 2, 'c': 3})
+        result = route_url(b=4, _anchor='x')
+        self.assertEqual(result,
+                         'http://example.com:5432/1/2/3/extra1?a=1#x')
+        self.assertEqual(route.kw, {'b': 4})
+
+    def test_route_url_factory_same_as_route_url(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne({'wsgi.url_scheme': 'http',
+                                 'SERVER_NAME': 'example.com',
+                                 'SERVER_PORT': '80'})
+        mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3/'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        kw = dict(_query={'a': 1}, _anchor='foo', _host='other.com')
+        route_url = request.route_url_factory('flub', 'e1', 'e2', **kw)
+        self.assertEqual(route_url(), request.route_url('flub', 'e1', 'e2',
+                                                        **kw))
+
+    def test_route_url_factory_common_app_url_overrides(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne({'wsgi.url_scheme': 'http',
+                                 'SERVER_NAME': 'example.com',
+                                 'SERVER_PORT': '80'})
+        mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        route_url = request.route_url_factory('flub', _scheme='https')
+        self.assertEqual(route_url(), 'https://example.com/1/2/3')
+        self.assertEqual(route_url(_app_url='http://other.com'),
+                         'http://other.com/1/2/3')
+        self.assertEqual(route_url(_port='8443'),
+                         'https://example.com:8443/1/2/3')
+
+    def test_route_url_factory_path(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        request.script_name = '/foo'
+        mapper = DummyRoutesMapper(route=DummyRoute('/1/2/3'))
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        route_url = request.route_url_factory(
+            'flub', _app_url=request.script_name)
+        self.assertEqual(route_url(), '/foo/1/2/3')
+
+    def test_route_url_factory_with_pregenerator(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        route = DummyRoute(result='/1/2/3')
+        def pregenerator(request, elements, kw):
+            return elements + (kw['x'],), {'_app_url':'http://example2.com'}
+        route.pregenerator = pregenerator
+        mapper = DummyRoutesMapper(route=route)
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        route_url = request.route_url_factory('flub', 'a')
+        self.assertEqual(route_url(x='b'), 'http://example2.com/1/2/3/a/b')
+        self.assertEqual(route_url(x='c'), 'http://example2.com/1/2/3/a/c')
+        self.assertEqual(route.kw, {})
+
+    def test_route_urls(self):
+        from pyramid.interfaces import IRoutesMapper
+        request = self._makeOne()
+        route = DummyRoute('/1/2/3')
+        mapper = DummyRoutesMapper(route=route)
+        request.registry.registerUtility(mapper, IRoutesMapper)
+        result = request.route_urls('flub', [{'a': 1}, {'_anchor': 'x'}],
+                                    'extra')
+        self.assertEqual(result, [
+            'http://example.com:5432/1/2/3/extra',
+            'http://example.com:5432/1/2/3/extra#x',
+            ])
+
     def test_static_url_staticurlinfo_notfound(self):
         request = self._makeOne()
         self.assertRaises(ValueError, request.static_url, 'static/foo.css')
@@ -834,6 +921,53 @@ class TestURLMethodsMixin(unittest.TestCase):
                           {'_app_url':'/foo'})
                          )
 
+    def test_resource_path_cache(self):
+        from pyramid.traversal import ResourcePathCache
+        request = self._makeOne()
+        cache = request.resource_path_cache
+        self.assertEqual(cache.__class__, ResourcePathCache)
+        self.assertTrue(request.resource_path_cache is cache)
+
+    def test_resource_url_uses_resource_path_cache(self):
+        root = DummyContext()
+        root.__name__ = None
+        root.__parent__ = None
+        child = DummyContext()
+        child.__name__ = 'child'
+        child.__parent__ = root
+        request = self._makeOne()
+        self.assertEqual(request.resource_url(child),
+                         'http://example.com:5432/child/')
+        self.assertEqual(request.resource_path(child), '/child/')
+        self.assertEqual(request.resource_path_cache.stats()['hits'], 1)
+
+    def test__cached_application_url(self):
+        from pyramid.request import Request
+        request = Request.blank('/', base_url='http://example.com/app')
+        self.assertEqual(request._cached_application_url(),
+                         'http://example.com/app')
+        self.assertEqual(
+            request.environ['pyramid.application_url'][1],
+            'http://example.com/app')
+        request.environ['pyramid.application_url'] = (
+            request.environ['pyramid.application_url'][0], 'cached')
+        self.assertEqual(request._cached_application_url(), 'cached')
+
+    def test__cached_application_url_environ_changed(self):
+        from pyramid.request import Request
+        request = Request.blank('/', base_url='http://example.com/app')
+        request._cached_application_url()
+        request.script_name = '/other'
+        self.assertEqual(request._cached_application_url(),
+                         'http://example.com/other')
+
+    def test__cached_application_url_instance_attribute(self):
+        request = self._makeOne()
+        request.application_url = 'http://example.com/set'
+        self.assertEqual(request._cached_application_url(),
+                         'http://example.com/set')
+        self.assertFalse('pyramid.application_url' in request.environ)
+
     def test_partial_application_url_with_http_host_default_port_http(self):
         environ = {
             'wsgi.url_scheme':'http',
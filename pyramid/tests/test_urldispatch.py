@@ -409,6 +409,30 @@ class TestCompileRoute(unittest.TestCase):
         # should be a native string
         self.assertEqual(type(result), str)
 
+    def test_generate_quotes_unsafe_values_only(self):
+        pattern = '/{a}/{b}/{c}/{d}'
+        _, generator = self._callFUT(pattern)
+        result = generator({'a': 'abc-1_2.3', 'b': 'x y', 'c': '50%',
+                            'd': 42})
+        self.assertEqual(result, '/abc-1_2.3/x%20y/50%25/42')
+
+    def test_generate_ignores_values_not_in_pattern(self):
+        pattern = '/{a}'
+        _, generator = self._callFUT(pattern)
+        result = generator({'a': 'b', 'traverse': object()})
+        self.assertEqual(result, '/b')
+
+    def test_generate_missing_value(self):
+        pattern = '/{a}/{b}'
+        _, generator = self._callFUT(pattern)
+        self.assertRaises(KeyError, generator, {'a': 'b'})
+
+    def test_generate_with_bytes_remainder(self):
+        pattern = '/abc/*remainder'
+        _, generator = self._callFUT(pattern)
+        result = generator({'remainder': b'La Pe\xc3\xb1a/x'})
+        self.assertEqual(result, '/abc/La%20Pe%C3%B1a/x')
+
 class TestCompileRouteFunctional(unittest.TestCase):
     def matches(self, pattern, path, expected):
         from pyramid.urldispatch import _compile_route
@@ -144,6 +144,23 @@ class Test_InstancePropertyHelper(unittest.TestCase):
         self.assertEqual(1, foo.x)
         self.assertEqual(2, foo.y)
 
+    def test_make_class(self):
+        from zope.interface import Interface
+        from zope.interface import implementer
+        from zope.interface import implementedBy
+        class IFoo(Interface):
+            pass
+        @implementer(IFoo)
+        class Foo(object):
+            pass
+        helper = self._getTargetClass()
+        newcls = helper.make_class(Foo, {'x': property(lambda _: 1)})
+        self.assertTrue(issubclass(newcls, Foo))
+        self.assertEqual(newcls.__name__, 'Foo')
+        self.assertEqual(newcls().x, 1)
+        self.assertTrue(IFoo.providedBy(newcls()))
+        self.assertTrue(newcls.__implemented__ is implementedBy(Foo))
+
     def test_make_property_unicode(self):
         from pyramid.compat import text_
         from pyramid.exceptions import ConfigurationError
@@ -199,6 +199,34 @@ class RenderViewToResponseTests(BaseTest, unittest.TestCase):
         self.assertEqual(response.status, '200 OK')
         self.assertEqual(response.app_iter, ['aview'])
 
+    def test_call_view_with_request_profiler(self):
+        from pyramid.interfaces import IRequestProfiler
+        context = self._makeContext()
+        request = self._makeRequest()
+        profiler = DummyProfiler()
+        request.registry.registerUtility(profiler, IRequestProfiler)
+        response = DummyResponse()
+        view = make_view(response)
+        self._registerView(request.registry, view, 'registered')
+        response = self._callFUT(context, request, name='registered')
+        self.assertEqual(response.status, '200 OK')
+        self.assertEqual(
+            [(phase, view_) for request_, phase, view_ in profiler.records],
+            [('view_lookup', None), ('view_call', view)])
+
+    def test_call_view_raises_with_request_profiler(self):
+        from pyramid.interfaces import IRequestProfiler
+        context = self._makeContext()
+        request = self._makeRequest()
+        profiler = DummyProfiler()
+        request.registry.registerUtility(profiler, IRequestProfiler)
+        def view(context, request):
+            raise ValueError
+        self._registerView(request.registry, view, 'registered')
+        self.assertRaises(ValueError, self._callFUT, context, request,
+                          name='registered')
+        self.assertEqual(profiler.records[-1][1:], ('view_call', view))
+
 class RenderViewToIterableTests(BaseTest, unittest.TestCase):
     def _callFUT(self, *arg, **kw):
         from pyramid.view import render_view_to_iterable
@@ -730,6 +758,14 @@ class DummyVenusian(object):
         self.depth = depth
         return self.info
 
+class DummyProfiler(object):
+    def __init__(self):
+        self.records = []
+
+    def record(self, request, phase, start, stop, view=None):
+        assert start <= stop
+        self.records.append((request, phase, view))
+
 class DummyRegistry(object):
     pass
 
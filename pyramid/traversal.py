@@ -5,7 +5,10 @@ from zope.deprecation import deprecated
 from zope.interface import implementer
 from zope.interface.interfaces import IInterface
 
-from repoze.lru import lru_cache
+from repoze.lru import (
+    LRUCache,
+    lru_cache,
+    )
 
 from pyramid.interfaces import (
     IResourceURL,
@@ -26,7 +29,10 @@ from pyramid.compat import (
     unquote_bytes_to_wsgi,
     )
 
-from pyramid.encode import url_quote
+from pyramid.encode import (
+    _CACHE_SIZE,
+    url_quote,
+    )
 from pyramid.exceptions import URLDecodeError
 from pyramid.location import lineage
 from pyramid.threadlocal import get_current_registry
@@ -398,6 +404,90 @@ def _resource_path_list(resource, *elements):
 
 _model_path_list = _resource_path_list # b/w compat, not an API
 
+class ResourcePathCache(object):
+    """ Memoizes the physical path of resources, keyed by their identity.
+
+    The path of a resource is computed from the cached path of its nearest
+    cached ancestor, so once the path of one resource in a lineage has been
+    computed, the paths of its siblings and children are computed without
+    walking the lineage up to the root again.
+
+    An instance is available to each request as
+    ``request.resource_path_cache``; it is used by
+    :meth:`pyramid.request.Request.resource_url` and
+    :meth:`pyramid.request.Request.resource_path` (via
+    :class:`pyramid.traversal.ResourceURL`).
+
+    A cached path is discarded when the ``__name__`` or ``__parent__`` of
+    its resource changes.  If a resource's *ancestor* is renamed or moved
+    during a request after URLs to the resource have been generated, call
+    :meth:`clear` before generating more URLs.
+
+    .. versionadded:: 1.7
+    """
+    def __init__(self):
+        self._paths = {}
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    def path(self, resource):
+        """ Return a tuple of ``(path_tuple, path)`` for ``resource``:
+        the values :func:`pyramid.traversal.resource_path_tuple` and
+        :func:`pyramid.traversal.resource_path` would return for it."""
+        paths = self._paths
+        uncached = []
+        node = resource
+        entry = None
+        while node is not None:
+            parent = getattr(node, '__parent__', None)
+            entry = paths.get(id(node))
+            if (
+                entry is not None and
+                entry[0] is node and
+                entry[1] is parent and
+                entry[2] == node.__name__
+            ):
+                break
+            entry = None
+            uncached.append((node, parent))
+            node = parent
+
+        if not uncached:
+            self.hits += 1
+            return entry[3], entry[4] or '/'
+
+        if entry is None:
+            self.misses += 1
+            path_tuple, path = (), None
+        else:
+            self.partial_hits += 1
+            path_tuple, path = entry[3], entry[4]
+        for node, parent in reversed(uncached):
+            name = node.__name__
+            segment = name or ''
+            path_tuple = path_tuple + (segment,)
+            quoted = quote_path_segment(segment)
+            path = quoted if path is None else path + '/' + quoted
+            paths[id(node)] = (node, parent, name, path_tuple, path)
+        return path_tuple, path or '/'
+
+    def clear(self):
+        """ Discard all cached paths."""
+        self._paths.clear()
+
+    def stats(self):
+        """ Return a dictionary with the number of ``hits`` (calls to
+        :meth:`path` for a resource whose path was cached),
+        ``partial_hits`` (calls whose path was computed from the cached
+        path of an ancestor), ``misses`` (calls whose path was computed
+        from the root) and the number of cached paths (``size``)."""
+        return {'hits':self.hits,
+                'partial_hits':self.partial_hits,
+                'misses':self.misses,
+                'size':len(self._paths),
+                }
+
 def virtual_root(resource, request):
     """
     Provided any :term:`resource` and a :term:`request` object, return
@@ -566,19 +656,19 @@ the ``safe`` argument to this function.  This corresponds to the
    The return value for each segment passed to this
    function is cached in a module-scope dictionary for
    speed: the cached version is returned when possible
-   rather than recomputing the quoted version.  No cache
-   emptying is ever done for the lifetime of an
-   application, however.  If you pass arbitrary
-   user-supplied strings to this function (as opposed to
-   some bounded set of values from a 'working set' known to
-   your application), it may become a memory leak.
+   rather than recomputing the quoted version.  The
+   dictionary is emptied whenever it would grow past 10000
+   entries, so passing arbitrary user-supplied strings to
+   this function no longer leaks memory.
+
+.. versionchanged:: 1.7
+   The cache is bounded.
 """
 
 
 if PY3:
     # special-case on Python 2 for speed?  unchecked
     def quote_path_segment(segment, safe=''):
-        """ %s """ % quote_path_segment_doc
         # The bit of this code that deals with ``_segment_cache`` is an
         # optimization: we cache all the computation of URL path segments
         # in this module-scope dictionary with the original string (or
@@ -590,13 +680,14 @@ if PY3:
             if segment.__class__ not in (text_type, binary_type):
                 segment = str(segment)
             result = url_quote(native_(segment, 'utf-8'), safe)
+            if len(_segment_cache) >= _CACHE_SIZE:
+                _segment_cache.clear()
             # we don't need a lock to mutate _segment_cache, as the below
             # will generate exactly one Python bytecode (STORE_SUBSCR)
             _segment_cache[(segment, safe)] = result
             return result
 else:
     def quote_path_segment(segment, safe=''):
-        """ %s """ % quote_path_segment_doc
         # The bit of this code that deals with ``_segment_cache`` is an
         # optimization: we cache all the computation of URL path segments
         # in this module-scope dictionary with the original string (or
@@ -609,11 +700,18 @@ else:
                 result = url_quote(segment.encode('utf-8'), safe)
             else:
                 result = url_quote(str(segment), safe)
+            if len(_segment_cache) >= _CACHE_SIZE:
+                _segment_cache.clear()
             # we don't need a lock to mutate _segment_cache, as the below
             # will generate exactly one Python bytecode (STORE_SUBSCR)
             _segment_cache[(segment, safe)] = result
             return result
-    
+
+# assigned rather than written as a docstring so that it can be shared by
+# both implementations (formatting it inside the function body would
+# happen on every call)
+quote_path_segment.__doc__ = quote_path_segment_doc
+
 slash = text_('/')
 
 @implementer(ITraverser)
@@ -621,7 +719,21 @@ class ResourceTreeTraverser(object):
     """ A resource tree traverser that should be used (for speed) when
     every resource in the tree supplies a ``__name__`` and
     ``__parent__`` attribute (ie. every resource in the tree is
-    :term:`location` aware) ."""
+    :term:`location` aware) .
+
+    A resource may define a ``__traverse_path__`` method to resolve several
+    path segments at once, for instance with a single database query,
+    instead of having ``__getitem__`` called once per segment.  It is passed
+    a tuple of the remaining path segments up to (but not including) the
+    next view selector, and must return a sequence containing the resource
+    found for each of the leading segments it could resolve, in order.
+    Returning fewer resources than segments means that the next segment was
+    not found, exactly as if ``__getitem__`` had raised a :exc:`KeyError`
+    for it; that segment becomes the view name.
+
+    .. versionchanged:: 1.7
+       Support for ``__traverse_path__``.
+    """
 
 
     VIEW_SELECTOR = '@@'
@@ -630,7 +742,12 @@ class ResourceTreeTraverser(object):
         self.root = root
 
     def __call__(self, request):
-        environ = request.environ
+        path, subpath = self._request_path(request)
+        return self._traverse(path, subpath, request.environ)
+
+    def _request_path(self, request):
+        # return the path to traverse and the subpath supplied by the
+        # matched route, if any
         matchdict = request.matchdict
 
         if matchdict is not None:
@@ -662,6 +779,9 @@ class ResourceTreeTraverser(object):
                 raise URLDecodeError(e.encoding, e.object, e.start, e.end,
                                      e.reason)
 
+        return path, subpath
+
+    def _traverse(self, path, subpath, environ):
         if VH_ROOT_KEY in environ:
             # HTTP_X_VHM_ROOT
             vroot_path = decode_path_info(environ[VH_ROOT_KEY])
@@ -687,7 +807,9 @@ class ResourceTreeTraverser(object):
             i = 0
             view_selector = self.VIEW_SELECTOR
             vpath_tuple = split_path_info(vpath)
-            for segment in vpath_tuple:
+            end = len(vpath_tuple)
+            while i < end:
+                segment = vpath_tuple[i]
                 if segment[:2] == view_selector:
                     return {'context': ob,
                             'view_name': segment[2:],
@@ -696,6 +818,33 @@ class ResourceTreeTraverser(object):
                             'virtual_root': vroot,
                             'virtual_root_path': vroot_tuple,
                             'root': root}
+                traverse_path = getattr(ob, '__traverse_path__', None)
+                if traverse_path is not None:
+                    # the resource resolves every segment up to the next
+                    # view selector in one call (e.g. a single query),
+                    # returning one resource per segment it found
+                    stop = i + 1
+                    while (stop < end and
+                           vpath_tuple[stop][:2] != view_selector):
+                        stop += 1
+                    found = traverse_path(vpath_tuple[i:stop])
+                    found = tuple(found)[:stop - i]
+                    if found:
+                        if i <= vroot_idx < i + len(found):
+                            vroot = found[vroot_idx - i]
+                        ob = found[-1]
+                        i += len(found)
+                    if i < stop:
+                        # segment ``i`` was not found, as if ``__getitem__``
+                        # had raised a KeyError
+                        return {'context': ob,
+                                'view_name': vpath_tuple[i],
+                                'subpath': vpath_tuple[i + 1:],
+                                'traversed': vpath_tuple[:vroot_idx + i + 1],
+                                'virtual_root': vroot,
+                                'virtual_root_path': vroot_tuple,
+                                'root': root}
+                    continue
                 try:
                     getitem = ob.__getitem__
                 except AttributeError:
@@ -728,13 +877,118 @@ class ResourceTreeTraverser(object):
 
 ModelGraphTraverser = ResourceTreeTraverser # b/w compat, not API, used in wild
 
+class CachingResourceTreeTraverser(ResourceTreeTraverser):
+    """ A :class:`ResourceTreeTraverser` which memoizes traversal results
+    in ``cache`` (a :class:`repoze.lru.LRUCache`).  Instances are usually
+    created by a :class:`CachingTraverserFactory`.
+
+    Results are only cached for a root with a ``__version__`` attribute
+    which isn't ``None``.  Root classes in the ``transient`` set are never
+    cached; a class is added to it when a cached result turns out to have
+    been produced from another instance of the class."""
+
+    def __init__(self, root, cache, transient=None):
+        self.root = root
+        self.cache = cache
+        if transient is None:
+            transient = set()
+        self.transient = transient
+
+    def __call__(self, request):
+        path, subpath = self._request_path(request)
+        environ = request.environ
+        root = self.root
+        version = getattr(root, '__version__', None)
+        root_class = root.__class__
+        if version is None or root_class in self.transient:
+            return self._traverse(path, subpath, environ)
+        key = (root_class, version, environ.get(VH_ROOT_KEY), path,
+               tuple(subpath))
+        cache = self.cache
+        result = cache.get(key)
+        if result is None:
+            result = self._traverse(path, subpath, environ)
+            cache.put(key, result)
+        elif result['root'] is not root:
+            # the root factory makes a new root per request: results
+            # cached for one root must not be used with another, and
+            # would only keep dead trees alive
+            self.transient.add(root_class)
+            cache.clear()
+            return self._traverse(path, subpath, environ)
+        # the router and applications may mutate the dictionary
+        return dict(result)
+
+class CachingTraverserFactory(object):
+    """ A :term:`traverser` factory which produces traversers that work
+    like the default one, but which memoize their results in a bounded LRU
+    cache shared by every traverser it produces.  Repeated requests for the
+    same path of a mostly static resource tree then skip calling
+    ``__getitem__`` on each resource along the path.  Register an instance
+    for the class or interface of the roots whose tree should be cached,
+    leaving other (mutable) trees to the default traverser:
+
+    .. code-block:: python
+
+       from pyramid.traversal import CachingTraverserFactory
+
+       config.add_traverser(CachingTraverserFactory(maxsize=5000),
+                            ContentRoot)
+
+    Only a tree whose root is a persistent singleton, the same object
+    returned by the :term:`root factory` for every request, can be cached,
+    and it opts in by giving its root a ``__version__`` attribute.  Results
+    are cached by the class and ``__version__`` of the root and the path
+    traversed (including any virtual root).  They are only valid for as
+    long as the tree doesn't change, so either call :meth:`clear` when it
+    does, or change the value of ``__version__``: results cached under
+    another version are no longer used, and are eventually discarded.  The
+    cache holds references to the root and the resources found.
+
+    Roots without a ``__version__`` (or whose ``__version__`` is ``None``)
+    are traversed without caching.  If a cached result is found to belong
+    to another instance of the root's class, the root factory evidently
+    makes a new root per request: the cache is emptied and the roots of
+    that class are no longer cached.
+
+    .. versionadded:: 1.7
+    """
+
+    def __init__(self, maxsize=1000):
+        self.cache = LRUCache(maxsize)
+        self.transient = set()
+
+    def __call__(self, root):
+        return CachingResourceTreeTraverser(root, self.cache, self.transient)
+
+    def clear(self):
+        """ Discard every cached traversal result, and forget which root
+        classes were found to be made anew for each request."""
+        self.cache.clear()
+        self.transient.clear()
+
+    def stats(self):
+        """ Return a dictionary of statistics about the cache, with the keys
+        ``hits``, ``misses`` and ``size`` (the number of results currently
+        cached)."""
+        cache = self.cache
+        return {
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'size': len(cache.data),
+            }
+
 @implementer(IResourceURL, IContextURL)
 class ResourceURL(object):
     vroot_varname = VH_ROOT_KEY
 
     def __init__(self, resource, request):
-        physical_path_tuple = resource_path_tuple(resource)
-        physical_path = _join_path_tuple(physical_path_tuple)
+        cache = getattr(request, 'resource_path_cache', None)
+        if cache is not None:
+            physical_path_tuple, physical_path = cache.path(resource)
+        else:
+            physical_path_tuple = resource_path_tuple(resource)
+            physical_path = _join_path_tuple(physical_path_tuple)
 
         if physical_path_tuple != ('',):
             physical_path_tuple = physical_path_tuple + ('',)
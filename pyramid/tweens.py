@@ -1,11 +1,13 @@
 import sys
 
+from pyramid.compat import perf_counter
 from pyramid.interfaces import (
     IExceptionViewClassifier,
     IRequest,
     )
 
 from zope.interface import providedBy
+from pyramid.profiling import LatencyStats
 from pyramid.view import _call_view
 
 def excview_tween_factory(handler, registry):
@@ -57,3 +59,63 @@ def excview_tween_factory(handler, registry):
 MAIN = 'MAIN'
 INGRESS = 'INGRESS'
 EXCVIEW = 'pyramid.tweens.excview_tween_factory'
+
+class TweenStats(LatencyStats):
+    """ Timing statistics of the :term:`tween` chain of an application,
+    collected when the ``pyramid.tween_stats`` setting is true.
+
+    For each tween (and for the main request handler, named ``MAIN``), the
+    time spent in the tween itself, excluding the time spent in the tweens
+    and handler below it, is recorded for every request into a histogram of
+    durations.  Use :meth:`snapshot` to read the statistics, keyed by tween
+    name.
+
+    If ``path`` is not ``None``, a JSON dump of the snapshot is written to
+    it at most every ``interval`` seconds while requests are being handled;
+    the ``ptweens --stats`` command reads such dumps.  A dump only holds the
+    statistics of the process which wrote it: include ``{pid}`` in the
+    path, which is replaced by the process id, when the application runs in
+    several processes, and ``ptweens --stats`` merges the dumps of all of
+    them.
+
+    A tween which calls the handler below it more than once for a request
+    (for instance to retry it) is timed once per request, excluding all of
+    the calls below it, while the tweens and handler below it are timed,
+    and counted, once per call.
+
+    .. versionadded:: 1.7
+    """
+
+    def record(self, name, duration):
+        """ Record that ``duration`` seconds were spent in the tween named
+        ``name``."""
+        self.add(name, duration)
+
+    def dump_data(self):
+        return {'bounds': list(self.bounds), 'tweens': self.snapshot()}
+
+def timed_tween(name, handler, stats, outermost=False):
+    """ Wrap the tween (or main handler) ``handler`` named ``name`` so that
+    the time spent in it, excluding the time spent in the handlers it calls
+    (which must also be wrapped), is recorded into ``stats``, a
+    :class:`TweenStats`."""
+    record = stats.record
+    def timed(request):
+        attrs = request.__dict__
+        # the time already spent in earlier calls made at this level by the
+        # caller (e.g. a retrying tween), set aside while this call runs
+        earlier = attrs.pop('_tween_time', 0.0)
+        start = perf_counter()
+        try:
+            return handler(request)
+        finally:
+            elapsed = perf_counter() - start
+            # the time spent below, as accumulated by the wrappers of the
+            # handlers called by this one, if any were called
+            record(name, elapsed - attrs.pop('_tween_time', 0.0))
+            if outermost:
+                stats.maybe_dump()
+            else:
+                attrs['_tween_time'] = earlier + elapsed
+    return timed
+
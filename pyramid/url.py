@@ -19,10 +19,12 @@ from pyramid.encode import (
     url_quote,
     urlencode,
 )
+from pyramid.decorator import reify
 from pyramid.path import caller_package
 from pyramid.threadlocal import get_current_registry
 
 from pyramid.traversal import (
+    ResourcePathCache,
     ResourceURL,
     quote_path_segment,
     )
@@ -125,6 +127,42 @@ class URLMethodsMixin(object):
         bscript_name = bytes_(self.script_name, url_encoding)
         return url + url_quote(bscript_name, PATH_SAFE)
 
+    @reify
+    def resource_path_cache(self):
+        """
+        A :class:`pyramid.traversal.ResourcePathCache` which memoizes the
+        paths of the resources passed to
+        :meth:`pyramid.request.Request.resource_url` and
+        :meth:`pyramid.request.Request.resource_path` during this request.
+        Its ``stats()`` method reports how many paths were reused.
+
+        .. versionadded:: 1.7
+        """
+        return ResourcePathCache()
+
+    def _cached_application_url(self):
+        """
+        Return ``request.application_url``, which WebOb recomputes from the
+        environ on every access, remembering it in the environ for as long
+        as the values it is computed from are unchanged.
+        """
+        if 'application_url' in self.__dict__: # set on an instance (tests)
+            return self.application_url
+        e = self.environ
+        key = (
+            e.get('wsgi.url_scheme'),
+            e.get('HTTP_HOST'),
+            e.get('SERVER_NAME'),
+            e.get('SERVER_PORT'),
+            e.get('SCRIPT_NAME'),
+            )
+        cached = e.get('pyramid.application_url')
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        url = self.application_url
+        e['pyramid.application_url'] = (key, url)
+        return url
+
     def route_url(self, route_name, *elements, **kw):
         """Generates a fully qualified URL for a named :app:`Pyramid`
         :term:`route configuration`.
@@ -274,7 +312,7 @@ class URLMethodsMixin(object):
             if (scheme is not None or host is not None or port is not None):
                 app_url = self._partial_application_url(scheme, host, port)
             else:
-                app_url = self.application_url
+                app_url = self._cached_application_url()
 
         path = route.generate(kw) # raises KeyError if generate fails
 
@@ -317,6 +355,108 @@ class URLMethodsMixin(object):
         kw['_app_url'] = self.script_name
         return self.route_url(route_name, *elements, **kw)
 
+    def route_url_factory(self, route_name, *elements, **common):
+        """
+        Return a callable which generates URLs for the :term:`route
+        configuration` named ``route_name`` much more cheaply than repeated
+        calls to :meth:`pyramid.request.Request.route_url`.  It is meant for
+        generating many URLs to the same route, e.g. one per row of a
+        listing::
+
+            item_url = request.route_url_factory('item')
+            urls = [item_url(id=item.id) for item in items]
+
+        The route is looked up, the application URL is computed and
+        ``*elements`` are joined once, when the factory is created, instead
+        of on every call.
+
+        ``*elements`` and ``**common`` are used for every URL generated and
+        accept the same values as the ``*elements`` and ``**kw`` arguments
+        of :meth:`pyramid.request.Request.route_url`, including the
+        ``_query``, ``_anchor``, ``_app_url``, ``_scheme``, ``_host`` and
+        ``_port`` special arguments.  The returned callable accepts keyword
+        arguments only; they are merged with (and take precedence over)
+        ``**common``.  To generate paths rather than URLs, as
+        :meth:`pyramid.request.Request.route_path` does, pass
+        ``_app_url=request.script_name``.
+
+        A :term:`pregenerator` associated with the route is still called for
+        every URL, as its result may depend on the arguments of each call.
+
+        If no route named ``route_name`` exists, a :exc:`KeyError` is raised
+        immediately.
+
+        .. versionadded:: 1.7
+        """
+        try:
+            reg = self.registry
+        except AttributeError:
+            reg = get_current_registry() # b/c
+        mapper = reg.getUtility(IRoutesMapper)
+        route = mapper.get_route(route_name)
+
+        if route is None:
+            raise KeyError('No such route named %s' % route_name)
+
+        request = self
+        pregenerator = route.pregenerator
+        generate = route.generate
+        overrides = parse_url_overrides(dict(common))
+        app_url, scheme, host, port = overrides[:4]
+        if app_url is None:
+            if (scheme is not None or host is not None or port is not None):
+                app_url = self._partial_application_url(scheme, host, port)
+            else:
+                app_url = self._cached_application_url()
+        joined = _join_elements(elements) if elements else ''
+
+        def route_url(**kw):
+            if common:
+                merged = common.copy()
+                merged.update(kw)
+                kw = merged
+            if pregenerator is not None:
+                els, kw = pregenerator(request, elements, kw)
+                suffix = _join_elements(els) if els else ''
+            else:
+                els, suffix = elements, joined
+            parsed = parse_url_overrides(kw)
+            url = app_url
+            if parsed[:4] != overrides[:4]:
+                url, scheme, host, port = parsed[:4]
+                if url is None:
+                    if (scheme is not None or host is not None or
+                        port is not None):
+                        url = request._partial_application_url(
+                            scheme, host, port)
+                    else:
+                        url = request._cached_application_url()
+            path = generate(kw) # raises KeyError if generate fails
+            if els and not path.endswith('/'):
+                suffix = '/' + suffix
+            return url + path + suffix + parsed[4] + parsed[5]
+
+        return route_url
+
+    def route_urls(self, route_name, kws, *elements, **common):
+        """
+        Return a list of URLs for the :term:`route configuration` named
+        ``route_name``, one for each mapping of keyword arguments in the
+        iterable ``kws``::
+
+            request.route_urls('item', [{'id': 1}, {'id': 2}])
+              => ['http://example.com/item/1', 'http://example.com/item/2']
+
+        This is equivalent to, but faster than, calling
+        :meth:`pyramid.request.Request.route_url` once per mapping; see
+        :meth:`pyramid.request.Request.route_url_factory`, which it uses,
+        for the meaning of ``*elements`` and ``**common``.
+
+        .. versionadded:: 1.7
+        """
+        route_url = self.route_url_factory(route_name, *elements, **common)
+        return [route_url(**kw) for kw in kws]
+
     def resource_url(self, resource, *elements, **kw):
         """
 
@@ -17,6 +17,7 @@ from pyramid.compat import (
     decode_path_info,
     )
 
+from pyramid.encode import _safe_chars
 from pyramid.exceptions import URLDecodeError
 
 from pyramid.traversal import (
@@ -112,6 +113,31 @@ def update_pattern(matchobj):
     name = matchobj.group(0)
     return '{%s}' % name[1:]
 
+# values made only of these characters are left unchanged by
+# ``quote_path_segment(value, safe='/')``, so they need not be quoted
+_generator_safe_chars = _safe_chars('/')
+
+def _native_generator_value(v):
+    if PY3:
+        if v.__class__ is binary_type:
+            # url_quote needs a native string, not bytes on Py3
+            v = v.decode('utf-8')
+    else:
+        if v.__class__ is text_type:
+            # url_quote needs bytes, not unicode on Py2
+            v = v.encode('utf-8')
+    return v
+
+def _quote_generator_value(v):
+    if v.__class__ is not str:
+        v = _native_generator_value(v)
+        if v.__class__ not in string_types:
+            v = str(v)
+    if not v.strip(_generator_safe_chars):
+        return v
+    # v may be bytes (py2) or native string (py3)
+    return quote_path_segment(v, safe='/')
+
 def _compile_route(route):
     # This function really wants to consume Unicode patterns natively, but if
     # someone passes us a bytestring, we allow it by converting it to Unicode
@@ -134,6 +160,7 @@ def _compile_route(route):
         route = '/' + route
 
     remainder = None
+    names = [] # native names of the replacement markers, in pattern order
     if star_at_end.search(route):
         route, remainder = route.rsplit('*', 1)
 
@@ -163,6 +190,7 @@ def _compile_route(route):
         else:
             reg = '[^/]+'
         gen.append('%%(%s)s' % native_(name)) # native
+        names.append(native_(name))
         name = '(?P<%s>%s)' % (name, reg) # unicode
         rpat.append(name)
         s = pat.pop() # unicode
@@ -207,38 +235,25 @@ def _compile_route(route):
         return d
 
     gen = ''.join(gen)
+    names = tuple(names)
+    star = native_(remainder) if remainder else None
+
     def generator(dict):
+        # Only the values named by the pattern are quoted; other keys in
+        # ``dict`` are ignored.  A missing value raises a KeyError.
         newdict = {}
-        for k, v in dict.items():
-            if PY3:
-                if v.__class__ is binary_type:
-                    # url_quote below needs a native string, not bytes on Py3
-                    v = v.decode('utf-8')
+        for k in names:
+            newdict[k] = _quote_generator_value(dict[k])
+        if star is not None:
+            # a stararg argument
+            v = _native_generator_value(dict[star])
+            if is_nonstr_iter(v):
+                v = '/'.join(
+                    [quote_path_segment(x, safe='/') for x in v]
+                    ) # native
             else:
-                if v.__class__ is text_type:
-                    # url_quote below needs bytes, not unicode on Py2
-                    v = v.encode('utf-8')
-
-            if k == remainder:
-                # a stararg argument
-                if is_nonstr_iter(v):
-                    v = '/'.join(
-                        [quote_path_segment(x, safe='/') for x in v]
-                        ) # native
-                else:
-                    if v.__class__ not in string_types:
-                        v = str(v)
-                    v = quote_path_segment(v, safe='/')
-            else:
-                if v.__class__ not in string_types:
-                    v = str(v)
-                # v may be bytes (py2) or native string (py3)
-                v = quote_path_segment(v, safe='/')
-
-            # at this point, the value will be a native string
-            newdict[k] = v
-
-        result = gen % newdict # native string result
-        return result
+                v = _quote_generator_value(v)
+            newdict[star] = v
+        return gen % newdict # native string result
 
     return matcher, generator
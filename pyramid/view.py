@@ -12,7 +12,10 @@ from pyramid.interfaces import (
     IRequest,
     )
 
-from pyramid.compat import decode_path_info
+from pyramid.compat import (
+    decode_path_info,
+    perf_counter,
+    )
 
 from pyramid.exceptions import PredicateMismatch
 
@@ -511,6 +514,9 @@ def _call_view(
     ):
     if request_iface is None:
         request_iface = getattr(request, 'request_iface', IRequest)
+    profiler = getattr(registry, 'request_profiler', None)
+    if profiler is not None:
+        start = perf_counter()
     view_callables = _find_views(
         registry,
         request_iface,
@@ -519,6 +525,8 @@ def _call_view(
         view_types=view_types,
         view_classifier=view_classifier,
         )
+    if profiler is not None:
+        profiler.record(request, 'view_lookup', start, perf_counter())
 
     pme = None
     response = None
@@ -538,7 +546,15 @@ def _call_view(
             # if this view is secured, it will raise a Forbidden
             # appropriately if the executing user does not have the proper
             # permission
-            response = view_callable(context, request)
+            if profiler is None:
+                response = view_callable(context, request)
+            else:
+                start = perf_counter()
+                try:
+                    response = view_callable(context, request)
+                finally:
+                    profiler.record(request, 'view_call', start,
+                                    perf_counter(), view_callable)
             return response
         except PredicateMismatch as _pme:
             pme = _pme
@@ -117,8 +117,11 @@ setup(name='pyramid',
         proutes = pyramid.scripts.proutes:main
         pviews = pyramid.scripts.pviews:main
         ptweens = pyramid.scripts.ptweens:main
+        pmemory = pyramid.scripts.pmemory:main
         prequest = pyramid.scripts.prequest:main
         pdistreport = pyramid.scripts.pdistreport:main
+        pcompress = pyramid.scripts.pcompress:main
+        pmanifest = pyramid.scripts.pmanifest:main
         [paste.server_runner]
         wsgiref = pyramid.scripts.pserve:wsgiref_server_runner
         cherrypy = pyramid.scripts.pserve:cherrypy_server_runner